@@ -0,0 +1,111 @@
+"""
+Cold start budget check.
+
+Measures, in fresh processes, the time to import the app and the time from
+launching `python -m src.hindusthan.server` to the first /health 200
+(which includes initialize_database, so it needs MONGODB_URL). Reports the
+median of --runs and exits 1 when a median is over its budget or regressed
+by more than --threshold against --baseline.
+
+    python -m benchmarks.cold_start --out cold_start.json
+    python -m benchmarks.cold_start --baseline cold_start.json --import-budget-ms 1500
+
+The import budget (IMPORT_BUDGET_MS) and the lazy imports are also enforced
+by tests/test_cold_start.py, so CI fails on a regression without a baseline.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.harness import environment, write_results
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_ms() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import src.hindusthan.main"], check=True, cwd=PROJECT_ROOT)
+    return (time.perf_counter() - started) * 1000
+
+
+def first_health_ms(port: int, timeout: float = 60.0) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.hindusthan.server", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", "1", "--no-access-log", "--log-level", "warning"],
+        cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with {server.returncode} during startup")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError(f"No /health 200 after {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+def check(name: str, value: float, budget, baseline: dict, threshold: float) -> list:
+    failures = []
+    if budget is not None and value > budget:
+        failures.append(f"{name}: {value:.0f} ms over the {budget:.0f} ms budget")
+    previous = baseline.get(name)
+    if previous and value > previous * (1 + threshold):
+        failures.append(f"{name}: {value:.0f} ms vs {previous:.0f} ms baseline (+{value / previous - 1:.0%})")
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check the cold start time against a budget")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--import-only", action="store_true", help="skip the server run (no MongoDB needed)")
+    parser.add_argument("--import-budget-ms", type=float)
+    parser.add_argument("--health-budget-ms", type=float)
+    parser.add_argument("--out", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = {"environment": environment(), "runs": args.runs, "medians_ms": {}}
+    medians = results["medians_ms"]
+
+    medians["import"] = statistics.median(import_ms() for _ in range(args.runs))
+    print(f"{'import':<14} {medians['import']:>8.0f} ms")
+    if not args.import_only:
+        medians["first_health"] = statistics.median(first_health_ms(args.port) for _ in range(args.runs))
+        print(f"{'first_health':<14} {medians['first_health']:>8.0f} ms")
+
+    if args.out:
+        write_results(args.out, results)
+        print(f"Results written to {args.out}")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["medians_ms"]
+    failures = check("import", medians["import"], args.import_budget_ms, baseline, args.threshold)
+    if "first_health" in medians:
+        failures += check("first_health", medians["first_health"], args.health_budget_ms, baseline, args.threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
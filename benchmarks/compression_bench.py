@@ -0,0 +1,38 @@
+"""
+Bytes on the wire and CPU time per response for gzip/brotli at several
+levels, on customer list payloads of different sizes.
+
+    python -m benchmarks.compression_bench
+"""
+import json
+import time
+
+from benchmarks.load_test import customer_row
+from src.hindusthan.middleware.compression import available_encodings, compress
+
+PAGE_SIZES = (10, 100, 1000)
+SETTINGS = {"gzip": (1, 6, 9), "br": (1, 4, 6, 11)}
+
+
+def cpu_us(data: bytes, encoding: str, level: int) -> float:
+    iterations = max(3, 2_000_000 // max(1, len(data)))
+    started = time.process_time()
+    for _ in range(iterations):
+        compress(data, encoding, gzip_level=level, brotli_quality=level)
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def main():
+    print(f"{'rows':>5} {'encoding':>8} {'level':>5} {'bytes':>9} {'ratio':>6} {'cpu us':>9}")
+    for rows in PAGE_SIZES:
+        payload = json.dumps([dict(customer_row(n), id=f"{n:024x}") for n in range(rows)]).encode()
+        print(f"{rows:>5} {'identity':>8} {'-':>5} {len(payload):>9} {1.0:>6.2f} {0.0:>9.1f}")
+        for encoding in available_encodings():
+            for level in SETTINGS[encoding]:
+                size = len(compress(payload, encoding, gzip_level=level, brotli_quality=level))
+                print(f"{rows:>5} {encoding:>8} {level:>5} {size:>9} {len(payload) / size:>6.2f} "
+                      f"{cpu_us(payload, encoding, level):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Load-test harness: runs scenarios against the ASGI app in-process (or a
+running server), collects per-request latency and writes JSON results that
+can be diffed between commits.
+"""
+import asyncio
+import json
+import platform
+import subprocess
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+@dataclass
+class OperationStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict:
+        ms = [latency * 1000 for latency in self.latencies]
+        return {
+            "requests": len(ms),
+            "errors": self.errors,
+            "rps": round(len(ms) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(ms, 50), 3),
+            "p95_ms": round(percentile(ms, 95), 3),
+            "p99_ms": round(percentile(ms, 99), 3),
+        }
+
+
+class Recorder:
+    """
+    Wraps the HTTP client and times every request under an operation name
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.operations: Dict[str, OperationStats] = {}
+
+    async def request(self, operation: str, method: str, url: str, expected=(200, 201), **kwargs) -> httpx.Response:
+        stats = self.operations.setdefault(operation, OperationStats())
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        stats.latencies.append(time.perf_counter() - started)
+        if response.status_code not in expected:
+            stats.errors += 1
+        return response
+
+
+Scenario = Callable[[Recorder, dict, int], Awaitable[None]]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, context: dict,
+                       concurrency: int, duration: float) -> dict:
+    """
+    Run scenario iterations from `concurrency` workers for `duration` seconds
+    """
+    recorder = Recorder(client)
+    deadline = time.perf_counter() + duration
+    counter = iter(range(10 ** 9))
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            await scenario(recorder, context, next(counter))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_stats = OperationStats()
+    for stats in recorder.operations.values():
+        all_stats.latencies.extend(stats.latencies)
+        all_stats.errors += stats.errors
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "total": all_stats.summary(elapsed),
+        "operations": {name: stats.summary(elapsed) for name, stats in recorder.operations.items()},
+    }
+
+
+@asynccontextmanager
+async def app_client(base_url: Optional[str] = None, use_mongomock: bool = False):
+    """
+    Client for a running server (base_url) or for the in-process ASGI app with its lifespan
+    """
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            yield client
+        return
+
+    if use_mongomock:
+        # optional stand-in for a local mongod
+        from mongomock_motor import AsyncMongoMockClient
+        from src.hindusthan.database import database
+        database.AsyncIOMotorClient = AsyncMongoMockClient
+
+    from src.hindusthan.main import app, lifespan_context
+
+    async with lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=30) as client:
+            yield client
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment() -> dict:
+    return {"revision": git_revision(), "python": platform.python_version(), "machine": platform.machine()}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Regressions of results against baseline: p95 latency up or RPS down by more than threshold
+    """
+    regressions = []
+    for name, scenario in results["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        new_total, old_total = scenario["total"], old["total"]
+        if old_total["p95_ms"] and new_total["p95_ms"] > old_total["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {old_total['p95_ms']}ms -> {new_total['p95_ms']}ms")
+        if old_total["rps"] and new_total["rps"] < old_total["rps"] * (1 - threshold):
+            regressions.append(f"{name}: rps {old_total['rps']} -> {new_total['rps']}")
+    return regressions
+
+
+def write_results(path: str, results: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
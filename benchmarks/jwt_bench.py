@@ -0,0 +1,36 @@
+"""
+Cost of verifying a bearer token with and without the decoded-claims cache.
+
+    python -m benchmarks.jwt_bench
+"""
+import time
+from datetime import timedelta
+
+from src.hindusthan.auth.utils.auth_utils import create_access_token, decode_access_token
+from src.hindusthan.auth.utils.auth_dependencies import token_cache, verify_token
+
+ITERATIONS = 20000
+
+
+def per_call_us(fn, token: str) -> float:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(token)
+    return (time.perf_counter() - started) / ITERATIONS * 1_000_000
+
+
+def main():
+    token = create_access_token(
+        data={"sub": "agent@example.com", "id": "bench", "role": "field_agent"},
+        expires_delta=timedelta(minutes=30),
+    )
+    token_cache.clear()
+
+    uncached = per_call_us(decode_access_token, token)
+    cached = per_call_us(verify_token, token)
+    print(f"decode + verify: {uncached:8.2f} us/token")
+    print(f"cached lookup:   {cached:8.2f} us/token  ({uncached / cached:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
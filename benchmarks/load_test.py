@@ -0,0 +1,200 @@
+"""
+Load test for the auth and customer APIs.
+
+Runs the scenarios against the in-process ASGI app (MONGODB_URL, or
+mongomock with --mongomock) or against a running server (--base-url),
+prints p50/p95/p99 latency and RPS per operation and writes JSON results.
+Pass --baseline to fail (exit 1) when p95 or RPS regressed by more than
+--threshold compared to an earlier run. A server under test needs
+OTP_IN_RESPONSE=true and rate limiting off (RATE_LIMIT_ENABLED=false),
+and its database must be reachable at MONGODB_URL: the admin account is
+seeded there directly since signup only creates customers.
+
+    python -m benchmarks.load_test --out bench.json
+    python -m benchmarks.load_test --baseline bench.json --threshold 0.15
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+from benchmarks.harness import app_client, compare, environment, run_scenario, write_results
+
+PASSWORD = "bench-password"
+USERS = "/api/v1/users"
+CUSTOMERS = "/api/v1/customers"
+
+
+def customer_row(n: int) -> dict:
+    return {
+        "first_name": f"First{n}", "middle_name": "M", "last_name": f"Last{n}", "nick_name": f"n{n}",
+        "phone_number": f"9{n:09d}", "email": f"customer{n}@bench.example.com",
+        "district": f"District{n % 20}", "mandal": f"Mandal{n % 50}", "village": f"Village{n % 200}",
+        "register_by": "bench", "user_id": "bench", "kyc_number": f"KYC{n}", "kyc_url": "https://example.com/kyc",
+        "street": "Main road", "city": "City", "state": "State", "postal_code": "500001", "country": "IN",
+        "service": random.choice(["soil", "seed", "loan"]), "sub_service": "basic",
+    }
+
+
+async def seed_admin(email: str, base_url: str = None):
+    """
+    Signup only creates customers, so the admin is written to the database
+    directly: the app's own client in-process, MONGODB_URL for a server under test
+    """
+    from src.hindusthan.auth.utils.admin_bootstrap import ensure_admin
+
+    if not base_url:
+        await ensure_admin(email, PASSWORD)
+        return
+    from src.hindusthan.database.database import close_database, initialize_database
+
+    await initialize_database(index_mode="off")
+    try:
+        await ensure_admin(email, PASSWORD)
+    finally:
+        await close_database()
+
+
+async def login(client, email: str) -> str:
+    response = await client.post(f"{USERS}/login", data={"username": email, "password": PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+# Scenarios: one iteration each, run concurrently until the duration is over
+
+async def auth_flow(recorder, context, n):
+    email = f"user-{context['run']}-{n}@bench.example.com"
+    response = await recorder.request("signup", "POST", f"{USERS}/signup",
+                                      json={"email": email, "password": PASSWORD})
+    if response.status_code != 201:
+        return
+    await recorder.request("verify_otp", "POST", f"{USERS}/verify-otp",
+                           json={"email": email, "otp_code": response.json()["otp"]})
+    await recorder.request("login", "POST", f"{USERS}/login", data={"username": email, "password": PASSWORD})
+
+
+async def customer_mix(recorder, context, n):
+    # 20% create, 60% list, 20% patch
+    headers = context["headers"]
+    roll = n % 10
+    if roll < 2 or not context["customer_ids"]:
+        response = await recorder.request("create", "POST", f"{CUSTOMERS}/", headers=headers,
+                                          json=customer_row(context["seeded"] + n))
+        if response.status_code == 201:
+            context["customer_ids"].append(response.json()["id"])
+    elif roll < 8:
+        await recorder.request("list", "GET", f"{CUSTOMERS}/", headers=headers, params={"limit": 20})
+    else:
+        id = random.choice(context["customer_ids"])
+        await recorder.request("patch", "PATCH", f"{CUSTOMERS}/{id}", headers=headers,
+                               json={"village": f"Village{n % 200}"})
+
+
+async def deep_pagination(recorder, context, n):
+    # walk a few pages deep with cursors, and compare with one deep skip
+    headers = context["headers"]
+    cursor = ""
+    for _ in range(context["pages"]):
+        response = await recorder.request("cursor_page", "GET", f"{CUSTOMERS}/", headers=headers,
+                                          params={"cursor": cursor, "limit": 50})
+        cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+        if not cursor:
+            break
+    await recorder.request("skip_page", "GET", f"{CUSTOMERS}/", headers=headers,
+                           params={"skip": max(0, context["seeded"] - 50), "limit": 50})
+
+
+SCENARIOS = {
+    "auth_flow": auth_flow,
+    "customer_mix": customer_mix,
+    "deep_pagination": deep_pagination,
+}
+
+
+async def seed_customers(client, headers: dict, count: int, run: str):
+    for start in range(0, count, 1000):
+        rows = [dict(customer_row(n), idempotency_key=f"{run}-{n}") for n in range(start, min(count, start + 1000))]
+        response = await client.post(f"{CUSTOMERS}/bulk", headers=headers, json=rows)
+        response.raise_for_status()
+
+
+async def main(args) -> int:
+    random.seed(args.seed)
+    run = uuid.uuid4().hex[:8]
+    results = {"environment": environment(), "started_at": time.time(), "config": vars(args), "scenarios": {}}
+
+    async with app_client(args.base_url, args.mongomock) as client:
+        admin_email = f"bench-admin-{run}@bench.example.com"
+        await seed_admin(admin_email, args.base_url)
+        token = await login(client, admin_email)
+        context = {
+            "run": run,
+            "headers": {"Authorization": f"Bearer {token}"},
+            "customer_ids": [],
+            "seeded": args.seed_customers,
+            "pages": args.pages,
+        }
+        await seed_customers(client, context["headers"], args.seed_customers, run)
+
+        for name in args.scenarios:
+            summary = await run_scenario(client, SCENARIOS[name], context, args.concurrency, args.duration)
+            results["scenarios"][name] = summary
+            total = summary["total"]
+            print(f"{name:<16} {total['requests']:>7} req  {total['rps']:>9.1f} rps  "
+                  f"p50 {total['p50_ms']:>8.2f}ms  p95 {total['p95_ms']:>8.2f}ms  "
+                  f"p99 {total['p99_ms']:>8.2f}ms  errors {total['errors']}")
+            for operation, stats in summary["operations"].items():
+                print(f"  {operation:<14} {stats['requests']:>7} req  {stats['rps']:>9.1f} rps  "
+                      f"p50 {stats['p50_ms']:>8.2f}ms  p95 {stats['p95_ms']:>8.2f}ms  "
+                      f"p99 {stats['p99_ms']:>8.2f}ms  errors {stats['errors']}")
+
+    if args.out:
+        write_results(args.out, results)
+        print(f"Results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the auth and customer APIs")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--seed-customers", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=10, help="cursor pages per deep_pagination iteration")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-url", help="run against a server instead of the in-process app")
+    parser.add_argument("--mongomock", action="store_true", help="use mongomock-motor instead of MONGODB_URL")
+    parser.add_argument("--out", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative regression")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if not arguments.base_url:
+        # every in-process request comes from one client address
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+        # the scenarios read the OTP from the signup response
+        os.environ.setdefault("OTP_IN_RESPONSE", "true")
+        os.environ.setdefault("NOTIFICATION_SENDER", "fake")
+        # a single process, so it may create the indexes itself
+        os.environ.setdefault("INDEX_SYNC_MODE", "apply")
+    if arguments.mongomock:
+        # mongomock collections do not support per-route read preferences
+        os.environ.setdefault("MONGO_READ_PREFERENCE_CUSTOMERS", "")
+    sys.exit(asyncio.run(main(arguments)))
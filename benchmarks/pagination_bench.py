@@ -0,0 +1,78 @@
+"""
+Compare skip/limit vs cursor pagination latency at different offsets.
+
+Needs a running MongoDB (MONGODB_URL). Seeds BENCH_DATABASE_NAME with
+customers on the first run.
+
+    python -m benchmarks.pagination_bench --total 510000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.hindusthan.customer.models.customer_model import CustomerModel
+from src.hindusthan.database.pagination import CURSOR_SORT, cursor_page, encode_cursor
+from src.hindusthan.database.soft_delete import LIVE
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+BENCH_DATABASE_NAME = os.getenv("BENCH_DATABASE_NAME", "hindusthan_bench")
+
+
+async def seed(total: int):
+    existing = await CustomerModel.find_all().count()
+    batch = []
+    for i in range(existing, total):
+        batch.append(CustomerModel(first_name=f"farmer{i}", village=f"village{i % 500}"))
+        if len(batch) == 10000:
+            await CustomerModel.insert_many(batch)
+            batch = []
+    if batch:
+        await CustomerModel.insert_many(batch)
+
+
+async def timed(coro_factory, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=int, default=510000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--offsets", type=int, nargs="+", default=[0, 10000, 500000])
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(MONGODB_URL)
+    await init_beanie(database=client[BENCH_DATABASE_NAME], document_models=[CustomerModel])
+    await seed(args.total)
+
+    print(f"{'offset':>10} {'skip/limit ms':>15} {'cursor ms':>12}")
+    for offset in args.offsets:
+        cursor = ""
+        if offset:
+            # position the cursor on the live document just before the page (not timed)
+            anchor = await CustomerModel.find(LIVE).sort(CURSOR_SORT).skip(offset - 1).limit(1).to_list()
+            cursor = encode_cursor(anchor[0].created_at, anchor[0].id)
+
+        skip_ms = await timed(
+            lambda: CustomerModel.find(LIVE).sort(CURSOR_SORT).skip(offset).limit(args.limit).to_list(),
+            args.repeat,
+        )
+        cursor_ms = await timed(lambda: cursor_page(CustomerModel, cursor, args.limit, LIVE), args.repeat)
+        print(f"{offset:>10} {skip_ms:>15.2f} {cursor_ms:>12.2f}")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
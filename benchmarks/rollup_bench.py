@@ -0,0 +1,75 @@
+"""
+Compare dashboard counts read from the rollups with $group over customers.
+
+Needs a running MongoDB (MONGODB_URL). Seeds BENCH_DATABASE_NAME with
+customers on the first run and rebuilds the rollups from them.
+
+    python -m benchmarks.rollup_bench --total 200000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.hindusthan.customer.models.customer_model import CustomerModel, CustomerRollupModel
+from src.hindusthan.customer.utils.rollup_utils import ROLLUP_DIMENSIONS, live_counts, rebuild_rollups, \
+    rollup_counts
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+BENCH_DATABASE_NAME = os.getenv("BENCH_DATABASE_NAME", "hindusthan_bench")
+
+
+async def seed(total: int):
+    existing = await CustomerModel.find_all().count()
+    batch = []
+    for i in range(existing, total):
+        batch.append(CustomerModel(
+            first_name=f"farmer{i}", district=f"district{i % 30}", mandal=f"mandal{i % 300}",
+            village=f"village{i % 3000}", service=f"service{i % 5}", sub_service=f"sub{i % 3}",
+            register_by=f"agent{i % 200}",
+        ))
+        if len(batch) == 10000:
+            await CustomerModel.insert_many(batch)
+            batch = []
+    if batch:
+        await CustomerModel.insert_many(batch)
+
+
+async def timed(coro_factory, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(MONGODB_URL)
+    await init_beanie(database=client[BENCH_DATABASE_NAME], document_models=[CustomerModel, CustomerRollupModel])
+    await seed(args.total)
+    started = time.perf_counter()
+    await rebuild_rollups()
+    print(f"Rebuilt rollups for {args.total} customers in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    print(f"{'dimension':>10} {'groups':>8} {'rollup ms':>10} {'$group ms':>10}")
+    for dimension in ROLLUP_DIMENSIONS:
+        groups = len(await rollup_counts(dimension, limit=10000))
+        rollup_ms = await timed(lambda: rollup_counts(dimension, limit=10000), args.repeat)
+        live_ms = await timed(lambda: live_counts(dimension, limit=10000), args.repeat)
+        print(f"{dimension:>10} {groups:>8} {rollup_ms:>10.2f} {live_ms:>10.2f}")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Throughput of the production server with 1..N workers.
+
+Starts `python -m src.hindusthan.server` with each worker count against
+MONGODB_URL, runs the load test against it over HTTP and prints RPS and
+p95 per scenario together with the speedup over a single worker.
+
+    python -m benchmarks.scaling_bench --workers 1 2 4 8 --duration 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+
+def wait_healthy(base_url: str, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with {process.returncode} during startup")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server not healthy after {timeout:.0f}s")
+
+
+def run_with_workers(workers: int, args) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, OTP_IN_RESPONSE="true", RATE_LIMIT_ENABLED="false", NOTIFICATION_SENDER="fake")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.hindusthan.server", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(workers), "--no-access-log", "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        wait_healthy(base_url, server)
+        with tempfile.NamedTemporaryFile(suffix=".json") as out:
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.load_test", "--base-url", base_url, "--out", out.name,
+                 "--concurrency", str(args.concurrency), "--duration", str(args.duration),
+                 "--seed-customers", str(args.seed_customers), "--scenarios", *args.scenarios],
+                check=True, stdout=subprocess.DEVNULL,
+            )
+            with open(out.name, encoding="utf-8") as f:
+                return json.load(f)["scenarios"]
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure RPS scaling over server worker counts")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--scenarios", nargs="+", default=["auth_flow", "customer_mix"])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--seed-customers", type=int, default=1000)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    baseline = {}
+    print(f"{'workers':>7} {'scenario':<16} {'rps':>9} {'p95 ms':>9} {'speedup':>8} {'errors':>7}")
+    for workers in args.workers:
+        for name, summary in run_with_workers(workers, args).items():
+            total = summary["total"]
+            # relative to the first (smallest) worker count
+            baseline.setdefault(name, total["rps"])
+            speedup = total["rps"] / baseline[name] if baseline[name] else 0.0
+            print(f"{workers:>7} {name:<16} {total['rps']:>9.1f} {total['p95_ms']:>9.2f} "
+                  f"{speedup:>7.2f}x {total['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
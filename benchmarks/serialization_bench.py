@@ -0,0 +1,73 @@
+"""
+Rows/sec of the default list response path vs the fast JSON path.
+
+Needs a running MongoDB (MONGODB_URL). Seeds BENCH_DATABASE_NAME with
+customers on the first run.
+
+    python -m benchmarks.serialization_bench
+"""
+import asyncio
+import json
+import os
+import time
+from typing import List
+
+from beanie import init_beanie
+from fastapi.encoders import jsonable_encoder
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import TypeAdapter
+
+from src.hindusthan.customer.models.customer_model import CustomerModel
+from src.hindusthan.customer.schemas.customer_schemas import CustomerResponse, CustomerListAdapter
+from src.hindusthan.customer.routers.customer_routes import CUSTOMER_PROJECTION
+from src.hindusthan.database.fast_json import fetch_raw, json_response
+
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+BENCH_DATABASE_NAME = os.getenv("BENCH_DATABASE_NAME", "hindusthan_bench")
+
+# What FastAPI does with response_model=List[CustomerResponse]
+response_adapter = TypeAdapter(List[CustomerResponse])
+
+
+async def default_path(size: int) -> bytes:
+    customers = await CustomerModel.find_all().limit(size).to_list()
+    validated = response_adapter.validate_python(customers, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+async def fast_path(size: int) -> bytes:
+    docs = await fetch_raw(CustomerModel, limit=size, projection=CUSTOMER_PROJECTION)
+    return json_response(CustomerListAdapter, docs).body
+
+
+async def rows_per_second(fn, size: int, seconds: float = 2.0) -> float:
+    rows = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        await fn(size)
+        rows += size
+    return rows / (time.perf_counter() - started)
+
+
+async def main():
+    client = AsyncIOMotorClient(MONGODB_URL)
+    await init_beanie(database=client[BENCH_DATABASE_NAME], document_models=[CustomerModel])
+
+    existing = await CustomerModel.find_all().count()
+    if existing < 1000:
+        await CustomerModel.insert_many([
+            CustomerModel(first_name=f"farmer{i}", village=f"village{i % 50}", district="district", service="seeds")
+            for i in range(existing, 1000)
+        ])
+
+    print(f"{'page size':>10} {'default rows/s':>16} {'fast rows/s':>14} {'speedup':>8}")
+    for size in (10, 100, 1000):
+        default = await rows_per_second(default_path, size)
+        fast = await rows_per_second(fast_path, size)
+        print(f"{size:>10} {default:>16,.0f} {fast:>14,.0f} {fast / default:>7.1f}x")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,13 @@
 from beanie import Document, before_event, Replace, Save
+from pymongo import IndexModel, ASCENDING
 from datetime import datetime, timezone
 from pydantic import Field,EmailStr
 import uuid
 from typing import Optional
 from enum import Enum
 
+from src.hindusthan.database.soft_delete import LIVE, DELETED
+
 
 class UserRole(str, Enum):
     ADMIN = "admin"
@@ -31,6 +34,7 @@ class UserModel(Document):
     phone_number: Optional[str]=None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    deleted_at: Optional[datetime] = None  # set by a soft delete
 
     # Auto-update "updated_at" on update
     @before_event([Save, Replace])
@@ -39,6 +43,16 @@ class UserModel(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            # signup / login / verify / resend lookups, unique among live users so
+            # a deleted user's email can sign up again
+            IndexModel([("email", ASCENDING)], name="email_unique", unique=True, partialFilterExpression=LIVE),
+            # keyset pagination
+            IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)], name="created_at_id",
+                       partialFilterExpression=LIVE),
+            # purge of old soft-deleted users
+            IndexModel([("deleted_at", ASCENDING)], name="deleted_at_purge", partialFilterExpression=DELETED),
+        ]
 
 
 
@@ -48,6 +62,7 @@ class OTPModel(Document):
     email: EmailStr
     otp_code: str = ""
     expires_at: datetime
+    attempts: int = 0
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -58,3 +73,9 @@ class OTPModel(Document):
 
     class Settings:
         name = "otps"
+        indexes = [
+            # one pending OTP per email: issue() upserts on it, verify looks it up
+            IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+            # Mongo removes the OTP once expires_at has passed
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        ]
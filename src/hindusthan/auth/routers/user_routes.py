@@ -1,162 +1,189 @@
 from datetime import datetime,timedelta,timezone
-from fastapi import APIRouter, HTTPException,status,Depends
-from typing import List
+from fastapi import APIRouter, HTTPException,status,Depends,Request,Query
+from typing import List, Optional, Union
 from fastapi.security import OAuth2PasswordRequestForm
-from src.hindusthan.auth.models.user_model import UserModel, OTPModel, UserRole
+from beanie import UpdateResponse
+from src.hindusthan.auth.models.user_model import UserModel, UserRole
 from src.hindusthan.auth.schemas.user_schemas import UserCreate, UserUpdate, UserResponse, OTPVerify, Token, ResendOTP, \
-    GoogleLoginRequest
-from src.hindusthan.auth.utils.auth_utils import hash_password, verify_password, ACCESS_TOKEN_EXPIRE_MINUTES, \
-    create_access_token, GOOGLE_CLIENT_ID
-import random
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
+    GoogleLoginRequest, UserPage, UserPageAdapter, UserListAdapter, UserBatchGetRequest, UserBatchGetResponse, \
+    UserBatchGetAdapter, UserRoleUpdate
+from src.hindusthan.database.pagination import cursor_page, raw_cursor_page
+from src.hindusthan.database.batch_get import batch_get
+from src.hindusthan.database.fast_json import FAST_JSON_RESPONSES, fetch_raw, json_response, schema_projection
+from src.hindusthan.database.soft_delete import SOFT_DELETE, LIVE, live
+from src.hindusthan.auth.utils.auth_utils import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token, GOOGLE_CLIENT_ID
+from src.hindusthan.auth.utils.hashing_service import password_hasher
+from src.hindusthan.auth.utils.otp_store import otp_store, OTPStatus
+from src.hindusthan.auth.utils.user_cache import user_cache
+from src.hindusthan.auth.utils.rate_limiter import rate_limiter
+from src.hindusthan.auth.utils.otp_delivery import OTP_IN_RESPONSE, queue_otp
+from src.hindusthan.auth.utils.auth_dependencies import require_roles, require_self_or_admin
 
 
 
 router = APIRouter( tags=["users"])
 
+USER_PROJECTION = schema_projection(UserResponse)
+
 
 
 
 
 # GET all users
-@router.get("/", response_model=List[UserResponse],status_code=status.HTTP_200_OK)
-async def get_all_users(skip: int = 0, limit: int = 10):
+@router.get("/", response_model=Union[List[UserResponse], UserPage],status_code=status.HTTP_200_OK)
+async def get_all_users(skip: int = Query(0, ge=0), limit: int = Query(10, ge=1, le=100), cursor: Optional[str] = None,
+                        _: dict = Depends(require_roles(UserRole.ADMIN))):
     
     """
-    Get all users with pagination
+    Get all users with pagination.
+    Pass cursor (empty for the first page) to use keyset pagination,
+    the response then carries next_cursor for the following page.
     """
-    users = await UserModel.find_all().skip(skip).limit(limit).to_list()
+    if FAST_JSON_RESPONSES:
+        # raw documents, validated once, no response_model pass
+        if cursor is not None:
+            items, next_cursor = await raw_cursor_page(UserModel, cursor, limit, LIVE, USER_PROJECTION)
+            return json_response(UserPageAdapter, {"items": items, "next_cursor": next_cursor})
+        return json_response(UserListAdapter, await fetch_raw(UserModel, LIVE, skip=skip, limit=limit,
+                                                              projection=USER_PROJECTION))
+
+    if cursor is not None:
+        items, next_cursor = await cursor_page(UserModel, cursor, limit, LIVE)
+        return {"items": items, "next_cursor": next_cursor}
+
+    users = await UserModel.find(LIVE).skip(skip).limit(limit).to_list()
     return users
 
 # GET auth by ID
 @router.get("/{id}", response_model=UserResponse,status_code=status.HTTP_200_OK)
-async def get_user(id: str):
+async def get_user(id: str, _: dict = Depends(require_self_or_admin)):
     
     """
-    Get auth by ID
+    Get auth by ID, only for the user themselves or an admin
     """
-    user = await UserModel.get(id)
+    # a miss fills the cache; no put() here, that would keep a hot entry alive past its TTL
+    user = await user_cache.get_by_id(id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
 
 
 
+# POST fetch several users by id
+@router.post("/batch-get", response_model=UserBatchGetResponse, status_code=status.HTTP_200_OK)
+async def batch_get_users(request: UserBatchGetRequest, _: dict = Depends(require_roles(UserRole.ADMIN))):
+
+    """
+    Get up to BATCH_GET_MAX_IDS users in one call, in the order of the requested ids.
+    Admin only, like the user list: staff may not read other users' contact details.
+    Missing or deleted users come back as null and are listed in not_found.
+    """
+    items, not_found = await batch_get(UserModel, request.ids, USER_PROJECTION)
+    content = {"items": items, "not_found": not_found}
+    if FAST_JSON_RESPONSES:
+        return json_response(UserBatchGetAdapter, content)
+    return content
+
+
 # POST create new user
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-async def create_user(user_data: UserCreate):
+async def create_user(user_data: UserCreate, request: Request):
     """
     Create a new user with OTP verification
     """
+    await rate_limiter.check("signup", request, user_data.email)
 
     # Check if user already exists
-    existing_user = await UserModel.find_one(UserModel.email == user_data.email)
+    existing_user = await UserModel.find_one(UserModel.email == user_data.email, UserModel.deleted_at == None)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    def generate_otp():
-        return str(random.randint(100000, 999999))
-
-    # Generate OTP - FIXED: Use timezone aware datetime
-    otp_code = generate_otp()
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
-
-    # Hash password
-    hash_pass = hash_password(user_data.password)
+    # Hash password (runs on the hashing pool, not the event loop)
+    hash_pass = await password_hasher.hash(user_data.password)
 
-    # Delete existing OTPs for this email
-    await OTPModel.find(OTPModel.email == user_data.email).delete()
-
-    # Create and save OTP
-    otp = OTPModel(
-        email=user_data.email,
-        otp_code=otp_code,
-        expires_at=expires_at
-    )
-    await otp.insert()
+    # Issue OTP (replaces any pending one for this email)
+    otp_code = await otp_store.issue(user_data.email)
 
     # Create user
     user_dict = user_data.model_dump()
     user_dict["password"] = hash_pass
+    # public signup only creates customers, staff roles are assigned by an admin
+    user_dict["role"] = UserRole.CUSTOMER
     user = UserModel(**user_dict)
     await user.insert()
+    user_cache.put(user)
 
-    return {
+    # Delivered by the job queue, not on the request path
+    await queue_otp(user.email, otp_code)
+
+    response = {
         "message": "User created successfully. Please verify your email with OTP.",
         "user_id": str(user.id),
         "email": user.email,
         "is_verified": user.is_verified,
-        "otp": otp_code  # Remove this in production
     }
+    if OTP_IN_RESPONSE:
+        response["otp"] = otp_code
+    return response
 
 
 ## POST verify otp
 @router.post("/verify-otp", status_code=status.HTTP_200_OK)
-async def verify_otp(request: OTPVerify):
+async def verify_otp(request: OTPVerify, http_request: Request):
     """
     Verify OTP for user registration
     """
+    await rate_limiter.check("verify_otp", http_request, request.email)
     if not request.email or not request.otp_code:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email and OTP code are required"
         )
 
-    # Find the OTP record
-    otp_record = await OTPModel.find_one(
-        OTPModel.email == request.email,
-        OTPModel.otp_code == request.otp_code
-    )
-
-    if not otp_record:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid OTP code"
-        )
-
-    # FIXED: Make both datetime objects timezone aware for comparison
-    current_time = datetime.now(timezone.utc)
+    # Check and consume the OTP in one step
+    otp_status = await otp_store.verify(request.email, request.otp_code)
 
-    # If expires_at is naive, make it aware
-    if otp_record.expires_at.tzinfo is None:
-        expires_at_aware = otp_record.expires_at.replace(tzinfo=timezone.utc)
-    else:
-        expires_at_aware = otp_record.expires_at
-
-    # Check if OTP has expired
-    if current_time > expires_at_aware:
-        await otp_record.delete()  # Delete expired OTP
+    if otp_status == OTPStatus.EXPIRED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="OTP has expired"
         )
-
-    # Find the user
-    user = await UserModel.find_one(UserModel.email == request.email)
-    if not user:
+    if otp_status == OTPStatus.TOO_MANY_ATTEMPTS:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many invalid attempts, please request a new OTP"
         )
-
-    # Check if user is already verified
-    if user.is_verified:
-        await otp_record.delete()  # Clean up OTP
+    if otp_status != OTPStatus.VALID:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User is already verified"
+            detail="Invalid OTP code"
         )
 
     # Mark user as verified
-    user.is_verified = True
-    await user.save()
+    user = await UserModel.find_one(
+        UserModel.email == request.email,
+        UserModel.is_verified == False,
+        UserModel.deleted_at == None
+    ).update(
+        {"$set": {"is_verified": True, "updated_at": datetime.now(timezone.utc)}},
+        response_type=UpdateResponse.NEW_DOCUMENT
+    )
 
-    # Delete the used OTP
-    await otp_record.delete()
+    if not user:
+        # Only reached on failure, tell "unknown" and "already verified" apart
+        if await user_cache.get_by_email(request.email):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User is already verified"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    user_cache.put(user)
 
     return {
         "message": "OTP verified successfully",
@@ -170,15 +197,16 @@ async def verify_otp(request: OTPVerify):
 
 
 @router.post("/resend-otp",status_code=status.HTTP_200_OK)
-async def resend_otp(request:ResendOTP):
+async def resend_otp(request:ResendOTP, http_request: Request):
     """
     Resend OTP for email verification
     """
+    await rate_limiter.check("resend_otp", http_request, request.email)
 
     email=request.email
 
     # Check if user exists and not verified
-    user = await UserModel.find_one(UserModel.email==email)
+    user = await user_cache.get_by_email(email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -191,35 +219,24 @@ async def resend_otp(request:ResendOTP):
             detail="Email already verified"
         )
 
-    def generate_otp():
-        return str(random.randint(100000, 999999))
-
-    # Generate OTP - FIXED: Use timezone aware datetime
-    otp_code = generate_otp()
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    # Issue a new OTP (replaces any pending one for this email)
+    otp_code = await otp_store.issue(email)
+    await queue_otp(email, otp_code)
 
-
-    # Delete existing OTPs for this email
-    await OTPModel.find(OTPModel.email == email).delete()
-
-    # Create and save OTP
-    otp = OTPModel(
-        email=email,
-        otp_code=otp_code,
-        expires_at=expires_at
-    )
-    await otp.insert()
-
-
-
-    return {"message": "OTP sent successfully","otp":otp_code}
+    response = {"message": "OTP sent successfully"}
+    if OTP_IN_RESPONSE:
+        response["otp"] = otp_code
+    return response
 
 
 @router.post("/login", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    # throttle before Argon2 so floods cannot pin the hashing pool
+    await rate_limiter.check("login", request, form_data.username)
 
-    user =await UserModel.find_one(UserModel.email==form_data.username)
-    if not user or not verify_password(form_data.password, user.password):
+    # straight from the database, a cached copy can hold an old password hash or role
+    user = await UserModel.find_one(UserModel.email == form_data.username, LIVE)
+    if not user or not await password_hasher.verify(form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Your Email or password is wrong",
@@ -229,7 +246,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email,"id":user.id},
+        data={"sub": user.email,"id":user.id,"role":user.role.value},
         expires_delta=access_token_expires
     )
 
@@ -240,31 +257,64 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
 # PATCH update auth
 @router.patch("/{id}", response_model=UserResponse,status_code=status.HTTP_200_OK)
-async def update_user(id: str, user_data: UserUpdate):
+async def update_user(id: str, user_data: UserUpdate, _: dict = Depends(require_self_or_admin)):
     
     """
-    Update auth information
+    Update auth information, a new password is stored hashed like at signup
     """
-    user = await UserModel.get(id)
+    update_data = user_data.model_dump(exclude_unset=True)
+    if "password" in update_data:
+        password = update_data.pop("password")
+        if password:
+            update_data["password"] = await password_hasher.hash(password)
+    # $set skips the before_event hook, so keep updated_at here
+    update_data["updated_at"] = datetime.now(timezone.utc)
+
+    # Single find-one-and-update returning the updated document
+    user = await UserModel.find_one(UserModel.id == id, UserModel.deleted_at == None).update(
+        {"$set": update_data},
+        response_type=UpdateResponse.NEW_DOCUMENT
+    )
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    user_cache.put(user)
+    return user
 
-    update_data = user_data.model_dump(exclude_unset=True)
-    await user.update({"$set": update_data})
-    return await UserModel.get(id)
+# PATCH assign a role, admin only
+@router.patch("/{id}/role", response_model=UserResponse, status_code=status.HTTP_200_OK)
+async def update_user_role(id: str, role_data: UserRoleUpdate, _: dict = Depends(require_roles(UserRole.ADMIN))):
+
+    """
+    Change a user's role, it applies to tokens issued from the next login on
+    """
+    user = await UserModel.find_one(UserModel.id == id, UserModel.deleted_at == None).update(
+        {"$set": {"role": role_data.role, "updated_at": datetime.now(timezone.utc)}},
+        response_type=UpdateResponse.NEW_DOCUMENT
+    )
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    user_cache.put(user)
+    return user
 
 # DELETE auth
 @router.delete("/{id}",status_code=status.HTTP_200_OK)
-async def delete_user(id: str):
+async def delete_user(id: str, _: dict = Depends(require_self_or_admin)):
     
     """
-    Delete auth by ID
+    Delete auth by ID, with SOFT_DELETE the user is only marked deleted and purged later
     """
-    user = await UserModel.get(id)
+    collection = UserModel.get_pymongo_collection()
+    if SOFT_DELETE:
+        now = datetime.now(timezone.utc)
+        user = await collection.find_one_and_update(
+            live({"_id": id}), {"$set": {"deleted_at": now, "updated_at": now}}, projection={"_id": 1, "email": 1}
+        )
+    else:
+        user = await collection.find_one_and_delete({"_id": id}, projection={"_id": 1, "email": 1})
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    user_cache.invalidate(id=id, email=user.get("email"))
 
-    await user.delete()
     return {"message": "User deleted successfully"}
 
 
@@ -276,6 +326,10 @@ async def login_with_google(request: GoogleLoginRequest):
     """
     Authenticate user using Google ID Token and issue a JWT.
     """
+    # The verifier (and httpx) is only loaded once Google login is used. Imported
+    # outside the try so a broken install or config is a 500, not a 401
+    from src.hindusthan.auth.utils.google_verifier import google_token_verifier
+
     try:
         if not request.id_token:
             raise HTTPException(
@@ -283,12 +337,8 @@ async def login_with_google(request: GoogleLoginRequest):
                 detail="ID Token is required"
             )
 
-        # Validate the ID token using Google's official library
-        id_info = id_token.verify_oauth2_token(
-            request.id_token,
-            google_requests.Request(),
-            GOOGLE_CLIENT_ID  # Your Google OAuth client ID
-        )
+        # Validate the ID token locally against cached Google signing keys
+        id_info = await google_token_verifier.verify(request.id_token)
 
         # Validate the token audience
         if id_info['aud'] not in [GOOGLE_CLIENT_ID]:
@@ -320,8 +370,8 @@ async def login_with_google(request: GoogleLoginRequest):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Find or create user
-    user = await UserModel.find_one(UserModel.email == email)
+    # Find or create user, not from the cache since the token carries the stored role
+    user = await UserModel.find_one(UserModel.email == email, LIVE)
 
     if user:
         # Update user information if needed
@@ -334,7 +384,12 @@ async def login_with_google(request: GoogleLoginRequest):
             update_fields["image_url"] = picture
 
         if update_fields:
-            await user.update({"$set": update_fields})
+            update_fields["updated_at"] = datetime.now(timezone.utc)
+            user = await UserModel.find_one(UserModel.id == user.id, UserModel.deleted_at == None).update(
+                {"$set": update_fields},
+                response_type=UpdateResponse.NEW_DOCUMENT
+            )
+            user_cache.put(user)
 
     else:
         # Create new user
@@ -347,6 +402,7 @@ async def login_with_google(request: GoogleLoginRequest):
         )
         await new_user.insert()
         user = new_user
+        user_cache.put(user)
 
     # Create JWT token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
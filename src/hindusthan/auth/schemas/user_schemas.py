@@ -1,5 +1,5 @@
-from pydantic import BaseModel,EmailStr
-from typing import Optional
+from pydantic import BaseModel,EmailStr,TypeAdapter
+from typing import Optional, List
 from datetime import datetime
 from src.hindusthan.auth.models.user_model import UserRole, AccountStatus
 
@@ -8,7 +8,6 @@ from src.hindusthan.auth.models.user_model import UserRole, AccountStatus
 class UserCreate(BaseModel):
     email: EmailStr
     phone_number: Optional[str]=None
-    role: Optional[UserRole] = UserRole.CUSTOMER
     password: str
 
 
@@ -20,11 +19,14 @@ class UserUpdate(BaseModel):
     google_id: Optional[str] = None
     image_url: Optional[str] = None
 
+# Schema for assigning a role (admin only)
+class UserRoleUpdate(BaseModel):
+    role: UserRole
+
 # Schema for User response
 class UserResponse(BaseModel):
     id: str
     email: EmailStr
-    password:Optional[str] = None
     google_id: Optional[str] = None
     image_url: Optional[str] = None
     phone_number: Optional[str]=None
@@ -37,6 +39,29 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+# Schema for cursor paginated User list
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+
+
+# Schema for fetching several users by id
+class UserBatchGetRequest(BaseModel):
+    ids: List[str]
+
+
+# Schema for batch get response, items follow the order of the requested ids
+class UserBatchGetResponse(BaseModel):
+    items: List[Optional[UserResponse]]  # null where the id was not found
+    not_found: List[str]
+
+
+# Adapters for the fast JSON response path
+UserListAdapter = TypeAdapter(List[UserResponse])
+UserPageAdapter = TypeAdapter(UserPage)
+UserBatchGetAdapter = TypeAdapter(UserBatchGetResponse)
+
 class ResendOTP(BaseModel):
     email:EmailStr
 
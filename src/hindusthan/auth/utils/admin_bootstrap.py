@@ -0,0 +1,53 @@
+"""
+Create or promote an admin account directly in the database.
+
+Signup only creates customers, so the first admin (and load test admins)
+are seeded here; further roles are assigned with PATCH /users/{id}/role.
+
+    python -m src.hindusthan.auth.utils.admin_bootstrap --email admin@example.com --password ...
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+
+from src.hindusthan.auth.models.user_model import UserModel, UserRole
+from src.hindusthan.auth.utils.auth_utils import hash_password
+from src.hindusthan.database.soft_delete import LIVE
+
+
+async def ensure_admin(email: str, password: str) -> UserModel:
+    """
+    Verified admin with this email and password, created or updated in place.
+    Needs an initialized database.
+    """
+    hashed = hash_password(password)
+    user = await UserModel.find_one(UserModel.email == email, LIVE)
+    if user is None:
+        user = UserModel(email=email, password=hashed, role=UserRole.ADMIN, is_verified=True)
+        await user.insert()
+        return user
+    await user.set({"password": hashed, "role": UserRole.ADMIN, "is_verified": True,
+                    "updated_at": datetime.now(timezone.utc)})
+    return user
+
+
+async def _main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Create or promote an admin account")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    args = parser.parse_args(argv)
+
+    from src.hindusthan.database.database import initialize_database, close_database
+
+    await initialize_database(index_mode="off")
+    try:
+        user = await ensure_admin(args.email, args.password)
+    finally:
+        await close_database()
+    print(f"✅ {user.email} is an admin ({user.id})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError
+
+from src.hindusthan.auth.models.user_model import UserRole
+from src.hindusthan.auth.utils.auth_utils import decode_access_token
+from src.hindusthan.auth.utils.ttl_cache import TTLCache
+
+# Verified token cache settings
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+JWT_CACHE_TTL_SECONDS = int(os.getenv("JWT_CACHE_TTL_SECONDS", "60"))
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login", auto_error=False)
+
+# sha256(token) -> claims, entries never outlive the token's exp
+token_cache = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=JWT_CACHE_TTL_SECONDS)
+
+STAFF_ROLES = (UserRole.ADMIN, UserRole.FIELD_AGENT, UserRole.MARKETER)
+
+
+def _unauthorized(detail: str = "Could not validate credentials") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def verify_token(token: str) -> dict:
+    """
+    Return the claims of a valid access token, using the cache when possible
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    if claims is not None:
+        return claims
+
+    try:
+        claims = decode_access_token(token)
+    except JWTError:
+        raise _unauthorized()
+    if "sub" not in claims or "id" not in claims:
+        raise _unauthorized()
+
+    token_cache.set(key, claims, ttl=claims.get("exp", 0) - time.time())
+    return claims
+
+
+async def get_current_claims(token: Optional[str] = Depends(oauth2_scheme)) -> dict:
+    if not token:
+        raise _unauthorized("Not authenticated")
+    return verify_token(token)
+
+
+def claims_role(claims: dict) -> UserRole:
+    # tokens issued before roles were added carry no role, treat them as the least privileged
+    try:
+        return UserRole(claims.get("role", UserRole.CUSTOMER))
+    except ValueError:
+        return UserRole.CUSTOMER
+
+
+def require_roles(*roles: UserRole):
+    """
+    Dependency that only lets users with one of the given roles through
+    """
+
+    async def dependency(claims: dict = Depends(get_current_claims)) -> dict:
+        if claims_role(claims) not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        return claims
+
+    return dependency
+
+
+async def require_self_or_admin(id: str, claims: dict = Depends(get_current_claims)) -> dict:
+    """
+    Dependency for /{id} routes: the user themselves or an admin
+    """
+    if claims.get("id") != id and claims_role(claims) != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return claims
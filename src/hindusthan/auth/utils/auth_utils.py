@@ -1,29 +1,52 @@
-from passlib.context import CryptContext
 from datetime import datetime,timedelta,timezone
-from typing import Optional
-from jose import jwt
+from typing import Optional, Dict
+from functools import lru_cache
+from jose import jwt, JWTError
+import json
+import os
+import time
+from src.hindusthan.monitoring.metrics import jwt_issue_duration_seconds
 
-SECRET_KEY = "Hindusthan-prasad-restapi"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
-GOOGLE_CLIENT_ID = "644874684247-f1e2uj3dbmjaoqaakt2fprnjcsgcar59.apps.googleusercontent.com"
+SECRET_KEY = os.getenv("SECRET_KEY", "Hindusthan-prasad-restapi")
+ALGORITHM = os.getenv("ALGORITHM", "HS256")
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "644874684247-f1e2uj3dbmjaoqaakt2fprnjcsgcar59.apps.googleusercontent.com")
 
-pwd_context = CryptContext( schemes=["argon2"],deprecated="auto")
+# Key rotation: JWT_KEYS is a JSON object {"kid": "key"}, new tokens are signed with JWT_ACTIVE_KID.
+# Tokens without a kid are checked against SECRET_KEY.
+JWT_KEYS: Dict[str, str] = json.loads(os.getenv("JWT_KEYS", "{}"))
+JWT_ACTIVE_KID = os.getenv("JWT_ACTIVE_KID") or None
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    """
+    passlib and its argon2 backend are imported on the first hash, not at startup
+    """
+    from passlib.context import CryptContext
+    return CryptContext( schemes=["argon2"],deprecated="auto")
 
 
 def hash_password(password: str) -> str:
 
     if not password:
         return ""
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    started = time.perf_counter()
+    try:
+        return _encode_access_token(data, expires_delta)
+    finally:
+        jwt_issue_duration_seconds.observe(time.perf_counter() - started)
+
+
+def _encode_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -31,5 +54,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
 
+    if JWT_ACTIVE_KID:
+        return jwt.encode(to_encode, JWT_KEYS[JWT_ACTIVE_KID], algorithm=ALGORITHM, headers={"kid": JWT_ACTIVE_KID})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify signature and expiry of an access token and return its claims.
+    Raises JWTError when the token is not valid.
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is None:
+        key = SECRET_KEY
+    elif kid in JWT_KEYS:
+        key = JWT_KEYS[kid]
+    else:
+        raise JWTError("Unknown key id")
+    return jwt.decode(token, key, algorithms=[ALGORITHM])
\ No newline at end of file
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+import httpx
+from jose import jwt
+from jose.exceptions import JWTError
+
+from src.hindusthan.auth.utils.auth_utils import GOOGLE_CLIENT_ID
+
+# Google JWKS settings
+GOOGLE_JWKS_URL = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+GOOGLE_JWKS_FILE = os.getenv("GOOGLE_JWKS_FILE")  # local file, mainly for tests / offline use
+GOOGLE_JWKS_DEFAULT_MAX_AGE = int(os.getenv("GOOGLE_JWKS_DEFAULT_MAX_AGE", "3600"))
+GOOGLE_JWKS_REFRESH_MARGIN = int(os.getenv("GOOGLE_JWKS_REFRESH_MARGIN", "300"))
+# an unknown kid forces a refresh at most this often, tokens with made-up kids cannot hammer Google
+GOOGLE_JWKS_MIN_REFRESH_INTERVAL = int(os.getenv("GOOGLE_JWKS_MIN_REFRESH_INTERVAL", "60"))
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control: Optional[str], default: int = GOOGLE_JWKS_DEFAULT_MAX_AGE) -> int:
+    """
+    Read max-age (seconds) from a Cache-Control header
+    """
+    if cache_control:
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            return int(match.group(1))
+    return default
+
+
+def _consume_result(task: asyncio.Task):
+    # background refresh errors are retried on a later request, not logged as never retrieved
+    if not task.cancelled():
+        task.exception()
+
+
+class JWKSSource(ABC):
+    """
+    Where signing keys come from. fetch() returns (jwks, max_age_seconds).
+    """
+
+    @abstractmethod
+    async def fetch(self) -> Tuple[dict, int]:
+        ...
+
+    async def close(self):
+        pass
+
+
+class HTTPJWKSSource(JWKSSource):
+    def __init__(self, url: str = GOOGLE_JWKS_URL, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+        # created on the first fetch, building its SSL context is slow
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def fetch(self) -> Tuple[dict, int]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.get(self.url)
+        response.raise_for_status()
+        return response.json(), parse_max_age(response.headers.get("cache-control"))
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class FileJWKSSource(JWKSSource):
+    def __init__(self, path: str, max_age: int = GOOGLE_JWKS_DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+
+    async def fetch(self) -> Tuple[dict, int]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f), self.max_age
+
+
+class GoogleTokenVerifier:
+    """
+    Verifies Google ID tokens locally (RS256) against cached JWKS.
+
+    Keys are refreshed once they expire, and in the background shortly before
+    they expire. An unknown kid forces a refresh too, but fetches are at least
+    min_refresh_interval apart: within that window an unknown kid is rejected
+    and expired keys are kept. Concurrent refreshes share a single fetch. If a
+    refresh fails the last known keys keep being used.
+    Raises ValueError for any invalid token.
+    """
+
+    def __init__(
+        self,
+        source: JWKSSource,
+        audience: str = GOOGLE_CLIENT_ID,
+        issuers=None,
+        refresh_margin: int = GOOGLE_JWKS_REFRESH_MARGIN,
+        min_refresh_interval: int = GOOGLE_JWKS_MIN_REFRESH_INTERVAL,
+    ):
+        self.source = source
+        self.audience = audience
+        self.issuers = issuers or GOOGLE_ISSUERS
+        self.refresh_margin = refresh_margin
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, dict] = {}
+        self._expires_at = 0.0
+        self._fetched_at: Optional[float] = None  # last fetch attempt, successful or not
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def _do_refresh(self):
+        self._fetched_at = time.monotonic()
+        jwks, max_age = await self.source.fetch()
+        self._keys = {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+        self._expires_at = time.monotonic() + max_age
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._do_refresh())
+            self._refresh_task.add_done_callback(_consume_result)
+        return self._refresh_task
+
+    async def refresh(self):
+        await asyncio.shield(self._start_refresh())
+
+    def _may_force_refresh(self, now: float) -> bool:
+        return self._fetched_at is None or now - self._fetched_at >= self.min_refresh_interval
+
+    async def _get_key(self, kid: str) -> dict:
+        now = time.monotonic()
+        stale = now >= self._expires_at or kid not in self._keys
+        if not self._keys or (stale and self._may_force_refresh(now)):
+            try:
+                await self.refresh()
+            except Exception:
+                # Offline: fall back to whatever we already have
+                if not self._keys:
+                    raise ValueError("Unable to load Google signing keys")
+        elif now >= self._expires_at - self.refresh_margin and self._may_force_refresh(now):
+            self._start_refresh()
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise ValueError("Unknown signing key")
+        return key
+
+    async def verify(self, token: str) -> dict:
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise ValueError(str(e))
+        if header.get("alg") != "RS256":
+            raise ValueError("Unexpected token algorithm")
+
+        key = await self._get_key(header.get("kid", ""))
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.audience,
+                issuer=self.issuers,
+                options={"verify_at_hash": False},
+            )
+        except JWTError as e:
+            raise ValueError(str(e))
+
+    async def close(self):
+        await self.source.close()
+
+
+def build_jwks_source() -> JWKSSource:
+    if GOOGLE_JWKS_FILE:
+        return FileJWKSSource(GOOGLE_JWKS_FILE)
+    return HTTPJWKSSource(GOOGLE_JWKS_URL)
+
+
+google_token_verifier = GoogleTokenVerifier(build_jwks_source())
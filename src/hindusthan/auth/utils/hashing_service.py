@@ -0,0 +1,140 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from src.hindusthan.auth.utils.auth_utils import hash_password, verify_password
+from src.hindusthan.monitoring.metrics import password_hash_duration_seconds, password_hash_queue_wait_seconds
+
+# Hashing pool settings
+HASH_POOL_KIND = os.getenv("HASH_POOL_KIND", "thread")  # "thread" or "process"
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_MAX_IN_FLIGHT = int(os.getenv("HASH_MAX_IN_FLIGHT", "64"))
+HASH_RETRY_AFTER_SECONDS = int(os.getenv("HASH_RETRY_AFTER_SECONDS", "1"))
+
+
+def _timed_call(fn, *args):
+    """
+    Run fn inside the worker and report when it actually started,
+    so the caller can split queue wait from hash time.
+    time.monotonic() is system wide on Linux, so it is safe across processes too.
+    """
+    started_at = time.monotonic()
+    result = fn(*args)
+    return result, started_at, time.monotonic()
+
+
+class HashingStats:
+    """
+    Counters for the hashing pool (seconds are accumulated totals)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds = 0.0
+        self.queue_wait_max_seconds = 0.0
+        self.hash_seconds = 0.0
+        self.hash_max_seconds = 0.0
+
+    def observe(self, queue_wait: float, hash_time: float):
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_seconds += queue_wait
+            self.queue_wait_max_seconds = max(self.queue_wait_max_seconds, queue_wait)
+            self.hash_seconds += hash_time
+            self.hash_max_seconds = max(self.hash_max_seconds, hash_time)
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_seconds_total": self.queue_wait_seconds,
+                "queue_wait_seconds_max": self.queue_wait_max_seconds,
+                "hash_seconds_total": self.hash_seconds,
+                "hash_seconds_max": self.hash_max_seconds,
+            }
+
+
+class PasswordHasher:
+    """
+    Runs Argon2 hashing/verification off the event loop on a bounded pool.
+    When more than max_in_flight jobs are pending, new ones are rejected with 503.
+    """
+
+    def __init__(
+        self,
+        kind: str = HASH_POOL_KIND,
+        max_workers: int = HASH_POOL_WORKERS,
+        max_in_flight: int = HASH_MAX_IN_FLIGHT,
+        retry_after: int = HASH_RETRY_AFTER_SECONDS,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown hash pool kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.stats = HashingStats()
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="argon2"
+                )
+        return self._executor
+
+    async def _submit(self, operation: str, fn, *args):
+        # in_flight is only touched from the event loop thread, so no lock is needed
+        if self.in_flight >= self.max_in_flight:
+            self.stats.reject()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            submitted_at = time.monotonic()
+            result, started_at, finished_at = await loop.run_in_executor(
+                self._get_executor(), _timed_call, fn, *args
+            )
+            self.stats.observe(started_at - submitted_at, finished_at - started_at)
+            password_hash_queue_wait_seconds.observe(started_at - submitted_at, operation)
+            password_hash_duration_seconds.observe(finished_at - started_at, operation)
+            return result
+        finally:
+            self.in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        if not password:
+            return ""
+        return await self._submit("hash", hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit("verify", verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,31 @@
+import os
+
+from src.hindusthan.auth.utils.otp_store import OTP_TTL_SECONDS
+from src.hindusthan.jobs.utils.job_queue import job_queue
+from src.hindusthan.jobs.utils.senders import Message, notification_sender
+
+# Only for development and load tests: returning the OTP in the signup / resend
+# response makes email verification meaningless, so it is an explicit opt-in
+OTP_IN_RESPONSE = os.getenv("OTP_IN_RESPONSE", "false").lower() in ("1", "true", "yes")
+if OTP_IN_RESPONSE:
+    print("⚠️ OTP_IN_RESPONSE is on, OTPs are returned in responses. Never enable it in production")
+
+SEND_OTP_JOB = "send_otp"
+
+
+async def send_otp(payload: dict):
+    await notification_sender.send(Message(
+        to=payload["email"],
+        subject="Your Hindusthan verification code",
+        body=f"Your verification code is {payload['otp']}. It expires in {OTP_TTL_SECONDS // 60} minutes.",
+    ))
+
+
+job_queue.register(SEND_OTP_JOB, send_otp)
+
+
+async def queue_otp(email: str, otp_code: str) -> str:
+    """
+    Deliver the OTP in the background, the job is dropped once the OTP expired
+    """
+    return await job_queue.enqueue(SEND_OTP_JOB, {"email": email, "otp": otp_code}, expires_in=OTP_TTL_SECONDS)
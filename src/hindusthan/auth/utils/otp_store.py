@@ -0,0 +1,221 @@
+import os
+import secrets
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.hindusthan.auth.models.user_model import OTPModel
+
+# OTP settings
+OTP_STORE = os.getenv("OTP_STORE", "mongo")  # "mongo", "memory" or "redis"
+OTP_TTL_SECONDS = int(os.getenv("OTP_TTL_SECONDS", "300"))
+OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", "5"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class OTPStatus(str, Enum):
+    VALID = "valid"
+    INVALID = "invalid"
+    EXPIRED = "expired"
+    TOO_MANY_ATTEMPTS = "too_many_attempts"
+
+
+def generate_otp() -> str:
+    return str(secrets.randbelow(900000) + 100000)
+
+
+class OTPStore(ABC):
+    """
+    Keeps at most one pending OTP per email.
+    issue() replaces any previous code, verify() consumes the code when it matches
+    and counts failed attempts otherwise.
+    """
+
+    def __init__(self, ttl_seconds: int = OTP_TTL_SECONDS, max_attempts: int = OTP_MAX_ATTEMPTS):
+        self.ttl_seconds = ttl_seconds
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    async def issue(self, email: str) -> str:
+        ...
+
+    @abstractmethod
+    async def verify(self, email: str, otp_code: str) -> OTPStatus:
+        ...
+
+    async def close(self):
+        pass
+
+
+class MongoOTPStore(OTPStore):
+    """
+    Stores OTPs in the otps collection, expiry is enforced by the TTL index on expires_at
+    and the unique index on email keeps one OTP per email.
+    Issue and a successful verify are one round trip each.
+    """
+
+    async def issue(self, email: str) -> str:
+        otp_code = generate_otp()
+        now = datetime.now(timezone.utc)
+        update = {
+            "$set": {
+                "otp_code": otp_code,
+                "expires_at": now + timedelta(seconds=self.ttl_seconds),
+                "attempts": 0,
+                "updated_at": now,
+            },
+            "$setOnInsert": {"_id": str(uuid.uuid4()), "created_at": now},
+        }
+        collection = OTPModel.get_pymongo_collection()
+        try:
+            await collection.update_one({"email": email}, update, upsert=True)
+        except DuplicateKeyError:
+            # a concurrent issue() inserted first, the unique email index kept it single; update that one
+            await collection.update_one({"email": email}, update)
+        return otp_code
+
+    async def verify(self, email: str, otp_code: str) -> OTPStatus:
+        collection = OTPModel.get_pymongo_collection()
+        now = datetime.now(timezone.utc)
+
+        result = await collection.delete_one({
+            "email": email,
+            "otp_code": otp_code,
+            "expires_at": {"$gt": now},
+            "attempts": {"$lt": self.max_attempts},
+        })
+        if result.deleted_count:
+            return OTPStatus.VALID
+
+        # Failure path only: count the attempt and work out why it failed
+        record = await collection.find_one_and_update(
+            {"email": email},
+            {"$inc": {"attempts": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not record:
+            return OTPStatus.INVALID
+
+        expires_at = record["expires_at"]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if now > expires_at:
+            await collection.delete_one({"_id": record["_id"]})
+            return OTPStatus.EXPIRED
+        if record["attempts"] >= self.max_attempts:
+            await collection.delete_one({"_id": record["_id"]})
+            return OTPStatus.TOO_MANY_ATTEMPTS
+        return OTPStatus.INVALID
+
+
+class MemoryOTPStore(OTPStore):
+    """
+    In-process store, for single worker deployments and tests
+    """
+
+    def __init__(self, ttl_seconds: int = OTP_TTL_SECONDS, max_attempts: int = OTP_MAX_ATTEMPTS):
+        super().__init__(ttl_seconds, max_attempts)
+        # email -> (otp_code, expires_at monotonic, attempts)
+        self._otps: Dict[str, Tuple[str, float, int]] = {}
+
+    async def issue(self, email: str) -> str:
+        otp_code = generate_otp()
+        self._otps[email] = (otp_code, time.monotonic() + self.ttl_seconds, 0)
+        return otp_code
+
+    async def verify(self, email: str, otp_code: str) -> OTPStatus:
+        record = self._otps.get(email)
+        if record is None:
+            return OTPStatus.INVALID
+
+        code, expires_at, attempts = record
+        if time.monotonic() > expires_at:
+            del self._otps[email]
+            return OTPStatus.EXPIRED
+        if secrets.compare_digest(code, otp_code):
+            del self._otps[email]
+            return OTPStatus.VALID
+
+        attempts += 1
+        if attempts >= self.max_attempts:
+            del self._otps[email]
+            return OTPStatus.TOO_MANY_ATTEMPTS
+        self._otps[email] = (code, expires_at, attempts)
+        return OTPStatus.INVALID
+
+
+# KEYS[1] = otp key, ARGV[1] = submitted code, ARGV[2] = max attempts
+_REDIS_VERIFY_SCRIPT = """
+local code = redis.call('HGET', KEYS[1], 'code')
+if not code then
+    return 'invalid'
+end
+if code == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 'valid'
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return 'too_many_attempts'
+end
+return 'invalid'
+"""
+
+
+class RedisOTPStore(OTPStore):
+    """
+    Redis (or any Redis protocol server) store. Expiry is the key TTL and
+    verify runs as one Lua script, so it is atomic and one round trip.
+    An expired code is reported as invalid since the key is already gone.
+    """
+
+    def __init__(self, redis=None, url: str = REDIS_URL, ttl_seconds: int = OTP_TTL_SECONDS,
+                 max_attempts: int = OTP_MAX_ATTEMPTS, prefix: str = "otp:"):
+        super().__init__(ttl_seconds, max_attempts)
+        if redis is None:
+            # optional dependency, only needed when OTP_STORE=redis
+            from redis.asyncio import Redis
+            redis = Redis.from_url(url, decode_responses=True)
+        self.redis = redis
+        self.prefix = prefix
+        self._verify_script = redis.register_script(_REDIS_VERIFY_SCRIPT)
+
+    async def issue(self, email: str) -> str:
+        otp_code = generate_otp()
+        key = self.prefix + email
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={"code": otp_code, "attempts": 0})
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+        return otp_code
+
+    async def verify(self, email: str, otp_code: str) -> OTPStatus:
+        result = await self._verify_script(keys=[self.prefix + email], args=[otp_code, self.max_attempts])
+        if isinstance(result, bytes):
+            result = result.decode()
+        return OTPStatus(result)
+
+    async def close(self):
+        await self.redis.aclose()
+
+
+def build_otp_store(kind: Optional[str] = None) -> OTPStore:
+    kind = kind or OTP_STORE
+    if kind == "memory":
+        return MemoryOTPStore()
+    if kind == "redis":
+        return RedisOTPStore()
+    if kind == "mongo":
+        return MongoOTPStore()
+    raise ValueError(f"Unknown OTP store: {kind}")
+
+
+otp_store = build_otp_store()
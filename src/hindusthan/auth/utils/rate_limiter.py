@@ -0,0 +1,196 @@
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from src.hindusthan.monitoring.metrics import rate_limited_total
+
+# Rate limit settings
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" or "redis"
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# route -> scope -> limit, override with RATE_LIMIT_<ROUTE>_<SCOPE>, e.g. RATE_LIMIT_LOGIN_EMAIL=5/minute
+DEFAULT_LIMITS = {
+    "login": {"ip": "30/minute", "email": "10/minute"},
+    "signup": {"ip": "10/minute"},
+    "resend_otp": {"ip": "10/minute", "email": "3/minute"},
+    "verify_otp": {"ip": "30/minute", "email": "10/minute"},
+}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Token bucket: holds up to capacity tokens, refilled at rate tokens per second
+    """
+    capacity: int
+    rate: float
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        # "10/minute" -> bursts of 10, one token back every 6 seconds
+        count, _, period = value.strip().partition("/")
+        seconds = _PERIODS.get(period.strip().rstrip("s")) if period else 1
+        if seconds is None:
+            raise ValueError(f"Unknown rate limit period: {value}")
+        return cls(capacity=int(count), rate=int(count) / seconds)
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def take(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        """
+        Take one token for key, returns (allowed, seconds until a token is available)
+        """
+
+    async def close(self):
+        pass
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process buckets, each worker limits on its own.
+    The least recently used buckets are dropped beyond max_keys.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated_at) * limit.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / limit.rate
+
+
+# KEYS[1] = bucket key, ARGV = capacity, rate, now (seconds)
+_REDIS_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Buckets shared by all workers in Redis (or any Redis protocol server).
+    Each take is one atomic Lua script call. When Redis is unreachable
+    requests are let through rather than failing logins.
+    """
+
+    def __init__(self, redis=None, url: str = REDIS_URL, prefix: str = "ratelimit:"):
+        if redis is None:
+            # optional dependency, only needed when RATE_LIMIT_BACKEND=redis
+            from redis.asyncio import Redis
+            redis = Redis.from_url(url, decode_responses=True)
+        self.redis = redis
+        self.prefix = prefix
+        self._take_script = redis.register_script(_REDIS_TAKE_SCRIPT)
+
+    async def take(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        try:
+            allowed, tokens = await self._take_script(
+                keys=[self.prefix + key], args=[limit.capacity, limit.rate, time.time()]
+            )
+        except Exception as e:
+            print(f"⚠️ Rate limit backend unavailable, allowing request: {e}")
+            return True, 0.0
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / limit.rate
+
+    async def close(self):
+        await self.redis.aclose()
+
+
+def load_limits() -> Dict[str, Dict[str, RateLimit]]:
+    limits = {}
+    for route, scopes in DEFAULT_LIMITS.items():
+        limits[route] = {}
+        for scope in ("ip", "email"):
+            value = os.getenv(f"RATE_LIMIT_{route.upper()}_{scope.upper()}", scopes.get(scope))
+            # an empty value turns the limit off
+            if value:
+                limits[route][scope] = RateLimit.parse(value)
+    return limits
+
+
+def client_ip(request: Request) -> str:
+    # Never read X-Forwarded-For here, its leftmost entries are whatever the client sent.
+    # uvicorn (proxy_headers) already replaces the peer with the client address reported
+    # by proxies listed in FORWARDED_ALLOW_IPS.
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    """
+    Per-route limits keyed by client IP and by email
+    """
+
+    def __init__(self, backend: RateLimitBackend, limits: Optional[Dict[str, Dict[str, RateLimit]]] = None,
+                 enabled: bool = RATE_LIMIT_ENABLED):
+        self.backend = backend
+        self.limits = load_limits() if limits is None else limits
+        self.enabled = enabled
+
+    async def check(self, route: str, request: Request, email: Optional[str] = None):
+        """
+        Take a token from each bucket of route, raise 429 with Retry-After when one is empty
+        """
+        if not self.enabled:
+            return
+        keys = {"ip": client_ip(request), "email": email.strip().lower() if email else None}
+        for scope, limit in self.limits.get(route, {}).items():
+            if not keys[scope]:
+                continue
+            allowed, retry_after = await self.backend.take(f"{route}:{scope}:{keys[scope]}", limit)
+            if not allowed:
+                rate_limited_total.inc(route, scope)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests, please retry later",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+
+    async def close(self):
+        await self.backend.close()
+
+
+def build_rate_limiter(kind: Optional[str] = None) -> RateLimiter:
+    kind = kind or RATE_LIMIT_BACKEND
+    if kind == "memory":
+        return RateLimiter(MemoryRateLimitBackend())
+    if kind == "redis":
+        return RateLimiter(RedisRateLimitBackend())
+    raise ValueError(f"Unknown rate limit backend: {kind}")
+
+
+rate_limiter = build_rate_limiter()
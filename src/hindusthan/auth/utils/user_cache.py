@@ -0,0 +1,106 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from src.hindusthan.auth.models.user_model import UserModel
+from src.hindusthan.auth.utils.ttl_cache import TTLCache
+
+# User cache settings
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+
+
+class UserCache:
+    """
+    Read-through cache for UserModel keyed by id and by email.
+
+    Concurrent misses for the same key share one database load. Only found
+    users are cached. Routes that change a user must call put() or
+    invalidate(), and must not mutate a cached instance in place otherwise.
+
+    Every put() and invalidate() bumps a generation counter and detaches the
+    in-flight loads of that user, so a load that started before the write
+    cannot cache its older copy over the newer one.
+
+    Entries may be up to USER_CACHE_TTL_SECONDS old and other workers never
+    see this process's writes, so credential and role checks must read the
+    database instead.
+    """
+
+    def __init__(self, maxsize: int = USER_CACHE_SIZE, ttl: float = USER_CACHE_TTL_SECONDS):
+        self._by_id = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._id_by_email = TTLCache(maxsize=maxsize, ttl=ttl)
+        # key -> (shared load, generation it started at)
+        self._inflight: Dict[Hashable, Tuple[asyncio.Future, int]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Optional[UserModel]]]) -> Optional[UserModel]:
+        self.misses += 1
+        if key not in self._inflight:
+            future = asyncio.ensure_future(loader())
+            self._inflight[key] = (future, self._generation)
+            future.add_done_callback(lambda done: self._detach(key, done))
+        future, generation = self._inflight[key]
+        user = await asyncio.shield(future)
+        # a put() or invalidate() landed while loading, the result may predate it
+        if user is not None and generation == self._generation:
+            self._store(user)
+        return user
+
+    def _detach(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key, (None,))[0] is future:
+            del self._inflight[key]
+
+    def _written(self, id: Optional[str], email: Optional[str]):
+        self._generation += 1
+        self._inflight.pop(("id", id), None)
+        self._inflight.pop(("email", email), None)
+
+    def _store(self, user: UserModel):
+        self._by_id.set(user.id, user)
+        self._id_by_email.set(user.email, user.id)
+
+    def _cached(self, id: Optional[str]) -> Optional[UserModel]:
+        user = self._by_id.get(id) if id is not None else None
+        if user is not None:
+            self.hits += 1
+        return user
+
+    async def get_by_id(self, id: str) -> Optional[UserModel]:
+        return self._cached(id) or await self._load(("id", id), lambda: UserModel.find_one(UserModel.id == id, UserModel.deleted_at == None))
+
+    async def get_by_email(self, email: str) -> Optional[UserModel]:
+        user = self._by_id.get(self._id_by_email.get(email))
+        # the mapping can be stale after an email change
+        if user is not None and user.email == email:
+            self.hits += 1
+            return user
+        return await self._load(("email", email), lambda: UserModel.find_one(
+            UserModel.email == email, UserModel.deleted_at == None
+        ))
+
+    def put(self, user: UserModel):
+        """
+        Write-through after the user was created or updated
+        """
+        self._written(user.id, user.email)
+        self._store(user)
+
+    def invalidate(self, id: Optional[str] = None, email: Optional[str] = None):
+        self._written(id, email)
+        if id is not None:
+            self._by_id.pop(id)
+        if email is not None:
+            self._id_by_email.pop(email)
+
+    def clear(self):
+        self._by_id.clear()
+        self._id_by_email.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._by_id), "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache()
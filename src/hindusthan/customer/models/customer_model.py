@@ -1,8 +1,12 @@
 from beanie import Document, before_event, Replace, Save
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
 from datetime import datetime, timezone
 from pydantic import Field,EmailStr
+from typing import Any, Dict, Optional
 import uuid
 
+from src.hindusthan.database.soft_delete import LIVE, DELETED
+
 
 class CustomerModel(Document):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), alias="_id")
@@ -28,6 +32,7 @@ class CustomerModel(Document):
     sub_service: str = ""
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    deleted_at: Optional[datetime] = None  # set by a soft delete
 
     # Auto-update "updated_at" on update
     @before_event([Save, Replace])
@@ -36,3 +41,66 @@ class CustomerModel(Document):
 
     class Settings:
         name = "customers"
+        indexes = [
+            # hot indexes only cover live customers (deleted_at null), queries must filter on LIVE
+            # keyset pagination
+            IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)], name="created_at_id",
+                       partialFilterExpression=LIVE),
+            # delta sync (GET /customers/changes), includes soft-deleted customers
+            IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)], name="updated_at_id"),
+            # search filters, each ending in the pagination order
+            IndexModel([("district", ASCENDING), ("mandal", ASCENDING), ("village", ASCENDING),
+                        ("created_at", ASCENDING), ("_id", ASCENDING)],
+                       name="geo_created_at", partialFilterExpression=LIVE),
+            IndexModel([("village", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)],
+                       name="village_created_at", partialFilterExpression=LIVE),
+            IndexModel([("service", ASCENDING), ("sub_service", ASCENDING),
+                        ("created_at", ASCENDING), ("_id", ASCENDING)],
+                       name="service_created_at", partialFilterExpression=LIVE),
+            IndexModel([("register_by", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)],
+                       name="register_by_created_at", partialFilterExpression=LIVE),
+            IndexModel([("user_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)],
+                       name="user_id_created_at", partialFilterExpression=LIVE),
+            # phone / name prefix search
+            IndexModel([("phone_number", ASCENDING)], name="phone_number", partialFilterExpression=LIVE),
+            IndexModel([("first_name", ASCENDING)], name="first_name", partialFilterExpression=LIVE),
+            # full-text search on names
+            IndexModel([("first_name", TEXT), ("middle_name", TEXT), ("last_name", TEXT), ("nick_name", TEXT)],
+                       name="names_text", partialFilterExpression=LIVE),
+            # purge of old soft-deleted customers
+            IndexModel([("deleted_at", ASCENDING)], name="deleted_at_purge", partialFilterExpression=DELETED),
+        ]
+
+
+class CustomerTombstoneModel(Document):
+    """
+    Marker left behind by a deleted customer so delta sync can report the deletion
+    """
+    id: str = Field(alias="_id")
+    deleted_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "customer_tombstones"
+        indexes = [
+            IndexModel([("deleted_at", ASCENDING), ("_id", ASCENDING)], name="deleted_at_id"),
+        ]
+
+
+class CustomerRollupModel(Document):
+    """
+    Live customer count of one group of a dashboard dimension, e.g. one
+    village or one agent's registrations on one day. Kept up to date by
+    the customer routes, see customer/utils/rollup_utils.py
+    """
+    id: Dict[str, Any] = Field(alias="_id")  # {"dimension": ..., "key": {...}}, see rollup_id
+    dimension: str
+    key: Dict[str, str]
+    customers: int = 0  # live customers in the group
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "customer_rollups"
+        indexes = [
+            # groups of a dimension, largest first
+            IndexModel([("dimension", ASCENDING), ("customers", DESCENDING)], name="dimension_customers"),
+        ]
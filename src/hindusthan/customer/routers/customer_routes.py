@@ -1,34 +1,294 @@
-from fastapi import APIRouter, HTTPException,status
-from typing import List
+from datetime import date, datetime, time, timedelta, timezone
+from beanie import UpdateResponse
+from fastapi import APIRouter, HTTPException,status, Request, Response, Query, Depends
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Union
 from src.hindusthan.customer.models.customer_model import CustomerModel
-from src.hindusthan.customer.schemas.customer_schemas import CustomerCreate, CustomerUpdate, CustomerResponse
+from src.hindusthan.customer.schemas.customer_schemas import CustomerCreate, CustomerUpdate, CustomerResponse, \
+    CustomerPage, CustomerPageAdapter, CustomerListAdapter, CustomerBulkResponse, CustomerChanges, \
+    CustomerBatchGetRequest, CustomerBatchGetResponse, CustomerBatchGetAdapter, CustomerStats
+from src.hindusthan.customer.utils.bulk_utils import parse_rows, ingest_customers, CUSTOMER_BULK_BATCH_SIZE, \
+    CUSTOMER_BULK_MAX_ROWS
+from src.hindusthan.customer.utils.rollup_utils import update_rollups, rollup_counts, live_counts, \
+    rebuild_rollups, ROLLUP_FIELDS, ROLLUP_PROJECTION
+from src.hindusthan.customer.utils.export_utils import export_customers, EXPORT_FIELDS, CUSTOMER_EXPORT_BATCH_SIZE
+from src.hindusthan.customer.utils.sync_utils import weak_etag, etag_matches, not_modified, customer_changes, \
+    record_tombstone, CACHE_CONTROL
+from src.hindusthan.auth.utils.auth_dependencies import get_current_claims, require_roles, STAFF_ROLES
+from src.hindusthan.auth.models.user_model import UserRole
+from src.hindusthan.database.pagination import cursor_page, raw_cursor_page
+from src.hindusthan.database.batch_get import batch_get
+from src.hindusthan.database.fast_json import FAST_JSON_RESPONSES, fetch_raw, json_response, schema_projection
+from src.hindusthan.database.soft_delete import SOFT_DELETE, LIVE, live
+import re
 
-router = APIRouter(prefix="/customers", tags=["customers"])
+# Customer records are managed by staff only
+router = APIRouter(prefix="/customers", tags=["customers"], dependencies=[Depends(require_roles(*STAFF_ROLES))])
+
+CUSTOMER_PROJECTION = schema_projection(CustomerResponse)
+# list/search/export reads use the "customers" read preference (MONGO_READ_PREFERENCE_CUSTOMERS)
+READ_GROUP = "customers"
+# an update moving a customer between rollup groups retries this often when it races another update
+CUSTOMER_UPDATE_ATTEMPTS = 3
 
 # GET all customers
-@router.get("/", response_model=List[CustomerResponse],status_code=status.HTTP_200_OK)
-async def get_all_customers(skip: int = 0, limit: int = 10):
+@router.get("/", response_model=Union[List[CustomerResponse], CustomerPage],status_code=status.HTTP_200_OK)
+async def get_all_customers(request: Request, response: Response, skip: int = Query(0, ge=0),
+                            limit: int = Query(10, ge=1, le=100),
+                            cursor: Optional[str] = None):
     
     """
-    Get all customers with pagination
+    Get all customers with pagination.
+    Pass cursor (empty for the first page) to use keyset pagination,
+    the response then carries next_cursor for the following page.
+    Answers 304 when If-None-Match carries the page's current ETag.
     """
-    customers = await CustomerModel.find_all().skip(skip).limit(limit).to_list()
+    # with FAST_JSON_RESPONSES raw documents are validated once, no response_model pass
+    projection = CUSTOMER_PROJECTION if FAST_JSON_RESPONSES else None
+    if cursor is not None:
+        items, next_cursor = await raw_cursor_page(CustomerModel, cursor, limit, LIVE, projection, group=READ_GROUP)
+        content, adapter = {"items": items, "next_cursor": next_cursor}, CustomerPageAdapter
+    else:
+        items = await fetch_raw(CustomerModel, LIVE, skip=skip, limit=limit, projection=projection, group=READ_GROUP)
+        content, adapter = items, CustomerListAdapter
+
+    etag = weak_etag(items)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if FAST_JSON_RESPONSES:
+        return json_response(adapter, content, headers=headers)
+
+    response.headers.update(headers)
+    customers = [CustomerModel.model_validate(doc) for doc in items]
+    if cursor is not None:
+        return {"items": customers, "next_cursor": next_cursor}
     return customers
 
+# GET customer changes for delta sync (declared before /{id} so it is not taken as an id)
+@router.get("/changes", response_model=CustomerChanges, status_code=status.HTTP_200_OK)
+async def get_customer_changes(since: Optional[str] = None, limit: int = Query(100, ge=1, le=1000)):
+
+    """
+    Customers created, updated or deleted after since, oldest first.
+    since is the next_token of the previous call or an ISO timestamp,
+    leave it empty for a full sync. Keep calling while has_more is true.
+    Answers 410 when since is invalid or older than the deletion history.
+    """
+    items, deleted, next_token, has_more = await customer_changes(since, limit, CUSTOMER_PROJECTION)
+    return {"items": items, "deleted": deleted, "next_token": next_token, "has_more": has_more}
+
+# GET search customers (declared before /{id} so it is not taken as an id)
+@router.get("/search", response_model=CustomerPage, status_code=status.HTTP_200_OK)
+async def search_customers(
+    district: Optional[str] = None,
+    mandal: Optional[str] = None,
+    village: Optional[str] = None,
+    service: Optional[str] = None,
+    sub_service: Optional[str] = None,
+    register_by: Optional[str] = None,
+    user_id: Optional[str] = None,
+    q: Optional[str] = None,
+    name: Optional[str] = None,
+    phone: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+):
+
+    """
+    Search customers with cursor pagination.
+    Equality filters on location/service/owner fields, q for full-text search
+    on names, name and phone for prefix search on first name and phone number.
+    """
+    filters = live({
+        field: value
+        for field, value in {
+            "district": district,
+            "mandal": mandal,
+            "village": village,
+            "service": service,
+            "sub_service": sub_service,
+            "register_by": register_by,
+            "user_id": user_id,
+        }.items()
+        if value is not None
+    })
+    # Anchored, case sensitive regexes so the prefix can use the index
+    if name:
+        filters["first_name"] = {"$regex": "^" + re.escape(name)}
+    if phone:
+        filters["phone_number"] = {"$regex": "^" + re.escape(phone)}
+    if q:
+        filters["$text"] = {"$search": q}
+
+    if FAST_JSON_RESPONSES:
+        items, next_cursor = await raw_cursor_page(CustomerModel, cursor, limit, filters, CUSTOMER_PROJECTION,
+                                                   group=READ_GROUP)
+        return json_response(CustomerPageAdapter, {"items": items, "next_cursor": next_cursor})
+
+    items, next_cursor = await cursor_page(CustomerModel, cursor, limit, filters, group=READ_GROUP)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+# GET export customers (declared before /{id} so it is not taken as an id)
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_all_customers(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    fields: Optional[str] = None,
+    district: Optional[str] = None,
+    mandal: Optional[str] = None,
+    village: Optional[str] = None,
+    service: Optional[str] = None,
+    batch_size: int = Query(CUSTOMER_EXPORT_BATCH_SIZE, ge=1, le=10000),
+):
+
+    """
+    Stream all matching customers as NDJSON or CSV.
+    fields is a comma separated list of columns, defaults to every field.
+    """
+    selected = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    if selected:
+        unknown = [name for name in selected if name not in EXPORT_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}"
+            )
+
+    filters = live({
+        name: value
+        for name, value in {"district": district, "mandal": mandal, "village": village, "service": service}.items()
+        if value is not None
+    })
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_customers(filters, selected, format, batch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="customers.{format}"'},
+    )
+
+# GET customer counts by district, mandal or village
+@router.get("/stats/geo", response_model=CustomerStats, status_code=status.HTTP_200_OK)
+async def get_customer_geo_stats(
+    level: str = Query("district", pattern="^(district|mandal|village)$"),
+    district: Optional[str] = None,
+    mandal: Optional[str] = None,
+    live_counts_only: bool = Query(False, alias="live"),
+    limit: int = Query(1000, ge=1, le=10000),
+):
+
+    """
+    Customers per district, mandal or village, largest first, optionally within a district/mandal.
+    Read from the rollups; live=true aggregates the customers collection instead (slow, exact).
+    """
+    filters = {field: value for field, value in (("district", district), ("mandal", mandal)) if value is not None}
+    return await _stats(level, filters, live_counts_only, limit)
+
+
+# GET customer counts by service and sub service
+@router.get("/stats/services", response_model=CustomerStats, status_code=status.HTTP_200_OK)
+async def get_customer_service_stats(
+    service: Optional[str] = None,
+    live_counts_only: bool = Query(False, alias="live"),
+    limit: int = Query(1000, ge=1, le=10000),
+):
+
+    """
+    Customers per service and sub service, largest first
+    """
+    filters = {"service": service} if service is not None else {}
+    return await _stats("service", filters, live_counts_only, limit)
+
+
+# GET registrations per day per agent
+@router.get("/stats/registrations", response_model=CustomerStats, status_code=status.HTTP_200_OK)
+async def get_customer_registration_stats(
+    register_by: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    live_counts_only: bool = Query(False, alias="live"),
+    limit: int = Query(1000, ge=1, le=10000),
+):
+
+    """
+    Live customers registered per register_by agent and UTC day (of created_at),
+    optionally for one agent and an inclusive date range
+    """
+    filters = {"register_by": register_by} if register_by is not None else {}
+    if live_counts_only:
+        created_at = {}
+        if date_from:
+            created_at["$gte"] = datetime.combine(date_from, time.min)
+        if date_to:
+            created_at["$lt"] = datetime.combine(date_to + timedelta(days=1), time.min)
+        if created_at:
+            filters["created_at"] = created_at
+    else:
+        day = {}
+        if date_from:
+            day["$gte"] = date_from.isoformat()
+        if date_to:
+            day["$lte"] = date_to.isoformat()
+        if day:
+            filters["day"] = day
+    return await _stats("agent_day", filters, live_counts_only, limit)
+
+
+# POST recompute the dashboard rollups from the customers collection
+@router.post("/stats/rebuild", status_code=status.HTTP_200_OK)
+async def rebuild_customer_stats(_: dict = Depends(require_roles(UserRole.ADMIN))):
+
+    """
+    Recount every rollup with $group pipelines, e.g. after the first deploy
+    or writes that bypassed the API. Scans all customers.
+    """
+    return {"message": "Customer rollups rebuilt", "groups": await rebuild_rollups()}
+
+
+async def _stats(dimension: str, filters: dict, live_counts_only: bool, limit: int) -> dict:
+    if live_counts_only:
+        groups = await live_counts(dimension, filters, limit, group=READ_GROUP)
+    else:
+        groups = await rollup_counts(dimension, filters, limit, group=READ_GROUP)
+    return {"dimension": dimension, "source": "live" if live_counts_only else "rollup", "groups": groups}
+
+
 # GET customer by ID
 @router.get("/{id}", response_model=CustomerResponse,status_code=status.HTTP_200_OK)
-async def get_customer(id: str):
+async def get_customer(id: str, request: Request, response: Response):
     
     """
-    Get customer by ID
+    Get customer by ID, answers 304 when If-None-Match carries the current ETag
     """
-    customer = await CustomerModel.get(id)
+    customer = await CustomerModel.find_one(CustomerModel.id == id, CustomerModel.deleted_at == None)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+
+    etag = weak_etag([customer])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return customer
 
 
 
+# POST fetch several customers by id
+@router.post("/batch-get", response_model=CustomerBatchGetResponse, status_code=status.HTTP_200_OK)
+async def batch_get_customers(request: CustomerBatchGetRequest):
+
+    """
+    Get up to BATCH_GET_MAX_IDS customers in one call, in the order of the requested ids.
+    Missing or deleted customers come back as null and are listed in not_found.
+    """
+    items, not_found = await batch_get(CustomerModel, request.ids, CUSTOMER_PROJECTION)
+    content = {"items": items, "not_found": not_found}
+    if FAST_JSON_RESPONSES:
+        return json_response(CustomerBatchGetAdapter, content)
+    return content
+
+
 # POST create new customer
 @router.post("/", response_model=CustomerResponse,status_code=status.HTTP_201_CREATED)
 async def create_customer(customer_data: CustomerCreate):
@@ -39,8 +299,42 @@ async def create_customer(customer_data: CustomerCreate):
     customer_dict = customer_data.model_dump()
     customer = CustomerModel(**customer_dict)
     await customer.create()
+    await update_rollups(added=[customer])
     return customer
 
+# POST bulk create customers
+@router.post("/bulk", response_model=CustomerBulkResponse, status_code=status.HTTP_200_OK)
+async def bulk_create_customers(request: Request, batch_size: int = Query(CUSTOMER_BULK_BATCH_SIZE, ge=1, le=5000),
+                                claims: dict = Depends(get_current_claims)):
+
+    """
+    Create many customers at once from a JSON array or NDJSON
+    (Content-Type: application/x-ndjson) body.
+    Rows are validated one by one and inserted in unordered batches, the
+    response has one result per row. Rows the same user sends with the same
+    idempotency_key are only stored once, so a retried sync is safe.
+    """
+    body = await request.body()
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+    try:
+        rows = parse_rows(body, ndjson)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array or NDJSON")
+
+    if len(rows) > CUSTOMER_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {CUSTOMER_BULK_MAX_ROWS} rows per request"
+        )
+
+    results = await ingest_customers(rows, batch_size, caller=claims["id"])
+    return {
+        "created": sum(1 for r in results if r.status == "created"),
+        "duplicates": sum(1 for r in results if r.status == "duplicate"),
+        "failed": sum(1 for r in results if r.status in ("invalid", "error")),
+        "results": results,
+    }
+
 # PATCH update customer
 @router.patch("/{id}", response_model=CustomerResponse,status_code=status.HTTP_200_OK)
 async def update_customer(id: str, customer_data: CustomerUpdate):
@@ -48,24 +342,61 @@ async def update_customer(id: str, customer_data: CustomerUpdate):
     """
     Update customer information
     """
-    customer = await CustomerModel.get(id)
-    if not customer:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
-
     update_data = customer_data.model_dump(exclude_unset=True)
-    await customer.update({"$set": update_data})
-    return await CustomerModel.get(id)
+    # $set skips the before_event hook, so keep updated_at here
+    update_data["updated_at"] = datetime.now(timezone.utc)
+
+    if not ROLLUP_FIELDS & update_data.keys():
+        # no counted field changes, a single find-one-and-update
+        customer = await CustomerModel.find_one(CustomerModel.id == id, CustomerModel.deleted_at == None).update(
+            {"$set": update_data},
+            response_type=UpdateResponse.NEW_DOCUMENT
+        )
+        if not customer:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+        return customer
+
+    # The rollups need the groups the customer leaves: read the counted fields, then
+    # update only while they are unchanged so the delta matches the stored post-image
+    collection = CustomerModel.get_pymongo_collection()
+    for _ in range(CUSTOMER_UPDATE_ATTEMPTS):
+        previous = await collection.find_one(live({"_id": id}), projection=ROLLUP_PROJECTION)
+        if not previous:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+        unchanged = {field: previous.get(field) for field in ROLLUP_FIELDS}
+        customer = await CustomerModel.find_one(live({"_id": id, **unchanged})).update(
+            {"$set": update_data},
+            response_type=UpdateResponse.NEW_DOCUMENT
+        )
+        if customer:
+            await update_rollups(added=[customer], removed=[previous])
+            return customer
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Customer is being modified, please retry")
 
 # DELETE customer
 @router.delete("/{id}",status_code=status.HTTP_200_OK)
 async def delete_customer(id: str):
     
     """
-    Delete customer by ID
+    Delete customer by ID.
+    With SOFT_DELETE the customer is only marked deleted and purged later,
+    otherwise it is removed and a tombstone is recorded. Either way delta
+    sync clients learn about the deletion, and one more write takes the
+    customer out of the rollups.
     """
-    customer = await CustomerModel.get(id)
+    collection = CustomerModel.get_pymongo_collection()
+    if SOFT_DELETE:
+        now = datetime.now(timezone.utc)
+        customer = await collection.find_one_and_update(
+            live({"_id": id}), {"$set": {"deleted_at": now, "updated_at": now}}, projection=ROLLUP_PROJECTION
+        )
+    else:
+        # live only: a customer soft deleted earlier already left the rollups
+        customer = await collection.find_one_and_delete(live({"_id": id}), projection=ROLLUP_PROJECTION)
     if not customer:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
+    if not SOFT_DELETE:
+        await record_tombstone(id)
+    await update_rollups(removed=[customer])
 
-    await customer.delete()
     return {"message": "Customer deleted successfully"}
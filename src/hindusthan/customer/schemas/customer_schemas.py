@@ -1,5 +1,5 @@
-from pydantic import BaseModel,EmailStr
-from typing import Optional
+from pydantic import BaseModel,EmailStr,TypeAdapter
+from typing import Optional, List, Any, Dict
 from datetime import datetime
 
 # Schema for creating new Customer
@@ -76,3 +76,69 @@ class CustomerResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Schema for cursor paginated Customer list
+class CustomerPage(BaseModel):
+    items: List[CustomerResponse]
+    next_cursor: Optional[str] = None
+
+
+# Schema for the delta sync feed
+class CustomerChanges(BaseModel):
+    items: List[CustomerResponse]  # created or updated since the token
+    deleted: List[str]  # ids of customers deleted since the token
+    next_token: Optional[str] = None  # pass as since on the next call
+    has_more: bool = False
+
+
+# Schema for fetching several customers by id
+class CustomerBatchGetRequest(BaseModel):
+    ids: List[str]
+
+
+# Schema for batch get response, items follow the order of the requested ids
+class CustomerBatchGetResponse(BaseModel):
+    items: List[Optional[CustomerResponse]]  # null where the id was not found
+    not_found: List[str]
+
+
+# Schema for one group of a dashboard count
+class CustomerStatsGroup(BaseModel):
+    key: Dict[str, str]  # e.g. {"district": "...", "mandal": "..."}
+    count: int
+
+
+# Schema for dashboard counts
+class CustomerStats(BaseModel):
+    dimension: str
+    source: str  # "rollup" or "live"
+    groups: List[CustomerStatsGroup]
+
+
+# Adapters for the fast JSON response path
+CustomerListAdapter = TypeAdapter(List[CustomerResponse])
+CustomerPageAdapter = TypeAdapter(CustomerPage)
+CustomerBatchGetAdapter = TypeAdapter(CustomerBatchGetResponse)
+
+
+# Schema for one row of a bulk upload
+class CustomerBulkRow(CustomerCreate):
+    # Client generated key, a retried row with the same key is not inserted twice
+    idempotency_key: Optional[str] = None
+
+
+# Schema for the outcome of one bulk row
+class CustomerBulkResult(BaseModel):
+    index: int
+    status: str  # "created", "duplicate", "invalid" or "error"
+    id: Optional[str] = None
+    errors: Optional[List[Any]] = None
+
+
+# Schema for bulk upload response
+class CustomerBulkResponse(BaseModel):
+    created: int
+    duplicates: int
+    failed: int
+    results: List[CustomerBulkResult]
@@ -0,0 +1,101 @@
+import json
+import os
+import uuid
+from typing import List, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from src.hindusthan.customer.models.customer_model import CustomerModel
+from src.hindusthan.customer.schemas.customer_schemas import CustomerBulkRow, CustomerBulkResult
+from src.hindusthan.customer.utils.rollup_utils import update_rollups
+
+# Bulk upload settings
+CUSTOMER_BULK_BATCH_SIZE = int(os.getenv("CUSTOMER_BULK_BATCH_SIZE", "500"))
+CUSTOMER_BULK_MAX_ROWS = int(os.getenv("CUSTOMER_BULK_MAX_ROWS", "5000"))
+
+# Namespace for ids derived from idempotency keys
+_IDEMPOTENCY_NAMESPACE = uuid.UUID("3f6c1a52-7d2e-4b8a-9a43-2f0c7f6b8e11")
+
+_DUPLICATE_KEY = 11000
+
+
+def parse_rows(body: bytes, ndjson: bool) -> List[Tuple[int, object]]:
+    """
+    Split a JSON array or NDJSON body into (index, raw_row) pairs.
+    A line that is not valid JSON is kept as an exception so it can be reported per row.
+    """
+    if not ndjson:
+        data = json.loads(body)
+        if not isinstance(data, list):
+            raise ValueError("Expected a JSON array")
+        return list(enumerate(data))
+
+    rows = []
+    lines = [line for line in body.splitlines() if line.strip()]
+    for index, line in enumerate(lines):
+        try:
+            rows.append((index, json.loads(line)))
+        except ValueError as e:
+            rows.append((index, e))
+    return rows
+
+
+def idempotent_id(caller: str, key: str) -> str:
+    """
+    Customer id for an idempotency key. Keys are scoped to the uploading user,
+    so two users picking the same key neither collide nor see each other's rows.
+    """
+    return str(uuid.uuid5(uuid.uuid5(_IDEMPOTENCY_NAMESPACE, caller), key))
+
+
+async def ingest_customers(rows: List[Tuple[int, object]], batch_size: int, caller: str) -> List[CustomerBulkResult]:
+    """
+    Validate every row, then insert the valid ones in unordered batches.
+    caller is the id of the uploading user, it scopes the idempotency keys.
+    Returns one result per row, in input order.
+    """
+    results: List[Optional[CustomerBulkResult]] = [None] * len(rows)
+    valid: List[Tuple[int, CustomerModel]] = []
+
+    for position, (index, raw) in enumerate(rows):
+        if isinstance(raw, Exception):
+            results[position] = CustomerBulkResult(index=index, status="invalid", errors=[str(raw)])
+            continue
+        try:
+            row = CustomerBulkRow.model_validate(raw)
+        except ValidationError as e:
+            results[position] = CustomerBulkResult(
+                index=index, status="invalid", errors=e.errors(include_url=False, include_context=False)
+            )
+            continue
+
+        customer_dict = row.model_dump(exclude={"idempotency_key"})
+        if row.idempotency_key:
+            customer_dict["id"] = idempotent_id(caller, row.idempotency_key)
+        valid.append((position, CustomerModel(**customer_dict)))
+
+    created: List[CustomerModel] = []
+    for start in range(0, len(valid), batch_size):
+        batch = valid[start:start + batch_size]
+        failed = {}
+        try:
+            await CustomerModel.insert_many([customer for _, customer in batch], ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: error for error in e.details.get("writeErrors", [])}
+
+        for offset, (position, customer) in enumerate(batch):
+            index = rows[position][0]
+            error = failed.get(offset)
+            if error is None:
+                results[position] = CustomerBulkResult(index=index, status="created", id=customer.id)
+                created.append(customer)
+            elif error.get("code") == _DUPLICATE_KEY:
+                # already stored by an earlier (retried) sync
+                results[position] = CustomerBulkResult(index=index, status="duplicate", id=customer.id)
+            else:
+                results[position] = CustomerBulkResult(index=index, status="error", errors=[error.get("errmsg")])
+
+    # one rollup write for the whole upload
+    await update_rollups(added=created)
+    return results
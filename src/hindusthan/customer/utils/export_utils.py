@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from src.hindusthan.customer.models.customer_model import CustomerModel
+from src.hindusthan.customer.schemas.customer_schemas import CustomerResponse
+from src.hindusthan.database.settings import read_collection
+
+# Export settings
+CUSTOMER_EXPORT_BATCH_SIZE = int(os.getenv("CUSTOMER_EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_FIELDS = list(CustomerResponse.model_fields)
+
+
+def export_projection(fields: Optional[List[str]]) -> Dict[str, int]:
+    """
+    Mongo projection for the requested export fields ("id" maps to "_id")
+    """
+    fields = fields or EXPORT_FIELDS
+    projection = {"_id": 1 if "id" in fields else 0}
+    for name in fields:
+        if name != "id":
+            projection[name] = 1
+    return projection
+
+
+def _value(doc: dict, name: str):
+    value = doc.get("_id") if name == "id" else doc.get(name, "")
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _row(doc: dict, fields: List[str]) -> List:
+    return [_value(doc, name) for name in fields]
+
+
+async def export_customers(filters: dict, fields: Optional[List[str]], fmt: str,
+                           batch_size: int = CUSTOMER_EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    """
+    Stream customers straight from a Mongo cursor as NDJSON or CSV.
+    Raw documents are never turned into models and output is flushed once per
+    batch, so memory stays flat whatever the collection size.
+    """
+    fields = fields or EXPORT_FIELDS
+    cursor = read_collection(CustomerModel, "customers").find(
+        filters, projection=export_projection(fields), batch_size=batch_size
+    )
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(fields)
+
+    pending = 0
+    async for doc in cursor:
+        if writer:
+            writer.writerow(_row(doc, fields))
+        else:
+            buffer.write(json.dumps(dict(zip(fields, _row(doc, fields))), default=str))
+            buffer.write("\n")
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,184 @@
+"""
+Materialized customer counts for the dashboards.
+
+Every live customer counts once in each dimension below. The customer
+routes turn a create, update or delete into +1/-1 deltas on the affected
+groups and apply them with one unordered bulk write of $inc upserts, so a
+dashboard query reads O(groups) rollup documents instead of scanning
+customers. Days are UTC dates of created_at.
+
+The deltas are not applied in a transaction with the customer write, so
+a crash in between (or a write that bypasses the API) can leave counts
+off; rebuild_rollups() recomputes everything with $group pipelines. It
+also replaces rollups stored under the older "dimension|values" string ids:
+
+    python -m src.hindusthan.customer.utils.rollup_utils --rebuild
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import DESCENDING, UpdateOne
+
+from src.hindusthan.customer.models.customer_model import CustomerModel, CustomerRollupModel
+from src.hindusthan.database.settings import read_collection
+from src.hindusthan.database.soft_delete import live
+
+# dimension -> customer fields forming its group key ("day" is derived from created_at)
+ROLLUP_DIMENSIONS: Dict[str, Tuple[str, ...]] = {
+    "district": ("district",),
+    "mandal": ("district", "mandal"),
+    "village": ("district", "mandal", "village"),
+    "service": ("service", "sub_service"),
+    "agent_day": ("register_by", "day"),
+}
+
+# customer fields the rollups depend on, an update touching none of them changes no count
+ROLLUP_FIELDS = {"district", "mandal", "village", "service", "sub_service", "register_by", "created_at"}
+ROLLUP_PROJECTION = {field: 1 for field in ROLLUP_FIELDS}
+
+
+def _field(customer, field: str) -> str:
+    if field == "day":
+        created_at = _field(customer, "created_at")
+        # Mongo returns naive UTC datetimes, models hold aware ones
+        if created_at.tzinfo:
+            created_at = created_at.astimezone(timezone.utc)
+        return created_at.date().isoformat()
+    value = customer.get(field) if isinstance(customer, dict) else getattr(customer, field)
+    return value if value is not None else ""
+
+
+def rollup_id(dimension: str, key: Dict[str, str]) -> dict:
+    """
+    _id of a group's rollup document. A sub-document rather than joined
+    strings, which collide once a value contains the separator.
+    """
+    # Mongo matches sub-documents field by field in order, so the order is fixed here
+    return {"dimension": dimension, "key": {field: key[field] for field in ROLLUP_DIMENSIONS[dimension]}}
+
+
+def rollup_keys(customer) -> Dict[Tuple[str, ...], Tuple[str, Dict[str, str]]]:
+    """
+    (dimension, *key values) -> (dimension, key) of every group the customer counts in
+    """
+    keys = {}
+    for dimension, fields in ROLLUP_DIMENSIONS.items():
+        key = {field: _field(customer, field) for field in fields}
+        keys[(dimension, *key.values())] = (dimension, key)
+    return keys
+
+
+async def update_rollups(added: Iterable = (), removed: Iterable = ()):
+    """
+    Count added customers in and removed ones out (customer models or raw documents).
+    Failures are logged, not raised: the customer write already happened.
+    """
+    deltas: Dict[Tuple[str, ...], int] = {}
+    groups = {}
+    for customers, delta in ((added, 1), (removed, -1)):
+        for customer in customers:
+            for group_key, group in rollup_keys(customer).items():
+                deltas[group_key] = deltas.get(group_key, 0) + delta
+                groups[group_key] = group
+
+    now = datetime.now(timezone.utc)
+    operations = [
+        UpdateOne(
+            {"_id": rollup_id(*groups[group_key])},
+            {"$inc": {"customers": delta},
+             "$set": {"dimension": groups[group_key][0], "key": groups[group_key][1], "updated_at": now}},
+            upsert=True,
+        )
+        for group_key, delta in deltas.items() if delta
+    ]
+    if not operations:
+        return
+    try:
+        await CustomerRollupModel.get_pymongo_collection().bulk_write(operations, ordered=False)
+    except Exception as e:
+        print(f"⚠️ Customer rollup update failed, run a rebuild: {e}")
+
+
+def _group_stage(dimension: str) -> dict:
+    group_id = {}
+    for field in ROLLUP_DIMENSIONS[dimension]:
+        group_id[field] = ({"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}}
+                           if field == "day" else {"$ifNull": [f"${field}", ""]})
+    return {"$group": {"_id": group_id, "count": {"$sum": 1}}}
+
+
+async def live_counts(dimension: str, filters: Optional[dict] = None, limit: int = 1000,
+                      group: Optional[str] = None) -> List[dict]:
+    """
+    Counts straight from the customers collection with a $group pipeline, O(customers)
+    """
+    pipeline = [
+        {"$match": live(filters)},
+        _group_stage(dimension),
+        {"$sort": {"count": DESCENDING}},
+        {"$limit": limit},
+    ]
+    cursor = read_collection(CustomerModel, group).aggregate(pipeline)
+    return [{"key": doc["_id"], "count": doc["count"]} async for doc in cursor]
+
+
+async def rollup_counts(dimension: str, key_filters: Optional[dict] = None, limit: int = 1000,
+                        group: Optional[str] = None) -> List[dict]:
+    """
+    Counts from the rollup collection, O(groups of the dimension)
+    """
+    filters = {"dimension": dimension, "customers": {"$gt": 0}}
+    for field, condition in (key_filters or {}).items():
+        filters[f"key.{field}"] = condition
+    cursor = read_collection(CustomerRollupModel, group).find(
+        filters, projection={"_id": 0, "key": 1, "customers": 1}, sort=[("customers", DESCENDING)], limit=limit
+    )
+    return [{"key": doc["key"], "count": doc["customers"]} async for doc in cursor]
+
+
+async def rebuild_rollups() -> Dict[str, int]:
+    """
+    Recompute every dimension from the customers collection, returns the groups per dimension
+    """
+    collection = CustomerRollupModel.get_pymongo_collection()
+    now = datetime.now(timezone.utc)
+    sizes = {}
+    for dimension in ROLLUP_DIMENSIONS:
+        counts = await live_counts(dimension, limit=10_000_000)
+        docs = [
+            {"_id": rollup_id(dimension, row["key"]),
+             "dimension": dimension, "key": row["key"], "customers": row["count"], "updated_at": now}
+            for row in counts
+        ]
+        await collection.delete_many({"dimension": dimension})
+        if docs:
+            await collection.insert_many(docs, ordered=False)
+        sizes[dimension] = len(docs)
+    return sizes
+
+
+async def _main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the customer dashboard rollups")
+    parser.add_argument("--rebuild", action="store_true", help="recompute all rollups from customers")
+    args = parser.parse_args(argv)
+    if not args.rebuild:
+        parser.print_help()
+        return 0
+
+    from src.hindusthan.database.database import initialize_database, close_database
+
+    await initialize_database()
+    try:
+        sizes = await rebuild_rollups()
+    finally:
+        await close_database()
+    for dimension, size in sizes.items():
+        print(f"✅ Rebuilt {dimension}: {size} groups")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
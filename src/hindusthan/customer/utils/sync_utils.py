@@ -0,0 +1,129 @@
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+from pymongo import ASCENDING
+
+from src.hindusthan.customer.models.customer_model import CustomerModel, CustomerTombstoneModel
+from src.hindusthan.database.fast_json import fetch_raw
+from src.hindusthan.database.pagination import decode_cursor, encode_cursor
+from src.hindusthan.database.soft_delete import retention_cutoff
+
+# Delta sync settings
+# changes younger than this are held back so writes still in flight are not skipped
+CUSTOMER_CHANGES_LAG_SECONDS = float(os.getenv("CUSTOMER_CHANGES_LAG_SECONDS", "1"))
+
+# ETags are revalidated on every use, never served from a shared cache
+CACHE_CONTROL = "private, no-cache"
+
+
+def _version(item) -> Tuple[str, datetime]:
+    if isinstance(item, dict):
+        return item["id"], item["updated_at"]
+    return item.id, item.updated_at
+
+
+def weak_etag(items: Iterable) -> str:
+    """
+    ETag of one or more customers, derived from their ids and updated_at.
+    Weak because the same version may be sent with different encodings.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for item in items:
+        id, updated_at = _version(item)
+        digest.update(f"{id}:{updated_at.isoformat()};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Weak comparison against If-None-Match
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip() == "*" or tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def _gone(reason: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_410_GONE, detail=f"{reason}, start a full sync without since")
+
+
+def _parse_since(since: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    """
+    since is a next_token from an earlier call or an ISO timestamp.
+    Raises 410 on anything else, the client cannot resume from it.
+    """
+    if not since:
+        return None
+    try:
+        timestamp, id = datetime.fromisoformat(since), ""
+    except ValueError:
+        try:
+            timestamp, id = decode_cursor(since)
+        except HTTPException:
+            raise _gone("since is not a valid sync token")
+    # compared with the naive UTC datetimes Mongo returns
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp, id
+
+
+def _after(field: str, position: Optional[Tuple[datetime, str]], horizon: datetime) -> dict:
+    query = {field: {"$lte": horizon}}
+    if position is None:
+        return query
+    timestamp, id = position
+    return {"$and": [query, {"$or": [{field: {"$gt": timestamp}}, {field: timestamp, "_id": {"$gt": id}}]}]}
+
+
+async def customer_changes(since: Optional[str], limit: int,
+                           projection: Optional[dict] = None) -> Tuple[List[dict], List[str], Optional[str], bool]:
+    """
+    Customers changed and deleted after the since position, ordered by time.
+    Soft-deleted customers and tombstones of hard-deleted ones are both reported as deleted.
+    Returns (changed, deleted ids, next_token, has_more).
+    """
+    position = _parse_since(since)
+    if position is not None and position[0] < retention_cutoff():
+        # deletions before the cutoff may already be purged
+        raise _gone("since is older than the deletion history")
+    # Mongo stores naive UTC datetimes
+    horizon = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=CUSTOMER_CHANGES_LAG_SECONDS)
+
+    if projection is not None:
+        projection = {**projection, "deleted_at": 1}
+    changed = await fetch_raw(CustomerModel, _after("updated_at", position, horizon), limit=limit + 1,
+                              projection=projection, sort=[("updated_at", ASCENDING), ("_id", ASCENDING)])
+    deleted = await fetch_raw(CustomerTombstoneModel, _after("deleted_at", position, horizon), limit=limit + 1,
+                              sort=[("deleted_at", ASCENDING), ("_id", ASCENDING)])
+
+    # merge both streams on (time, id) and keep the first limit entries
+    entries = sorted(
+        [(doc["updated_at"], doc["id"], None if doc.get("deleted_at") else doc) for doc in changed]
+        + [(doc["deleted_at"], doc["id"], None) for doc in deleted],
+        key=lambda entry: (entry[0], entry[1]),
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    if entries:
+        next_token = encode_cursor(entries[-1][0], entries[-1][1])
+    else:
+        next_token = since
+    items = [doc for _, _, doc in entries if doc is not None]
+    deleted_ids = [id for _, id, doc in entries if doc is None]
+    return items, deleted_ids, next_token, has_more
+
+
+async def record_tombstone(id: str):
+    await CustomerTombstoneModel.get_pymongo_collection().replace_one(
+        {"_id": id}, {"deleted_at": datetime.now(timezone.utc)}, upsert=True
+    )
@@ -0,0 +1,30 @@
+import os
+from typing import List, Optional, Tuple, Type
+
+from beanie import Document
+from fastapi import HTTPException, status
+
+from src.hindusthan.database.fast_json import fetch_raw
+from src.hindusthan.database.soft_delete import live
+
+# Batch get settings
+BATCH_GET_MAX_IDS = int(os.getenv("BATCH_GET_MAX_IDS", "100"))
+
+
+async def batch_get(model: Type[Document], ids: List[str], projection: Optional[dict] = None,
+                    max_ids: int = BATCH_GET_MAX_IDS) -> Tuple[List[Optional[dict]], List[str]]:
+    """
+    Fetch live documents by id with a single $in query.
+    Returns the raw documents in request order, with None where an id was
+    not found (or is deleted), and the list of those ids.
+    Raises 422 when more than max_ids ids are requested.
+    """
+    if len(ids) > max_ids:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail=f"At most {max_ids} ids per request")
+    unique_ids = list(dict.fromkeys(ids))
+    docs = await fetch_raw(model, live({"_id": {"$in": unique_ids}}), projection=projection) if unique_ids else []
+    by_id = {doc["id"]: doc for doc in docs}
+    items = [by_id.get(id) for id in ids]
+    not_found = [id for id in unique_ids if id not in by_id]
+    return items, not_found
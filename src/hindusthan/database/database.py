@@ -1,36 +1,67 @@
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional
+from typing import Dict, Optional
 import os
+import time
 
 from src.hindusthan.auth.models.user_model import UserModel, OTPModel
-from src.hindusthan.customer.models.customer_model import CustomerModel
+from src.hindusthan.customer.models.customer_model import CustomerModel, CustomerTombstoneModel, CustomerRollupModel
+from src.hindusthan.jobs.models.job_model import JobModel
+from src.hindusthan.database.indexes import sync_indexes, INDEX_SYNC_MODE
+from src.hindusthan.database.settings import mongo_settings, pool_stats
+from src.hindusthan.monitoring.mongo_listener import command_listener
 
-# MongoDB connection settings
 # MongoDB connection settings
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "hindusthan")
 
 
+DOCUMENT_MODELS = [
+    UserModel,
+    OTPModel,
+    CustomerModel,
+    CustomerTombstoneModel,
+    CustomerRollupModel,
+    JobModel
+]
+
+
 client: Optional[AsyncIOMotorClient] = None
 
+# seconds spent in each initialize_database step, reported by --profile-startup
+startup_timings: Dict[str, float] = {}
+
 
-async def initialize_database():
+async def initialize_database(index_mode: str = INDEX_SYNC_MODE):
     """
-    Initialize MongoDB and Beanie ODM
+    Initialize MongoDB and Beanie ODM, then reconcile the declared indexes.
+    Runs in each worker's lifespan, so every worker process gets its own
+    client and pool (pool sizes in mongo_settings are per worker).
     """
     global client
-    client = AsyncIOMotorClient(MONGODB_URL)
+    if client is not None:
+        client.close()
+    started = time.perf_counter()
+    client = AsyncIOMotorClient(
+        MONGODB_URL,
+        event_listeners=[pool_stats, command_listener],
+        # shows up in the server logs and currentOp, one name per worker
+        appname=f"hindusthan-worker-{os.getenv('HINDUSTHAN_WORKER_ID', '0')}",
+        **mongo_settings.client_options()
+    )
+    startup_timings["client"] = time.perf_counter() - started
 
+    started = time.perf_counter()
     await init_beanie(
         database=client[DATABASE_NAME], # type: ignore
-        document_models=[
-            UserModel,
-            OTPModel,
-            CustomerModel
-
-        ],
+        document_models=DOCUMENT_MODELS,
+        skip_indexes=True,  # indexes are handled by sync_indexes
     )
+    startup_timings["init_beanie"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await sync_indexes(DOCUMENT_MODELS, mode=index_mode)
+    startup_timings["sync_indexes"] = time.perf_counter() - started
 
     print(f"✅ Connected to MongoDB database: {DATABASE_NAME}")
 
@@ -42,6 +73,7 @@ async def close_database():
     global client
     if client:
         client.close()
+        client = None
         print("👋 MongoDB connection closed.")
 
 
@@ -0,0 +1,54 @@
+"""
+Fast response path for list endpoints.
+
+Instead of loading Beanie documents and letting FastAPI re-validate them
+through response_model, raw documents are fetched with a projection,
+validated once through a TypeAdapter and serialized by pydantic-core.
+"""
+import os
+from typing import List, Optional, Type
+
+from beanie import Document
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from src.hindusthan.database.settings import read_collection
+
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+
+def schema_projection(schema: Type[BaseModel]) -> dict:
+    """
+    Mongo projection that only loads the fields of a response schema
+    """
+    projection = {name: 1 for name in schema.model_fields if name != "id"}
+    projection["_id"] = 1
+    return projection
+
+
+def from_mongo(doc: dict) -> dict:
+    doc["id"] = doc.pop("_id")
+    return doc
+
+
+async def fetch_raw(model: Type[Document], filters: Optional[dict] = None, skip: int = 0, limit: int = 0,
+                    projection: Optional[dict] = None, sort=None, group: Optional[str] = None) -> List[dict]:
+    """
+    Raw documents with "id" instead of "_id", read with the preference of the route group
+    """
+    cursor = read_collection(model, group).find(filters or {}, projection=projection, skip=skip, limit=limit)
+    if sort:
+        cursor = cursor.sort(sort)
+    return [from_mongo(doc) async for doc in cursor]
+
+
+def json_response(adapter: TypeAdapter, content, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """
+    Validate content once and return it as JSON, FastAPI does not re-validate a Response
+    """
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(content)),
+        media_type="application/json",
+        status_code=status_code,
+        headers=headers,
+    )
@@ -0,0 +1,164 @@
+"""
+Declarative index management.
+
+Indexes are declared on each model's Settings.indexes. sync_indexes()
+compares them with what exists in MongoDB, creates missing indexes and
+rebuilds the ones whose definition drifted. App startup only reports drift
+by default: rebuilding drops the index first, which must not happen in
+every worker at once, so applying is a single-process deploy step.
+
+    python -m src.hindusthan.database.indexes            # drift report (dry run)
+    python -m src.hindusthan.database.indexes --apply    # create / rebuild, run once per deploy
+    python -m src.hindusthan.database.indexes --check    # exit 1 if a required index is missing
+"""
+import argparse
+import asyncio
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Type
+
+from beanie import Document
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+# Startup behaviour: "report" (log drift only), "apply" (create/rebuild, single process only) or "off"
+INDEX_SYNC_MODE = os.getenv("INDEX_SYNC_MODE", "report")
+INDEX_DROP_EXTRA = os.getenv("INDEX_DROP_EXTRA", "false").lower() == "true"
+
+_INDEX_NOT_FOUND = 27
+
+# Index options that change behaviour and must match
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression", "default_language")
+
+
+@dataclass
+class IndexDrift:
+    collection: str
+    missing: List[str] = field(default_factory=list)
+    mismatched: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.mismatched
+
+
+def _normalize(index: dict) -> dict:
+    """
+    Comparable form of an index definition, either an IndexModel.document
+    or an entry of collection.index_information()
+    """
+    raw_keys = index["key"]
+    keys = list(raw_keys.items()) if isinstance(raw_keys, dict) else [tuple(k) for k in raw_keys]
+
+    # Text indexes are stored as _fts/_ftsx plus weights, compare on the text fields instead
+    text_fields = [k for k, direction in keys if direction == "text" and k not in ("_fts", "_ftsx")]
+    if text_fields or any(k == "_fts" for k, _ in keys):
+        weights = index.get("weights") or {}
+        text_fields = sorted(set(text_fields) | set(weights))
+        keys = [(k, d) for k, d in keys if d != "text" and k not in ("_fts", "_ftsx")]
+        keys.append(("$text", tuple(text_fields)))
+
+    spec = {"key": keys}
+    for option in _COMPARED_OPTIONS:
+        if option in index:
+            spec[option] = index[option]
+    # the server stores TTL as int even when declared as float
+    if "expireAfterSeconds" in spec:
+        spec["expireAfterSeconds"] = int(spec["expireAfterSeconds"])
+    if spec.get("default_language") == "english":
+        spec.pop("default_language")
+    return spec
+
+
+def _index_models(model: Type[Document]) -> List[IndexModel]:
+    # Beanie wraps Settings.indexes into IndexModelField once the model is initialized
+    return [getattr(index, "index", index) for index in model.get_settings().indexes or []]
+
+
+def declared_indexes(model: Type[Document]) -> Dict[str, dict]:
+    """
+    name -> IndexModel.document for every index declared on the model
+    """
+    return {index.document["name"]: index.document for index in _index_models(model)}
+
+
+async def index_drift(model: Type[Document]) -> IndexDrift:
+    collection = model.get_pymongo_collection()
+    existing = await collection.index_information()
+    declared = declared_indexes(model)
+
+    drift = IndexDrift(collection=model.get_collection_name())
+    for name, index in declared.items():
+        if name not in existing:
+            drift.missing.append(name)
+        elif _normalize(index) != _normalize(existing[name]):
+            drift.mismatched.append(name)
+    drift.extra = [name for name in existing if name != "_id_" and name not in declared]
+    return drift
+
+
+async def sync_indexes(models: List[Type[Document]], mode: str = INDEX_SYNC_MODE,
+                       drop_extra: bool = INDEX_DROP_EXTRA) -> List[IndexDrift]:
+    """
+    Reconcile declared indexes with MongoDB.
+    mode "report" only returns/logs the drift, "apply" also fixes it.
+    """
+    report = []
+    if mode == "off":
+        return report
+
+    for model in models:
+        drift = await index_drift(model)
+        report.append(drift)
+        for name in drift.missing + drift.mismatched + drift.extra:
+            kind = "missing" if name in drift.missing else "mismatched" if name in drift.mismatched else "extra"
+            print(f"⚠️ Index drift on {drift.collection}: {name} ({kind})")
+
+        if mode != "apply":
+            continue
+
+        collection = model.get_pymongo_collection()
+        for name in drift.mismatched + (drift.extra if drop_extra else []):
+            try:
+                await collection.drop_index(name)
+            except OperationFailure as e:
+                # already dropped by a concurrent sync
+                if e.code != _INDEX_NOT_FOUND:
+                    raise
+        to_create = [index for index in _index_models(model)
+                     if index.document["name"] in drift.missing + drift.mismatched]
+        if to_create:
+            await collection.create_indexes(to_create)
+            print(f"✅ Created indexes on {drift.collection}: {', '.join(i.document['name'] for i in to_create)}")
+
+    return report
+
+
+async def _main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report or reconcile MongoDB indexes")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--apply", action="store_true", help="create missing and rebuild drifted indexes")
+    group.add_argument("--check", action="store_true", help="exit with 1 if a required index is missing or drifted")
+    args = parser.parse_args(argv)
+
+    from src.hindusthan.database.database import initialize_database, close_database, DOCUMENT_MODELS
+
+    await initialize_database(index_mode="off")
+    try:
+        report = await sync_indexes(DOCUMENT_MODELS, mode="apply" if args.apply else "report")
+    finally:
+        await close_database()
+
+    for drift in report:
+        state = "ok" if drift.ok else "DRIFT"
+        print(f"{drift.collection}: {state} missing={drift.missing} mismatched={drift.mismatched} extra={drift.extra}")
+
+    if args.check and not all(drift.ok for drift in report):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
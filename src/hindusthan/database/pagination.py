@@ -0,0 +1,84 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple, Type
+
+from beanie import Document
+from fastapi import HTTPException, status
+from pymongo import ASCENDING
+
+from src.hindusthan.database.fast_json import fetch_raw
+
+# Keyset ordering used by cursor pagination (backed by a (created_at, _id) index)
+CURSOR_SORT = [("created_at", ASCENDING), ("_id", ASCENDING)]
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """
+    Build an opaque cursor from the last document of a page
+    """
+    raw = json.dumps({"c": created_at.isoformat(), "i": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Inverse of encode_cursor, raises 400 on a malformed cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), str(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def cursor_filter(cursor: Optional[str]) -> dict:
+    """
+    Mongo filter that seeks past the cursor position
+    """
+    if not cursor:
+        return {}
+    created_at, id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$gt": created_at}},
+            {"created_at": created_at, "_id": {"$gt": id}},
+        ]
+    }
+
+
+def _page_query(cursor: Optional[str], filters: Optional[dict]) -> dict:
+    query = cursor_filter(cursor)
+    if filters:
+        query = {"$and": [filters, query]} if query else filters
+    return query
+
+
+async def raw_cursor_page(model: Type[Document], cursor: Optional[str], limit: int, filters: Optional[dict] = None,
+                          projection: Optional[dict] = None,
+                          group: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """
+    Fetch one page of raw dicts (with "id" instead of "_id") ordered by (created_at, _id),
+    optionally narrowed by filters.
+    Returns the documents and the cursor for the next page (None on the last page).
+    Raises 400 when limit is below 1.
+    """
+    if limit < 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="limit must be at least 1")
+    docs = await fetch_raw(model, _page_query(cursor, filters), limit=limit + 1, projection=projection,
+                           sort=CURSOR_SORT, group=group)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1]["created_at"], docs[-1]["id"])
+    return docs, next_cursor
+
+
+async def cursor_page(model: Type[Document], cursor: Optional[str], limit: int, filters: Optional[dict] = None,
+                      group: Optional[str] = None) -> Tuple[List[Document], Optional[str]]:
+    """
+    Same as raw_cursor_page but returns model instances
+    """
+    docs, next_cursor = await raw_cursor_page(model, cursor, limit, filters, group=group)
+    return [model.model_validate(doc) for doc in docs], next_cursor
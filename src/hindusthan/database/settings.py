@@ -0,0 +1,179 @@
+"""
+MongoDB client settings.
+
+Values come from [tool.hindusthan.mongo] in pyproject.toml and can be
+overridden by MONGO_* environment variables, e.g. max_pool_size is read
+from MONGO_MAX_POOL_SIZE.
+"""
+import os
+import threading
+import tomllib
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, Optional, Type
+
+from beanie import Document
+from pymongo import monitoring
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
+
+PYPROJECT_PATH = Path(__file__).resolve().parents[3] / "pyproject.toml"
+
+
+@dataclass
+class MongoSettings:
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    max_idle_time_ms: Optional[int] = None
+    wait_queue_timeout_ms: Optional[int] = None
+    server_selection_timeout_ms: int = 5000
+    connect_timeout_ms: int = 5000
+    socket_timeout_ms: Optional[int] = None
+    compressors: str = ""  # e.g. "zstd,snappy,zlib", first one supported by both sides wins
+    retry_writes: bool = True
+    retry_reads: bool = True
+    read_preference: str = "primary"
+    # route group -> read preference, e.g. {"customers": "secondaryPreferred"}
+    router_read_preferences: Dict[str, str] = field(default_factory=lambda: {"customers": "secondaryPreferred"})
+
+    def client_options(self) -> dict:
+        options = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "maxIdleTimeMS": self.max_idle_time_ms,
+            "waitQueueTimeoutMS": self.wait_queue_timeout_ms,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+            "socketTimeoutMS": self.socket_timeout_ms,
+            "retryWrites": self.retry_writes,
+            "retryReads": self.retry_reads,
+            "readPreference": self.read_preference,
+        }
+        if self.compressors:
+            options["compressors"] = self.compressors
+        return {name: value for name, value in options.items() if value is not None}
+
+
+def _convert(value: str, current):
+    if isinstance(current, bool):
+        return value.lower() in ("1", "true", "yes")
+    if isinstance(current, int) or current is None:
+        return int(value) if value else None
+    return value
+
+
+def load_mongo_settings(pyproject_path: Path = PYPROJECT_PATH) -> MongoSettings:
+    settings = MongoSettings()
+
+    if pyproject_path.exists():
+        with open(pyproject_path, "rb") as f:
+            configured = tomllib.load(f).get("tool", {}).get("hindusthan", {}).get("mongo", {})
+        for name, value in configured.items():
+            if name == "router_read_preferences":
+                settings.router_read_preferences.update(value)
+            elif hasattr(settings, name):
+                setattr(settings, name, value)
+
+    for item in fields(settings):
+        if item.name == "router_read_preferences":
+            continue
+        value = os.getenv(f"MONGO_{item.name.upper()}")
+        if value is not None:
+            setattr(settings, item.name, _convert(value, getattr(settings, item.name)))
+
+    # MONGO_READ_PREFERENCE_<GROUP>=secondaryPreferred
+    for name, value in os.environ.items():
+        if name.startswith("MONGO_READ_PREFERENCE_"):
+            settings.router_read_preferences[name[len("MONGO_READ_PREFERENCE_"):].lower()] = value
+
+    return settings
+
+
+mongo_settings = load_mongo_settings()
+
+
+def read_collection(model: Type[Document], group: Optional[str] = None):
+    """
+    Collection of model with the read preference configured for a route group
+    """
+    collection = model.get_pymongo_collection()
+    preference = mongo_settings.router_read_preferences.get(group) if group else None
+    if not preference:
+        return collection
+    read_preference = make_read_preference(read_pref_mode_from_name(preference), None)
+    return collection.with_options(read_preference=read_preference)
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener keeping checkout wait and in-use counts
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.open = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_wait_seconds = 0.0
+        self.checkout_wait_max_seconds = 0.0
+
+    def _observe_wait(self, duration):
+        if duration is None:
+            return
+        self.checkout_wait_seconds += duration
+        self.checkout_wait_max_seconds = max(self.checkout_wait_max_seconds, duration)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self._observe_wait(getattr(event, "duration", None))
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+            self._observe_wait(getattr(event, "duration", None))
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "in_use": self.in_use,
+                "open": self.open,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checkout_wait_seconds_total": self.checkout_wait_seconds,
+                "checkout_wait_seconds_max": self.checkout_wait_max_seconds,
+            }
+
+
+pool_stats = PoolStats()
@@ -0,0 +1,107 @@
+"""
+Soft deletes and the background purge of old tombstones.
+
+With SOFT_DELETE on, deleting a user or customer only sets deleted_at, so
+delta sync can report the deletion. Live queries filter on LIVE, which is
+also the partialFilterExpression of the hot indexes, so deleted documents
+stay out of them. PurgeTask hard-deletes documents deleted more than
+SOFT_DELETE_RETENTION_DAYS ago, in small batches with a pause in between.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Type
+
+from beanie import Document
+
+# Soft delete settings
+SOFT_DELETE = os.getenv("SOFT_DELETE", "true").lower() in ("1", "true", "yes")
+SOFT_DELETE_RETENTION_DAYS = int(os.getenv("SOFT_DELETE_RETENTION_DAYS", "30"))
+PURGE_INTERVAL_SECONDS = int(os.getenv("PURGE_INTERVAL_SECONDS", "3600"))
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+PURGE_BATCH_PAUSE_SECONDS = float(os.getenv("PURGE_BATCH_PAUSE_SECONDS", "0.5"))
+
+# matches documents without deleted_at too, so existing data needs no backfill
+LIVE = {"deleted_at": None}
+# index filter for the purge lookups, only tombstones are indexed
+DELETED = {"deleted_at": {"$type": "date"}}
+
+
+def live(filters: Optional[dict] = None) -> dict:
+    """
+    filters narrowed to documents that are not deleted
+    """
+    return {**filters, **LIVE} if filters else dict(LIVE)
+
+
+def retention_cutoff(retention_days: int = SOFT_DELETE_RETENTION_DAYS) -> datetime:
+    # Mongo stores naive UTC datetimes
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
+
+
+async def purge_deleted(model: Type[Document], cutoff: datetime, batch_size: int = PURGE_BATCH_SIZE,
+                        pause: float = PURGE_BATCH_PAUSE_SECONDS) -> int:
+    """
+    Hard-delete documents of model deleted before cutoff, batch by batch
+    """
+    collection = model.get_pymongo_collection()
+    query = {"deleted_at": {"$type": "date", "$lt": cutoff}}
+    purged = 0
+    while True:
+        ids = [doc["_id"] async for doc in collection.find(query, projection={"_id": 1}, limit=batch_size)]
+        if not ids:
+            break
+        result = await collection.delete_many({**query, "_id": {"$in": ids}})
+        purged += result.deleted_count
+        if len(ids) < batch_size:
+            break
+        # leave room for request traffic between batches
+        await asyncio.sleep(pause)
+    return purged
+
+
+class PurgeTask:
+    """
+    Background loop started from the app lifespan
+    """
+
+    def __init__(self, models: List[Type[Document]], interval: float = PURGE_INTERVAL_SECONDS,
+                 retention_days: int = SOFT_DELETE_RETENTION_DAYS, batch_size: int = PURGE_BATCH_SIZE,
+                 pause: float = PURGE_BATCH_PAUSE_SECONDS):
+        self.models = models
+        self.interval = interval
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.pause = pause
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> dict:
+        cutoff = retention_cutoff(self.retention_days)
+        purged = {}
+        for model in self.models:
+            count = await purge_deleted(model, cutoff, self.batch_size, self.pause)
+            purged[model.get_settings().name] = count
+            if count:
+                print(f"🧹 Purged {count} deleted documents from {model.get_settings().name}")
+        return purged
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"⚠️ Purge of deleted documents failed: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
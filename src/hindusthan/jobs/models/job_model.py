@@ -0,0 +1,40 @@
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+from datetime import datetime, timezone
+from pydantic import Field
+from typing import Any, Dict, Optional
+from enum import Enum
+import uuid
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DEAD = "dead"  # gave up after max attempts
+
+
+class JobModel(Document):
+    """
+    Outbox entry for a background job, removed once the job succeeded
+    """
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), alias="_id")
+    kind: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    status: JobStatus = JobStatus.PENDING
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    locked_until: Optional[datetime] = None  # lease of the worker running it
+    expires_at: Optional[datetime] = None  # job is dropped after this, e.g. when its OTP expired
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "jobs"
+        indexes = [
+            # claiming due jobs
+            IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt_at"),
+            # reclaiming jobs of a crashed worker
+            IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)], name="status_locked_until"),
+            # Mongo removes jobs that are no longer worth running
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        ]
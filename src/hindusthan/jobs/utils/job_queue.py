@@ -0,0 +1,168 @@
+"""
+In-process background job queue backed by a Mongo outbox.
+
+enqueue() stores the job in the jobs collection and wakes a worker, so the
+request only pays for one insert. A fixed number of worker tasks claim due
+jobs with find-one-and-update (safe with several app processes), run the
+registered handler and delete the job on success. Failures are retried
+with exponential backoff, after max_attempts the job is kept as dead.
+A claimed job holds a lease, if its worker dies the job is picked up
+again once the lease ran out, so jobs survive restarts.
+"""
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+
+from src.hindusthan.jobs.models.job_model import JobModel, JobStatus
+from src.hindusthan.monitoring.metrics import job_duration_seconds, jobs_total
+
+# Job queue settings
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_BACKOFF_BASE_SECONDS = float(os.getenv("JOB_BACKOFF_BASE_SECONDS", "2"))
+JOB_BACKOFF_MAX_SECONDS = float(os.getenv("JOB_BACKOFF_MAX_SECONDS", "300"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "5"))
+JOB_SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv("JOB_SHUTDOWN_TIMEOUT_SECONDS", "10"))
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+def _now() -> datetime:
+    # Mongo returns naive UTC datetimes
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobQueue:
+    def __init__(self, workers: int = JOB_WORKERS, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 backoff_base: float = JOB_BACKOFF_BASE_SECONDS, backoff_max: float = JOB_BACKOFF_MAX_SECONDS,
+                 lease: float = JOB_LEASE_SECONDS, poll_interval: float = JOB_POLL_SECONDS):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, Handler] = {}
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+    def register(self, kind: str, handler: Handler):
+        self._handlers[kind] = handler
+
+    async def enqueue(self, kind: str, payload: dict, expires_in: Optional[float] = None) -> str:
+        """
+        Persist a job and wake a worker. expires_in drops the job when it could not run in time.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        job = JobModel(kind=kind, payload=payload)
+        if expires_in is not None:
+            job.expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+        await job.insert()
+        self._wakeup.set()
+        return job.id
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        # jitter so retries of a failing gateway do not line up
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _claim(self) -> Optional[dict]:
+        now = _now()
+        return await JobModel.get_pymongo_collection().find_one_and_update(
+            {
+                "$or": [
+                    {"status": JobStatus.PENDING.value, "next_attempt_at": {"$lte": now}},
+                    {"status": JobStatus.RUNNING.value, "locked_until": {"$lt": now}},
+                ],
+                "kind": {"$in": list(self._handlers)},
+            },
+            {"$set": {"status": JobStatus.RUNNING.value, "locked_until": now + timedelta(seconds=self.lease)},
+             "$inc": {"attempts": 1}},
+            sort=[("next_attempt_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _run(self, job: dict):
+        collection = JobModel.get_pymongo_collection()
+        kind = job["kind"]
+        if job.get("expires_at") and job["expires_at"] < _now():
+            await collection.delete_one({"_id": job["_id"]})
+            jobs_total.inc(kind, "expired")
+            return
+
+        started = time.perf_counter()
+        try:
+            # never run past the lease, another worker could pick the job up
+            await asyncio.wait_for(self._handlers[kind](job["payload"]), timeout=self.lease)
+        except Exception as e:
+            job_duration_seconds.observe(time.perf_counter() - started, kind)
+            await self._failed(job, e)
+            return
+        job_duration_seconds.observe(time.perf_counter() - started, kind)
+        await collection.delete_one({"_id": job["_id"]})
+        jobs_total.inc(kind, "done")
+
+    async def _failed(self, job: dict, error: Exception):
+        error_text = f"{type(error).__name__}: {error}"
+        if job["attempts"] >= self.max_attempts:
+            update = {"status": JobStatus.DEAD.value, "locked_until": None, "last_error": error_text}
+            print(f"⚠️ Job {job['kind']} {job['_id']} failed {job['attempts']} times, giving up: {error_text}")
+            jobs_total.inc(job["kind"], "dead")
+        else:
+            update = {
+                "status": JobStatus.PENDING.value,
+                "locked_until": None,
+                "next_attempt_at": _now() + timedelta(seconds=self.backoff(job["attempts"])),
+                "last_error": error_text,
+            }
+            jobs_total.inc(job["kind"], "retry")
+        await JobModel.get_pymongo_collection().update_one({"_id": job["_id"]}, {"$set": update})
+
+    async def _worker(self):
+        while not self._stopping:
+            # cleared before claiming so an enqueue during the claim is not missed
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+                if job is not None:
+                    await self._run(job)
+                    continue
+            except Exception as e:
+                print(f"⚠️ Job worker error: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._tasks:
+            return
+        self._stopping = False
+        # bound to the running loop
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = JOB_SHUTDOWN_TIMEOUT_SECONDS):
+        """
+        Let running jobs finish for up to timeout, cancelled ones are retried after their lease
+        """
+        if not self._tasks:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+
+job_queue = JobQueue()
@@ -0,0 +1,94 @@
+"""
+Outbound notification senders.
+
+NOTIFICATION_SENDER picks the implementation: "log" prints messages with
+codes masked (the default, delivers nothing), "fake" keeps them in memory
+for tests and load tests, and "package.module:ClassName" loads any other
+NotificationSender, e.g. an SMS gateway or SMTP client.
+"""
+import asyncio
+import importlib
+import os
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional
+
+NOTIFICATION_SENDER = os.getenv("NOTIFICATION_SENDER", "log")
+
+# runs of 4+ digits: OTPs and similar codes, kept out of the logs
+_CODE_RE = re.compile(r"\d{4,}")
+
+
+def mask_codes(text: str) -> str:
+    return _CODE_RE.sub(lambda match: "*" * len(match.group()), text)
+
+
+class SendError(Exception):
+    """
+    Raised by a sender when delivery failed and may be retried
+    """
+
+
+@dataclass
+class Message:
+    to: str
+    subject: str
+    body: str
+    channel: str = "email"
+
+
+class NotificationSender(ABC):
+    @abstractmethod
+    async def send(self, message: Message):
+        ...
+
+    async def close(self):
+        pass
+
+
+class LogSender(NotificationSender):
+    """
+    Prints messages instead of sending them, codes masked since logs are widely readable
+    """
+
+    async def send(self, message: Message):
+        print(f"📨 {message.channel} to {message.to}: {message.subject}\n{mask_codes(message.body)}")
+
+
+class FakeSender(NotificationSender):
+    """
+    Records messages instead of sending them.
+    fail_times makes the next n sends raise SendError, delay simulates a slow gateway.
+    """
+
+    def __init__(self, fail_times: int = 0, delay: float = 0.0):
+        self.sent: List[Message] = []
+        self.fail_times = fail_times
+        self.delay = delay
+
+    async def send(self, message: Message):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise SendError("fake delivery failure")
+        self.sent.append(message)
+
+    def last_to(self, to: str) -> Optional[Message]:
+        return next((message for message in reversed(self.sent) if message.to == to), None)
+
+
+def build_sender(spec: Optional[str] = None) -> NotificationSender:
+    spec = spec or NOTIFICATION_SENDER
+    if spec == "log":
+        return LogSender()
+    if spec == "fake":
+        return FakeSender()
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown notification sender: {spec}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+notification_sender = build_sender()
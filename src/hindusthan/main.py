@@ -1,14 +1,50 @@
+import sys
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from src.hindusthan.database.database import initialize_database, close_database
+from src.hindusthan.database.soft_delete import PurgeTask
+from src.hindusthan.auth.models.user_model import UserModel
+from src.hindusthan.customer.models.customer_model import CustomerModel, CustomerTombstoneModel
+from src.hindusthan.auth.utils.hashing_service import password_hasher
+from src.hindusthan.auth.utils.otp_store import otp_store
+from src.hindusthan.auth.utils.rate_limiter import rate_limiter
+from src.hindusthan.jobs.utils.job_queue import job_queue
+from src.hindusthan.jobs.utils.senders import notification_sender
 from fastapi.middleware.cors import CORSMiddleware
 from src.hindusthan.auth.routers.user_routes import router as auth_router
 from src.hindusthan.customer.routers.customer_routes import router as customer_router
+from src.hindusthan.monitoring.routers.metrics_routes import router as metrics_router
+from src.hindusthan.monitoring.routers.health_routes import router as health_router
+from src.hindusthan.monitoring.health import readiness
+from src.hindusthan.monitoring.middleware import MetricsMiddleware
+from src.hindusthan.monitoring.metrics import registry, SnapshotTask
+from src.hindusthan.middleware.compression import CompressionMiddleware, COMPRESSION_ENABLED
 @asynccontextmanager
 async def lifespan_context(_: FastAPI):
     await initialize_database()
+    readiness.reset()
+    # hard-deletes old soft-deleted users/customers and customer tombstones
+    purge_task = PurgeTask([UserModel, CustomerModel, CustomerTombstoneModel])
+    purge_task.start()
+    # OTP delivery and other side effects run here, off the request path
+    job_queue.start()
+    # multi-worker servers only: lets any worker answer /metrics for all of them
+    metrics_snapshots = SnapshotTask(registry)
+    metrics_snapshots.start()
     yield
+    # already set by the server on SIGTERM, this covers plain uvicorn
+    readiness.start_draining()
+    await job_queue.stop()
+    await purge_task.stop()
+    await metrics_snapshots.stop()
     await close_database()
+    password_hasher.shutdown()
+    google_verifier = sys.modules.get("src.hindusthan.auth.utils.google_verifier")
+    if google_verifier is not None:
+        await google_verifier.google_token_verifier.close()
+    await otp_store.close()
+    await rate_limiter.close()
+    await notification_sender.close()
 
 
 
@@ -27,20 +63,25 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"]
 )
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"Hello": "World"}
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "healthy"}
 
 
 app.include_router(auth_router,prefix="/api/v1/users")
 app.include_router(customer_router,prefix="/api/v1")
+app.include_router(metrics_router)
+app.include_router(health_router)
 
 
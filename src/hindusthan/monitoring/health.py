@@ -0,0 +1,81 @@
+"""
+Readiness checks for /readyz.
+
+A check pings MongoDB through the app's client and verifies that every
+declared index exists. The result (ready or not) is cached for
+READINESS_CACHE_SECONDS and concurrent probes share one running check, so
+a storm of probes costs one ping per interval. Once draining starts the
+probe reports not ready right away, so load balancers stop routing here
+before the server stops accepting connections.
+"""
+import asyncio
+import os
+import time
+from typing import Optional
+
+from src.hindusthan.database import database
+from src.hindusthan.database.indexes import index_drift
+
+# Readiness settings
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "2"))
+READINESS_TIMEOUT_SECONDS = float(os.getenv("READINESS_TIMEOUT_SECONDS", "2"))
+
+
+class ReadinessProbe:
+    def __init__(self, cache_seconds: float = READINESS_CACHE_SECONDS,
+                 timeout: float = READINESS_TIMEOUT_SECONDS):
+        self.cache_seconds = cache_seconds
+        self.timeout = timeout
+        self.draining = False
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start_draining(self):
+        self.draining = True
+
+    def reset(self):
+        self.draining = False
+        self._result = None
+
+    async def _ping(self) -> str:
+        try:
+            await asyncio.wait_for(database.client.admin.command("ping"), timeout=self.timeout)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        return "ok"
+
+    async def _missing_indexes(self) -> list:
+        missing = []
+        for model in database.DOCUMENT_MODELS:
+            drift = await index_drift(model)
+            missing += [f"{drift.collection}.{name}" for name in drift.missing]
+        return missing
+
+    async def _check(self) -> dict:
+        if database.client is None:
+            checks = {"mongo": "not initialized"}
+        else:
+            checks = {"mongo": await self._ping()}
+            if checks["mongo"] == "ok":
+                try:
+                    missing = await asyncio.wait_for(self._missing_indexes(), timeout=self.timeout)
+                    checks["indexes"] = "ok" if not missing else f"missing: {', '.join(missing)}"
+                except Exception as e:
+                    checks["indexes"] = f"{type(e).__name__}: {e}"
+        ready = all(value == "ok" for value in checks.values())
+        self._result = {"status": "ready" if ready else "not_ready", "checks": checks}
+        self._checked_at = time.monotonic()
+        return self._result
+
+    async def check(self) -> dict:
+        if self.draining:
+            return {"status": "not_ready", "checks": {"draining": "shutting down"}}
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+            return self._result
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._check())
+        return await asyncio.shield(self._task)
+
+
+readiness = ReadinessProbe()
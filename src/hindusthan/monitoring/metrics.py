@@ -0,0 +1,308 @@
+"""
+Minimal Prometheus-style metrics registry.
+
+Counters, gauges and histograms with labels, rendered in the Prometheus
+text exposition format by render(). Each metric keeps at most max_series
+label combinations, further ones are folded into an "other" series so
+cardinality stays bounded.
+
+Series live in process memory. With several workers (the server sets
+METRICS_MULTIPROC_DIR when it forks them) every worker also writes its
+series to <dir>/<pid>.json, every METRICS_FLUSH_SECONDS and right before
+it answers a scrape, and render() sums the files: counters and histograms
+over every worker that ever wrote one, so totals never go backwards when
+a worker exits, gauges over the workers still running.
+"""
+import asyncio
+import json
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Multi-worker settings
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "1"))
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_MAX_SERIES = 500
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 max_series: int = DEFAULT_MAX_SERIES):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple, object] = {}
+
+    def _key(self, labelvalues: Tuple) -> Tuple:
+        if labelvalues in self._series or len(self._series) < self.max_series:
+            return labelvalues
+        return tuple("other" for _ in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def items(self) -> List[Tuple[Tuple, object]]:
+        with self._lock:
+            return list(self._series.items())
+
+    def merge(self, merged: dict, key: Tuple, value):
+        """
+        Add one series of another process's snapshot into merged
+        """
+        merged[key] = merged.get(key, 0) + value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            if labelvalues in self._series:
+                self._series[labelvalues] += amount
+            else:
+                key = self._key(labelvalues)
+                self._series[key] = self._series.get(key, 0) + amount
+
+    def render(self, items: Optional[list] = None) -> List[str]:
+        items = self.items() if items is None else items
+        return self._header() + [f"{self.name}{_labels(self.labelnames, k)} {_format(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labelvalues):
+        with self._lock:
+            self._series[self._key(labelvalues)] = value
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            key = self._key(labelvalues)
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, *labelvalues, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+    render = Counter.render
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS, max_series: int = DEFAULT_MAX_SERIES):
+        super().__init__(name, documentation, labelnames, max_series)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                key = self._key(labelvalues)
+                series = self._series.get(key)
+                if series is None:
+                    # per-bucket counts (last one is +Inf), sum, count
+                    series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def items(self) -> List[Tuple[Tuple, object]]:
+        with self._lock:
+            return [(k, (list(v[0]), v[1], v[2])) for k, v in self._series.items()]
+
+    def merge(self, merged: dict, key: Tuple, value):
+        counts, total, count = value
+        if key in merged:
+            previous = merged[key]
+            counts = [a + b for a, b in zip(previous[0], counts)]
+            total, count = previous[1] + total, previous[2] + count
+        merged[key] = (list(counts), total, count)
+
+    def render(self, items: Optional[list] = None) -> List[str]:
+        items = self.items() if items is None else items
+        lines = self._header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % _format(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_format(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class Registry:
+    def __init__(self, multiproc_dir: str = METRICS_MULTIPROC_DIR):
+        self._metrics: List[_Metric] = []
+        # callbacks run at scrape time, for stats that live elsewhere
+        self._collectors: List[Callable[[], None]] = []
+        self.multiproc_dir = multiproc_dir or None
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def add_collector(self, collector: Callable[[], None]):
+        self._collectors.append(collector)
+
+    def _collect(self):
+        for collector in self._collectors:
+            collector()
+
+    def write_snapshot(self):
+        """
+        Write this process's series to <multiproc_dir>/<pid>.json, replaced atomically
+        """
+        self._collect()
+        snapshot = {metric.name: [[list(key), value] for key, value in metric.items()] for metric in self._metrics}
+        path = os.path.join(self.multiproc_dir, f"{os.getpid()}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(path + ".tmp", path)
+
+    def _merged(self) -> Dict[str, dict]:
+        metrics = {metric.name: metric for metric in self._metrics}
+        merged = {name: {} for name in metrics}
+        for filename in os.listdir(self.multiproc_dir):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, filename), encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = _alive(int(filename[:-len(".json")]))
+            for name, series in snapshot.items():
+                metric = metrics.get(name)
+                # an exited worker's gauges (in flight, pool sizes) no longer hold
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                for key, value in series:
+                    metric.merge(merged[name], tuple(key), value)
+        return merged
+
+    def render(self) -> str:
+        lines = []
+        if self.multiproc_dir:
+            self.write_snapshot()
+            merged = self._merged()
+            for metric in self._metrics:
+                lines.extend(metric.render(list(merged[metric.name].items())))
+        else:
+            self._collect()
+            for metric in self._metrics:
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class SnapshotTask:
+    """
+    Background loop started from the app lifespan, keeps this worker's snapshot fresh
+    for scrapes answered by other workers. Does nothing for a single process.
+    """
+
+    def __init__(self, registry: "Registry", interval: float = METRICS_FLUSH_SECONDS):
+        self.registry = registry
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.registry.write_snapshot()
+            except Exception as e:
+                print(f"⚠️ Writing the metrics snapshot failed: {e}")
+
+    def start(self):
+        if self._task is None and self.registry.multiproc_dir:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            # the final counts, kept after this worker exits
+            self.registry.write_snapshot()
+
+
+registry = Registry()
+
+# HTTP
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests being served")
+
+# MongoDB
+mongo_command_duration_seconds = registry.histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ("command", "outcome"), max_series=100)
+
+# Auth hot paths
+password_hash_duration_seconds = registry.histogram(
+    "password_hash_duration_seconds", "Argon2 hash/verify time on the worker pool", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0))
+password_hash_queue_wait_seconds = registry.histogram(
+    "password_hash_queue_wait_seconds", "Time Argon2 jobs waited for a worker", ("operation",))
+jwt_issue_duration_seconds = registry.histogram(
+    "jwt_issue_duration_seconds", "Access token signing time",
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001))
+# Background jobs
+jobs_total = registry.counter(
+    "jobs_total", "Background job runs by outcome (done, retry, dead, expired)", ("kind", "outcome"))
+job_duration_seconds = registry.histogram(
+    "job_duration_seconds", "Background job handler time", ("kind",))
+
+rate_limited_total = registry.counter(
+    "rate_limited_total", "Requests rejected by the rate limiter", ("route", "scope"))
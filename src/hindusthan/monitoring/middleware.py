@@ -0,0 +1,47 @@
+import time
+
+from src.hindusthan.monitoring.metrics import (
+    http_requests_total, http_request_duration_seconds, http_requests_in_flight, registry,
+)
+
+# label used when no route matched, so unknown paths don't create new series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and in-flight requests
+    per route template (e.g. /api/v1/customers/{id}), never per raw path.
+    """
+
+    def __init__(self, app, skip_paths=("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+        # plain counter on the hot path, copied into the gauge at scrape time
+        self.in_flight = 0
+        registry.add_collector(lambda: http_requests_in_flight.set(self.in_flight))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight -= 1
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_request_duration_seconds.observe(elapsed, method, route)
+            http_requests_total.inc(method, route, str(status_code))
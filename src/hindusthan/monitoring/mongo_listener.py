@@ -0,0 +1,33 @@
+import time
+
+from pymongo import monitoring
+
+from src.hindusthan.monitoring.metrics import mongo_command_duration_seconds
+
+# Anything else is reported as "other" to keep the label set small
+KNOWN_COMMANDS = {
+    "find", "insert", "update", "delete", "findAndModify", "aggregate", "count", "distinct",
+    "getMore", "createIndexes", "listIndexes", "dropIndexes", "ping", "listCollections", "killCursors",
+}
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """
+    Records MongoDB command durations using the driver reported duration
+    """
+
+    def started(self, event):
+        pass
+
+    def _observe(self, event, outcome: str):
+        command = event.command_name if event.command_name in KNOWN_COMMANDS else "other"
+        mongo_command_duration_seconds.observe(event.duration_micros / 1_000_000, command, outcome)
+
+    def succeeded(self, event):
+        self._observe(event, "success")
+
+    def failed(self, event):
+        self._observe(event, "failure")
+
+
+command_listener = CommandTimingListener()
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from src.hindusthan.monitoring.health import readiness
+
+router = APIRouter(tags=["monitoring"])
+
+
+# GET liveness, only proves the event loop is serving requests
+@router.get("/livez", include_in_schema=False)
+async def livez():
+    return {"status": "alive"}
+
+
+# GET readiness, MongoDB reachable and indexes in place (cached)
+@router.get("/readyz", include_in_schema=False)
+async def readyz():
+    result = await readiness.check()
+    code = status.HTTP_200_OK if result["status"] == "ready" else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(result, status_code=code, headers={"Cache-Control": "no-store"})
@@ -0,0 +1,86 @@
+import ipaddress
+import os
+import secrets
+from typing import List, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from src.hindusthan.auth.utils.auth_dependencies import token_cache
+from src.hindusthan.auth.utils.hashing_service import password_hasher
+from src.hindusthan.auth.utils.user_cache import user_cache
+from src.hindusthan.database.settings import pool_stats
+from src.hindusthan.monitoring.metrics import registry
+
+# Metrics access settings: scrapers either send "Authorization: Bearer <METRICS_TOKEN>"
+# or connect from METRICS_ALLOW_IPS (comma separated addresses / CIDRs, empty for none)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ALLOW_IPS = os.getenv("METRICS_ALLOW_IPS", "127.0.0.1,::1")
+
+router = APIRouter(tags=["monitoring"])
+
+
+def parse_networks(value: str) -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+    return [ipaddress.ip_network(part.strip(), strict=False) for part in value.split(",") if part.strip()]
+
+
+_allowed_networks = parse_networks(METRICS_ALLOW_IPS)
+
+
+def _client_allowed(request: Request) -> bool:
+    # the socket peer, or the proxy's X-Forwarded-For when uvicorn trusts that proxy
+    try:
+        address = ipaddress.ip_address(request.client.host) if request.client else None
+    except ValueError:
+        return False
+    return address is not None and any(address in network for network in _allowed_networks)
+
+
+async def require_metrics_access(request: Request):
+    """
+    Dependency for /metrics: a valid METRICS_TOKEN or an allowed client address
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if METRICS_TOKEN and scheme.lower() == "bearer" and secrets.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        return
+    if _client_allowed(request):
+        return
+    if METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+
+# Stats kept by other components, refreshed on every scrape
+mongo_pool = registry.gauge("mongo_pool", "MongoDB connection pool statistics", ("stat",))
+hash_pool = registry.gauge("password_hash_pool", "Argon2 worker pool statistics", ("stat",))
+cache_stats = registry.gauge("cache", "In-process cache statistics", ("cache", "stat"))
+
+
+def _collect():
+    for stat, value in pool_stats.snapshot().items():
+        mongo_pool.set(value, stat)
+    for stat, value in password_hasher.stats.snapshot().items():
+        hash_pool.set(value, stat)
+    hash_pool.set(password_hasher.in_flight, "in_flight")
+    for name, cache in (("token", token_cache), ("user", user_cache)):
+        for stat, value in cache.stats().items():
+            cache_stats.set(value, name, stat)
+
+
+registry.add_collector(_collect)
+
+
+# GET metrics in Prometheus text format
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False,
+            dependencies=[Depends(require_metrics_access)])
+async def metrics():
+    """
+    Metrics of the whole server, whichever worker answers. With several workers
+    every worker's series are aggregated through METRICS_MULTIPROC_DIR: counters
+    and histograms are summed over all workers, exited ones included, gauges over
+    the running ones. There is no worker label, scrape the one address.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
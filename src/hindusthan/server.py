@@ -0,0 +1,322 @@
+"""
+Production server entry point.
+
+Imports the app and warms it up once in the parent process, binds the
+listening socket, then forks N uvicorn workers (uvloop/httptools when
+installed) that share it. Each worker runs the lifespan on its own, so
+every worker has its own Motor client and connection pool. On SIGTERM the
+workers fail /readyz for --drain-delay seconds while still serving, then
+stop accepting connections, finish in-flight requests for up to
+--graceful-timeout seconds and run the lifespan shutdown; the parent
+restarts workers that die unexpectedly.
+
+Behind a reverse proxy set FORWARDED_ALLOW_IPS to the proxy's address:
+uvicorn then takes the client address from its X-Forwarded-For, which the
+rate limits and the /metrics allow-list key on.
+
+    python -m src.hindusthan.server --workers 4
+
+Run it from the project root: the code imports itself as src.hindusthan,
+so there is no installed console script.
+"""
+import argparse
+import asyncio
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import uvicorn
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may actually use: the affinity mask, capped by a cgroup v2
+    CPU quota (docker --cpus, Kubernetes limits). os.cpu_count() reports the host.
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="ascii") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+# Server settings
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0")) or available_cpus()
+GRACEFUL_TIMEOUT_SECONDS = int(os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30"))
+KEEP_ALIVE_SECONDS = int(os.getenv("KEEP_ALIVE_SECONDS", "5"))
+# on SIGTERM /readyz fails for this long before the server stops accepting
+DRAIN_DELAY_SECONDS = float(os.getenv("DRAIN_DELAY_SECONDS", "5"))
+
+
+def _best(module: str, fallback: str) -> str:
+    return module if importlib.util.find_spec(module) else fallback
+
+
+def warmup(app):
+    """
+    Pay one-time costs before the first request: OpenAPI/JSON schema
+    generation for every route model, the Argon2 backend and JWT signing
+    """
+    from src.hindusthan.auth.utils.auth_utils import create_access_token, decode_access_token, hash_password
+
+    started = time.perf_counter()
+    app.openapi()
+    hash_password("warmup")
+    decode_access_token(create_access_token({"sub": "warmup"}))
+    print(f"🔥 Warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+def import_times(module: str = "src.hindusthan.main") -> list:
+    """
+    (name, self_us, cumulative_us) per module imported by a fresh interpreter, from -X importtime
+    """
+    # run from the project root so the src package resolves
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True, cwd=project_root)
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def profile_startup(top: int = 20):
+    """
+    Print where cold start time goes: imports per package and module,
+    app import, warmup and the initialize_database steps
+    """
+    times = import_times()
+    packages = defaultdict(int)
+    for name, self_us, _ in times:
+        packages[name.split(".")[0] if not name.startswith("src.") else ".".join(name.split(".")[:3])] += self_us
+    print(f"Imports: {len(times)} modules, {sum(t[1] for t in times) / 1000:.0f} ms")
+    print(f"{'package':<40} {'ms':>8}")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<40} {self_us / 1000:>8.1f}")
+    print(f"\n{'module':<50} {'self ms':>8} {'cum ms':>8}")
+    for name, self_us, cumulative_us in sorted(times, key=lambda t: -t[1])[:top]:
+        print(f"{name:<50} {self_us / 1000:>8.1f} {cumulative_us / 1000:>8.1f}")
+
+    started = time.perf_counter()
+    from src.hindusthan.main import app
+    print(f"\n{'app import':<24} {(time.perf_counter() - started) * 1000:>8.1f} ms")
+    warmup(app)
+
+    from src.hindusthan.database.database import close_database, initialize_database, startup_timings
+
+    async def connect():
+        started = time.perf_counter()
+        try:
+            await initialize_database()
+        finally:
+            await close_database()
+        return time.perf_counter() - started
+
+    try:
+        total = asyncio.run(connect())
+    except Exception as e:
+        print(f"⚠️ initialize_database failed: {e}")
+        return
+    for step, seconds in startup_timings.items():
+        print(f"{'  ' + step:<24} {seconds * 1000:>8.1f} ms")
+    print(f"{'initialize_database':<24} {total * 1000:>8.1f} ms")
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    uvicorn server that, on SIGTERM, first reports not ready and keeps
+    serving for drain_delay seconds so load balancers take it out of
+    rotation, then shuts down gracefully. SIGINT or a second signal stop right away.
+    """
+
+    def __init__(self, config: uvicorn.Config, drain_delay: float = DRAIN_DELAY_SECONDS):
+        super().__init__(config)
+        self.drain_delay = drain_delay
+        self._drain_deadline = None
+
+    def handle_exit(self, sig, frame):
+        from src.hindusthan.monitoring.health import readiness
+
+        readiness.start_draining()
+        if sig == signal.SIGTERM and self.drain_delay > 0 and self._drain_deadline is None:
+            self._captured_signals.append(sig)
+            self._drain_deadline = time.monotonic() + self.drain_delay
+            return
+        super().handle_exit(sig, frame)
+
+    async def on_tick(self, counter: int) -> bool:
+        if self._drain_deadline is not None and time.monotonic() >= self._drain_deadline:
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+
+# worker exit code when the lifespan startup failed, restarting would not help
+STARTUP_FAILURE = 3
+
+
+def _run_worker(config: uvicorn.Config, sockets, worker_id: int, drain_delay: float):
+    os.environ["HINDUSTHAN_WORKER_ID"] = str(worker_id)
+    # the parent's handlers must not run in the worker, uvicorn installs its own
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGQUIT):
+        signal.signal(sig, signal.SIG_DFL)
+    server = DrainingServer(config, drain_delay)
+    server.run(sockets=sockets)
+    if not server.started:
+        sys.exit(STARTUP_FAILURE)
+
+
+class Supervisor:
+    """
+    Keeps N forked workers running until SIGTERM/SIGINT, then drains them
+    """
+
+    def __init__(self, config: uvicorn.Config, workers: int, graceful_timeout: int,
+                 drain_delay: float = DRAIN_DELAY_SECONDS):
+        self.config = config
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.drain_delay = drain_delay
+        self.context = multiprocessing.get_context("fork")
+        self.processes = {}
+        self.stopping = False
+
+    def _spawn(self, worker_id: int, sockets):
+        process = self.context.Process(target=_run_worker, args=(self.config, sockets, worker_id, self.drain_delay),
+                                       name=f"hindusthan-worker-{worker_id}")
+        process.start()
+        self.processes[worker_id] = process
+
+    def _handle_signal(self, sig, frame):
+        self.stopping = True
+
+    def run(self, sockets):
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGQUIT):
+            signal.signal(sig, self._handle_signal)
+        for worker_id in range(self.workers):
+            self._spawn(worker_id, sockets)
+        print(f"✅ Started {self.workers} workers (pid {os.getpid()})")
+
+        exit_code = 0
+        while not self.stopping:
+            for worker_id, process in list(self.processes.items()):
+                if process.is_alive() or self.stopping:
+                    continue
+                if process.exitcode == STARTUP_FAILURE:
+                    print(f"❌ Worker {worker_id} failed to start, shutting down")
+                    self.stopping = True
+                    exit_code = 1
+                    break
+                print(f"⚠️ Worker {worker_id} (pid {process.pid}) exited with {process.exitcode}, restarting")
+                self._spawn(worker_id, sockets)
+            time.sleep(0.5)
+
+        print("👋 Stopping workers, draining in-flight requests")
+        for process in self.processes.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+        # workers get the graceful timeout plus time for the lifespan shutdown
+        deadline = time.monotonic() + self.drain_delay + self.graceful_timeout + 10
+        for process in self.processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                print(f"⚠️ Worker pid {process.pid} did not stop in time, killing it")
+                process.kill()
+                process.join()
+        return exit_code
+
+
+def prepare_metrics_dir() -> str:
+    """
+    Directory the forked workers share their metrics through: METRICS_MULTIPROC_DIR,
+    emptied of the previous run's snapshots, or a temporary one. Call before forking.
+    """
+    from src.hindusthan.monitoring.metrics import registry
+
+    directory = os.getenv("METRICS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for filename in os.listdir(directory):
+            if filename.endswith((".json", ".tmp")):
+                os.remove(os.path.join(directory, filename))
+    else:
+        directory = tempfile.mkdtemp(prefix="hindusthan-metrics-")
+    registry.multiproc_dir = directory
+    return directory
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Hindusthan API")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY, help="defaults to the CPUs available to this process (WEB_CONCURRENCY)")
+    parser.add_argument("--graceful-timeout", type=int, default=GRACEFUL_TIMEOUT_SECONDS,
+                        help="seconds to finish in-flight requests on shutdown")
+    parser.add_argument("--keep-alive", type=int, default=KEEP_ALIVE_SECONDS)
+    parser.add_argument("--drain-delay", type=float, default=DRAIN_DELAY_SECONDS,
+                        help="seconds /readyz fails before the server stops accepting on SIGTERM")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-access-log", action="store_true")
+    parser.add_argument("--no-warmup", action="store_true")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report import and database initialization times, then exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile_startup:
+        profile_startup()
+        return 0
+
+    # imported once here, forked workers share the loaded modules
+    from src.hindusthan.main import app
+    if not args.no_warmup:
+        warmup(app)
+
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        loop=_best("uvloop", "asyncio"),
+        http=_best("httptools", "h11"),
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level=args.log_level,
+        access_log=not args.no_access_log,
+        proxy_headers=True,
+    )
+    sock = config.bind_socket()
+
+    if args.workers <= 1:
+        server = DrainingServer(config, args.drain_delay)
+        server.run(sockets=[sock])
+        exit_code = 0 if server.started else 1
+    else:
+        metrics_dir = prepare_metrics_dir()
+        try:
+            exit_code = Supervisor(config, args.workers, args.graceful_timeout, args.drain_delay).run([sock])
+        finally:
+            if not os.getenv("METRICS_MULTIPROC_DIR"):
+                shutil.rmtree(metrics_dir, ignore_errors=True)
+    sock.close()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+# deterministic defaults for the app under test, set before any app module reads them
+os.environ.setdefault("NOTIFICATION_SENDER", "fake")
+os.environ.setdefault("INDEX_SYNC_MODE", "apply")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    """
+    TestClient for the whole app on a fresh in-memory MongoDB (mongomock-motor)
+    """
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from fastapi.testclient import TestClient
+
+    from src.hindusthan.database import database
+    from src.hindusthan.database.settings import mongo_settings
+    from src.hindusthan.auth.utils.user_cache import user_cache
+    from src.hindusthan.main import app
+
+    monkeypatch.setattr(database, "AsyncIOMotorClient", mongomock_motor.AsyncMongoMockClient)
+    # mongomock has no read preferences
+    monkeypatch.setattr(mongo_settings, "router_read_preferences", {})
+    user_cache.clear()
+    with TestClient(app) as client:
+        yield client
+    user_cache.clear()
+
+
+def auth_headers(user_id: str, role: str = "customer", email: str = None) -> dict:
+    from src.hindusthan.auth.utils.auth_utils import create_access_token
+
+    token = create_access_token(data={"sub": email or f"{user_id}@example.com", "id": user_id, "role": role})
+    return {"Authorization": f"Bearer {token}"}
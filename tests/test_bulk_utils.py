@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from src.hindusthan.customer.models.customer_model import CustomerModel, CustomerRollupModel
+from src.hindusthan.customer.utils.bulk_utils import idempotent_id, ingest_customers, parse_rows
+
+ROW = {
+    "first_name": "Ravi", "middle_name": "", "last_name": "Kumar", "nick_name": "", "phone_number": "9000000000",
+    "email": "ravi@example.com", "district": "Guntur", "mandal": "Tenali", "village": "Kollipara",
+    "register_by": "agent", "user_id": "u", "kyc_number": "k", "kyc_url": "https://example.com/k",
+    "street": "s", "city": "Tenali", "state": "AP", "postal_code": "522201", "country": "IN",
+    "service": "loan", "sub_service": "crop",
+}
+
+
+def test_idempotent_id_is_scoped_to_the_caller():
+    assert idempotent_id("agent-1", "row-1") == idempotent_id("agent-1", "row-1")
+    assert idempotent_id("agent-1", "row-1") != idempotent_id("agent-2", "row-1")
+    # not a plain concatenation, so (caller, key) pairs cannot run into each other
+    assert idempotent_id("a", "b:c") != idempotent_id("a:b", "c")
+
+
+def test_parse_rows_reports_bad_ndjson_lines():
+    rows = parse_rows(b'{"a": 1}\n\nnot json\n{"b": 2}\n', ndjson=True)
+    assert [index for index, _ in rows] == [0, 1, 2]
+    assert isinstance(rows[1][1], ValueError)
+
+
+def test_retry_is_deduplicated_per_caller():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from beanie import init_beanie
+
+    async def scenario():
+        client = mongomock_motor.AsyncMongoMockClient()
+        await init_beanie(database=client["bulk_test"], document_models=[CustomerModel, CustomerRollupModel])
+        rows = [(i, {**ROW, "first_name": f"farmer{i}", "idempotency_key": f"row-{i}"}) for i in range(3)]
+        rows.append((3, {"first_name": "missing fields"}))
+
+        first = await ingest_customers(rows, batch_size=2, caller="agent-1")
+        assert [r.status for r in first] == ["created", "created", "created", "invalid"]
+
+        retry = await ingest_customers(rows, batch_size=2, caller="agent-1")
+        assert [r.status for r in retry] == ["duplicate", "duplicate", "duplicate", "invalid"]
+        assert [r.id for r in retry[:3]] == [r.id for r in first[:3]]
+
+        # another user reusing the same keys gets their own rows
+        other = await ingest_customers(rows[:3], batch_size=2, caller="agent-2")
+        assert [r.status for r in other] == ["created", "created", "created"]
+        assert await CustomerModel.find_all().count() == 6
+
+    asyncio.run(scenario())
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+from benchmarks.cold_start import PROJECT_ROOT, import_ms
+
+# generous enough for a loaded CI runner, catches an eager heavy import
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "3000"))
+IMPORT_RUNS = int(os.getenv("IMPORT_RUNS", "3"))
+
+# only needed by Google login or the first password hash, must stay out of the app import
+LAZY_MODULES = ("src.hindusthan.auth.utils.google_verifier", "passlib", "httpx", "google.auth")
+
+
+def test_app_import_is_within_budget():
+    # best of a few fresh interpreters, the minimum is the least noisy
+    best = min(import_ms() for _ in range(IMPORT_RUNS))
+    assert best <= IMPORT_BUDGET_MS, f"import src.hindusthan.main took {best:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
+
+
+def test_app_import_keeps_heavy_modules_lazy():
+    result = subprocess.run(
+        [sys.executable, "-c",
+         f"import sys, src.hindusthan.main; print('loaded:', *(m for m in {LAZY_MODULES!r} if m in sys.modules))"],
+        capture_output=True, text=True, check=True, cwd=PROJECT_ROOT,
+    )
+    loaded = result.stdout.strip().splitlines()[-1].split()[1:]
+    assert not loaded, f"imported eagerly by the app: {loaded}"
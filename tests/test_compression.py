@@ -0,0 +1,98 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.hindusthan.middleware.compression import CompressionMiddleware, add_vary, choose_encoding
+
+BIG = "x" * 5000
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+
+@app.get("/big")
+async def big():
+    return PlainTextResponse(BIG)
+
+
+@app.get("/small")
+async def small():
+    return {"ok": True}
+
+
+@app.get("/image")
+async def image():
+    return Response(b"\x89PNG" * 2000, media_type="image/png")
+
+
+@app.get("/varied")
+async def varied():
+    return PlainTextResponse(BIG, headers={"Vary": "Origin"})
+
+
+@app.get("/stream")
+async def stream():
+    async def chunks():
+        for _ in range(3):
+            yield BIG
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip") == "gzip"
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("identity") is None
+
+
+def test_add_vary_merges():
+    assert add_vary([]) == [(b"vary", b"Accept-Encoding")]
+    assert add_vary([(b"vary", b"Origin")]) == [(b"vary", b"Origin, Accept-Encoding")]
+    assert add_vary([(b"vary", b"accept-encoding")]) == [(b"vary", b"accept-encoding")]
+    assert add_vary([(b"vary", b"*")]) == [(b"vary", b"*")]
+
+
+def test_compressed_response(client):
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == BIG
+
+
+@pytest.mark.parametrize("path,accept_encoding", [
+    ("/big", "identity"),  # client cannot take any encoding we offer
+    ("/big", ""),  # no Accept-Encoding at all
+    ("/small", "gzip"),  # under the minimum size
+])
+def test_uncompressed_compressible_response_still_varies(client, path, accept_encoding):
+    response = client.get(path, headers={"Accept-Encoding": accept_encoding})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_non_compressible_type_has_no_vary(client):
+    response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_existing_vary_is_extended(client):
+    for accept_encoding in ("gzip", "identity"):
+        response = client.get("/varied", headers={"Accept-Encoding": accept_encoding})
+        assert response.headers["vary"] == "Origin, Accept-Encoding"
+
+
+def test_streaming_response_is_compressed(client):
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(raw).decode() == BIG * 3
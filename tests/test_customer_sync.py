@@ -0,0 +1,125 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.hindusthan.customer.models.customer_model import CustomerModel, CustomerTombstoneModel
+from src.hindusthan.database.pagination import encode_cursor
+from src.hindusthan.database.soft_delete import SOFT_DELETE_RETENTION_DAYS
+from tests.conftest import auth_headers
+
+CHANGES = "/api/v1/customers/changes"
+STAFF = auth_headers("agent", "field_agent")
+
+
+@pytest.fixture
+def client(app_client, monkeypatch):
+    from src.hindusthan.customer.utils import sync_utils
+
+    # no write is in flight in these tests, report changes right away
+    monkeypatch.setattr(sync_utils, "CUSTOMER_CHANGES_LAG_SECONDS", 0)
+    return app_client
+
+
+def _create(client, first_name: str) -> str:
+    body = {field: "" for field in (
+        "middle_name", "last_name", "nick_name", "phone_number", "district", "mandal", "village", "register_by",
+        "user_id", "kyc_number", "kyc_url", "street", "city", "state", "postal_code", "country", "service",
+        "sub_service",
+    )}
+    body.update(first_name=first_name, email="farmer@example.com")
+    response = client.post("/api/v1/customers/", json=body, headers=STAFF)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _changes(client, since=None, limit=100) -> dict:
+    params = {"limit": limit}
+    if since is not None:
+        params["since"] = since
+    response = client.get(CHANGES, params=params, headers=STAFF)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _tick():
+    # timestamps are stored with millisecond precision, keep steps apart
+    time.sleep(0.01)
+
+
+def test_update_appears_in_the_feed(client):
+    updated, untouched = _create(client, "ravi"), _create(client, "sita")
+    full = _changes(client)
+    assert {item["id"] for item in full["items"]} == {updated, untouched}
+    assert not full["has_more"]
+
+    _tick()
+    response = client.patch(f"/api/v1/customers/{updated}", json={"first_name": "ravi kumar"}, headers=STAFF)
+    assert response.status_code == 200
+
+    delta = _changes(client, full["next_token"])
+    assert [item["id"] for item in delta["items"]] == [updated]
+    assert delta["items"][0]["first_name"] == "ravi kumar"
+    assert delta["deleted"] == []
+    # nothing new after that
+    assert _changes(client, delta["next_token"])["items"] == []
+
+
+@pytest.mark.parametrize("soft_delete", [True, False], ids=["soft", "hard"])
+def test_delete_appears_as_tombstone(client, monkeypatch, soft_delete):
+    from src.hindusthan.customer.routers import customer_routes
+
+    monkeypatch.setattr(customer_routes, "SOFT_DELETE", soft_delete)
+    deleted, kept = _create(client, "ravi"), _create(client, "sita")
+    token = _changes(client)["next_token"]
+
+    _tick()
+    assert client.delete(f"/api/v1/customers/{deleted}", headers=STAFF).status_code == 200
+
+    delta = _changes(client, token)
+    assert delta["items"] == []
+    assert delta["deleted"] == [deleted]
+    # a full sync does not hand the deleted customer out as live either
+    full = _changes(client)
+    assert [item["id"] for item in full["items"]] == [kept]
+
+
+def test_resume_token_does_not_skip_rows_with_the_same_timestamp(client):
+    # naive UTC, as Mongo returns it, truncated to what Mongo stores
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0) - timedelta(seconds=5)
+    changed_ids = [f"customer-{i}" for i in range(5)]
+    deleted_ids = ["customer-2a", "customer-9"]
+
+    async def seed():
+        await CustomerModel.get_pymongo_collection().insert_many([
+            {**CustomerModel(id=id, first_name=id).model_dump(by_alias=True), "created_at": now, "updated_at": now}
+            for id in changed_ids
+        ])
+        await CustomerTombstoneModel.get_pymongo_collection().insert_many([
+            {"_id": id, "deleted_at": now} for id in deleted_ids
+        ])
+    client.portal.call(seed)
+
+    seen, deleted, token = [], [], None
+    for _ in range(10):
+        page = _changes(client, token, limit=2)
+        assert len(page["items"]) + len(page["deleted"]) <= 2
+        seen += [item["id"] for item in page["items"]]
+        deleted += page["deleted"]
+        token = page["next_token"]
+        if not page["has_more"]:
+            break
+
+    assert seen == changed_ids
+    assert deleted == deleted_ids
+
+
+@pytest.mark.parametrize("since", [
+    (datetime.now(timezone.utc) - timedelta(days=SOFT_DELETE_RETENTION_DAYS + 1)).isoformat(),
+    encode_cursor(datetime.now(timezone.utc) - timedelta(days=SOFT_DELETE_RETENTION_DAYS + 1), "customer-1"),
+    "not-a-token",
+], ids=["old-timestamp", "expired-token", "invalid-token"])
+def test_unusable_since_is_gone(client, since):
+    response = client.get(CHANGES, params={"since": since}, headers=STAFF)
+    assert response.status_code == 410
+    assert "full sync" in response.json()["detail"]
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from src.hindusthan.auth.utils import google_verifier as google_verifier_module
+from src.hindusthan.auth.utils.google_verifier import GoogleTokenVerifier, JWKSSource, parse_max_age
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeSource(JWKSSource):
+    def __init__(self, kids, max_age: int = 3600):
+        self.kids = list(kids)
+        self.max_age = max_age
+        self.fetches = 0
+        self.fail = False
+
+    async def fetch(self):
+        self.fetches += 1
+        await asyncio.sleep(0)
+        if self.fail:
+            raise OSError("network down")
+        return {"keys": [{"kid": kid, "kty": "RSA"} for kid in self.kids]}, self.max_age
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(google_verifier_module, "time", clock)
+    return clock
+
+
+def _verifier(source, **kwargs) -> GoogleTokenVerifier:
+    return GoogleTokenVerifier(source, audience="client", refresh_margin=300, min_refresh_interval=60, **kwargs)
+
+
+def test_parse_max_age():
+    assert parse_max_age("public, max-age=19800, must-revalidate") == 19800
+    assert parse_max_age(None, default=7) == 7
+
+
+def test_unknown_kids_force_at_most_one_fetch_per_interval(clock):
+    async def scenario():
+        source = FakeSource(["k1"])
+        verifier = _verifier(source)
+        assert (await verifier._get_key("k1"))["kid"] == "k1"
+        assert source.fetches == 1
+
+        clock.now += 10
+        for kid in ("bogus1", "bogus2", "bogus3"):
+            with pytest.raises(ValueError, match="Unknown signing key"):
+                await verifier._get_key(kid)
+        assert source.fetches == 1
+
+        # Google rotated in a new key: picked up once the interval has passed
+        source.kids.append("k2")
+        clock.now += 50
+        assert (await verifier._get_key("k2"))["kid"] == "k2"
+        assert source.fetches == 2
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_misses_share_one_fetch(clock):
+    async def scenario():
+        source = FakeSource(["k1"])
+        verifier = _verifier(source)
+        keys = await asyncio.gather(*(verifier._get_key("k1") for _ in range(10)))
+        assert all(key["kid"] == "k1" for key in keys)
+        assert source.fetches == 1
+
+    asyncio.run(scenario())
+
+
+def test_failed_refresh_keeps_last_keys(clock):
+    async def scenario():
+        source = FakeSource(["k1"], max_age=600)
+        verifier = _verifier(source)
+        await verifier._get_key("k1")
+
+        source.fail = True
+        clock.now += 700
+        assert (await verifier._get_key("k1"))["kid"] == "k1"
+        assert source.fetches == 2
+        # expired but recently attempted: no new fetch on every request
+        await verifier._get_key("k1")
+        assert source.fetches == 2
+
+    asyncio.run(scenario())
+
+
+def test_no_keys_at_all_is_an_error(clock):
+    async def scenario():
+        source = FakeSource(["k1"])
+        source.fail = True
+        with pytest.raises(ValueError, match="Unable to load"):
+            await _verifier(source)._get_key("k1")
+
+    asyncio.run(scenario())
+
+
+def test_background_refresh_before_expiry(clock):
+    async def scenario():
+        source = FakeSource(["k1"], max_age=600)
+        verifier = _verifier(source)
+        await verifier._get_key("k1")
+        clock.now += 400  # inside the refresh margin, not expired
+        await verifier._get_key("k1")
+        await verifier._refresh_task
+        assert source.fetches == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_background_refresh_is_harmless(clock):
+    async def scenario():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        source = FakeSource(["k1"], max_age=600)
+        verifier = _verifier(source)
+        await verifier._get_key("k1")
+        clock.now += 400
+        await verifier._get_key("k1")
+        verifier._refresh_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await verifier._refresh_task
+        # the next request can still refresh
+        fetches = source.fetches
+        clock.now += 60
+        await verifier._get_key("k1")
+        await verifier._refresh_task
+        assert source.fetches == fetches + 1
+        assert not errors
+
+    asyncio.run(scenario())
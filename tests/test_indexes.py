@@ -0,0 +1,48 @@
+from src.hindusthan.auth.models.user_model import UserModel
+from src.hindusthan.customer.models.customer_model import CustomerModel
+from src.hindusthan.database.indexes import _normalize
+
+
+def _declared(model, name: str) -> dict:
+    return next(index.document for index in model.Settings.indexes if index.document["name"] == name)
+
+
+def test_existing_text_index_matches_declaration():
+    # what the server returns from index_information() for names_text
+    existing = {
+        "v": 2,
+        "key": [("_fts", "text"), ("_ftsx", 1)],
+        "name": "names_text",
+        "weights": {"first_name": 1, "middle_name": 1, "last_name": 1, "nick_name": 1},
+        "default_language": "english",
+        "language_override": "language",
+        "textIndexVersion": 3,
+        "partialFilterExpression": {"deleted_at": None},
+    }
+    assert _normalize(_declared(CustomerModel, "names_text")) == _normalize(existing)
+
+
+def test_text_index_with_other_fields_is_mismatched():
+    existing = {
+        "key": [("_fts", "text"), ("_ftsx", 1)],
+        "weights": {"first_name": 1},
+        "default_language": "english",
+        "partialFilterExpression": {"deleted_at": None},
+    }
+    assert _normalize(_declared(CustomerModel, "names_text")) != _normalize(existing)
+
+
+def test_existing_partial_unique_index_matches_declaration():
+    existing = {
+        "v": 2,
+        "key": [("email", 1)],
+        "name": "email_unique",
+        "unique": True,
+        "partialFilterExpression": {"deleted_at": None},
+    }
+    assert _normalize(_declared(UserModel, "email_unique")) == _normalize(existing)
+
+
+def test_unique_index_without_partial_filter_is_mismatched():
+    existing = {"key": [("email", 1)], "name": "email_unique", "unique": True}
+    assert _normalize(_declared(UserModel, "email_unique")) != _normalize(existing)
@@ -0,0 +1,129 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from src.hindusthan.jobs.models.job_model import JobModel, JobStatus
+from src.hindusthan.jobs.utils import job_queue as job_queue_module
+from src.hindusthan.jobs.utils.job_queue import JobQueue
+
+
+async def _init_jobs():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from beanie import init_beanie
+
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client["jobs_test"], document_models=[JobModel])
+
+
+async def _failing(payload: dict):
+    raise RuntimeError("gateway down")
+
+
+async def _make_due(job_id: str):
+    # skip the backoff wait instead of sleeping through it
+    await JobModel.get_pymongo_collection().update_one(
+        {"_id": job_id}, {"$set": {"next_attempt_at": job_queue_module._now() - timedelta(seconds=1)}})
+
+
+def test_failing_job_backs_off_then_goes_dead():
+    async def scenario():
+        await _init_jobs()
+        queue = JobQueue(workers=1, max_attempts=3, backoff_base=10, backoff_max=300)
+        queue.register("flaky", _failing)
+        job_id = await queue.enqueue("flaky", {"to": "farmer@example.com"})
+
+        for attempt in (1, 2):
+            claimed_at = job_queue_module._now()
+            job = await queue._claim()
+            assert job["_id"] == job_id and job["attempts"] == attempt
+            await queue._run(job)
+
+            stored = await JobModel.get(job_id)
+            assert stored.status == JobStatus.PENDING
+            assert stored.last_error == "RuntimeError: gateway down"
+            # exponential backoff with jitter: base * 2^(attempt - 1) scaled by 0.5..1.0
+            delay = (stored.next_attempt_at.replace(tzinfo=None) - claimed_at).total_seconds()
+            full = 10 * 2 ** (attempt - 1)
+            assert full * 0.5 - 1 <= delay <= full + 1
+            # not claimable before the backoff ran out
+            assert await queue._claim() is None
+            await _make_due(job_id)
+
+        job = await queue._claim()
+        assert job["attempts"] == 3
+        await queue._run(job)
+
+        stored = await JobModel.get(job_id)
+        assert stored.status == JobStatus.DEAD
+        assert stored.locked_until is None
+        # dead jobs are kept for inspection but never claimed again
+        await _make_due(job_id)
+        assert await queue._claim() is None
+
+    asyncio.run(scenario())
+
+
+def test_backoff_is_capped():
+    queue = JobQueue(backoff_base=2, backoff_max=30)
+    assert all(15 <= queue.backoff(attempts) <= 30 for attempts in (5, 10, 50))
+
+
+def test_workers_retry_until_the_handler_succeeds():
+    async def scenario():
+        await _init_jobs()
+        calls = []
+
+        async def flaky(payload: dict):
+            calls.append(payload)
+            if len(calls) < 3:
+                raise RuntimeError("gateway down")
+
+        queue = JobQueue(workers=2, max_attempts=5, backoff_base=0, poll_interval=0.01)
+        queue.register("flaky", flaky)
+        queue.start()
+        try:
+            job_id = await queue.enqueue("flaky", {"to": "farmer@example.com"})
+            for _ in range(200):
+                if await JobModel.get(job_id) is None:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await queue.stop(timeout=1)
+
+        # deleted once it succeeded on the third attempt
+        assert await JobModel.get(job_id) is None
+        assert len(calls) == 3
+
+    asyncio.run(scenario())
+
+
+def test_job_of_a_dead_worker_is_reclaimed_after_its_lease():
+    async def scenario():
+        await _init_jobs()
+        done = []
+
+        async def deliver(payload: dict):
+            done.append(payload)
+
+        crashed = JobQueue(workers=1, lease=0.2)
+        crashed.register("deliver", deliver)
+        job_id = await crashed.enqueue("deliver", {"to": "farmer@example.com"})
+        # claimed, then the worker died before running it
+        assert (await crashed._claim())["_id"] == job_id
+
+        survivor = JobQueue(workers=1, lease=0.2)
+        survivor.register("deliver", deliver)
+        # still leased to the dead worker
+        assert await survivor._claim() is None
+
+        await asyncio.sleep(0.3)
+        job = await survivor._claim()
+        assert job["_id"] == job_id
+        assert job["attempts"] == 2
+        await survivor._run(job)
+
+        assert done == [{"to": "farmer@example.com"}]
+        assert await JobModel.get(job_id) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+
+from src.hindusthan.monitoring.metrics import Registry, SnapshotTask
+
+DEAD_PID = 2 ** 22 + 12345  # above the default pid_max, never a running process
+
+
+def _registry(directory=None):
+    registry = Registry(multiproc_dir=directory)
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    in_flight = registry.gauge("in_flight", "In flight")
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    return registry, requests, in_flight, latency
+
+
+def _values(text: str) -> dict:
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+def test_single_process_render():
+    registry, requests, in_flight, latency = _registry()
+    requests.inc("/a")
+    requests.inc("/a")
+    in_flight.set(3)
+    latency.observe(0.5)
+    values = _values(registry.render())
+    assert values['requests_total{route="/a"}'] == "2"
+    assert values["in_flight"] == "3"
+    assert values['latency_seconds_bucket{le="0.1"}'] == "0"
+    assert values['latency_seconds_bucket{le="1.0"}'] == "1"
+    assert values["latency_seconds_count"] == "1"
+
+
+def test_workers_are_summed_and_exited_counters_kept(tmp_path):
+    registry, requests, in_flight, latency = _registry(str(tmp_path))
+    requests.inc("/a", amount=2)
+    in_flight.set(1)
+    latency.observe(0.05)
+
+    # another worker's snapshot: one still running (this test's parent), one that exited
+    for pid, count in ((os.getppid(), 5), (DEAD_PID, 7)):
+        (tmp_path / f"{pid}.json").write_text(json.dumps({
+            "requests_total": [[["/a"], count]],
+            "in_flight": [[[], 10]],
+            "latency_seconds": [[[], [[0, 1, 0], 0.5, 1]]],
+        }))
+
+    values = _values(registry.render())
+    assert values['requests_total{route="/a"}'] == "14"
+    assert values["in_flight"] == "11"  # the exited worker's gauge is dropped
+    assert values['latency_seconds_bucket{le="0.1"}'] == "1"
+    assert values['latency_seconds_bucket{le="1.0"}'] == "3"
+    assert values["latency_seconds_count"] == "3"
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+
+
+def test_totals_do_not_go_backwards_across_workers(tmp_path):
+    # two workers answering scrapes in turn, each reads the other's snapshot
+    worker_a, requests_a, _, _ = _registry(str(tmp_path))
+    requests_a.inc("/a", amount=3)
+    first = _values(worker_a.render())['requests_total{route="/a"}']
+
+    # worker B only knows its own count, plus A's snapshot from the last scrape
+    (tmp_path / f"{os.getpid()}.json").rename(tmp_path / f"{os.getppid()}.json")
+    worker_b, requests_b, _, _ = _registry(str(tmp_path))
+    requests_b.inc("/a")
+    second = _values(worker_b.render())['requests_total{route="/a"}']
+    assert float(second) >= float(first)
+
+
+def test_unreadable_snapshot_is_skipped(tmp_path):
+    registry, requests, _, _ = _registry(str(tmp_path))
+    requests.inc("/a")
+    (tmp_path / f"{DEAD_PID}.json").write_text("{not json")
+    assert _values(registry.render())['requests_total{route="/a"}'] == "1"
+
+
+def test_snapshot_task_writes_final_snapshot(tmp_path):
+    registry, requests, _, _ = _registry(str(tmp_path))
+
+    async def scenario():
+        task = SnapshotTask(registry, interval=0.01)
+        task.start()
+        requests.inc("/a")
+        await asyncio.sleep(0.05)
+        requests.inc("/a")
+        await task.stop()
+
+    asyncio.run(scenario())
+    snapshot = json.loads((tmp_path / f"{os.getpid()}.json").read_text())
+    assert snapshot["requests_total"] == [[["/a"], 2]]
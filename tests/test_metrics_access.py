@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.hindusthan.monitoring.routers import metrics_routes
+from src.hindusthan.monitoring.routers.metrics_routes import parse_networks, require_metrics_access
+
+
+def _request(ip: str, authorization: str = "") -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "method": "GET", "path": "/metrics", "headers": headers, "client": (ip, 1234)})
+
+
+def _check(request: Request):
+    asyncio.run(require_metrics_access(request))
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def configure(token: str = "", allow: str = ""):
+        monkeypatch.setattr(metrics_routes, "METRICS_TOKEN", token)
+        monkeypatch.setattr(metrics_routes, "_allowed_networks", parse_networks(allow))
+    return configure
+
+
+def test_default_allows_loopback_only(configure):
+    configure(allow=metrics_routes.METRICS_ALLOW_IPS)
+    _check(_request("127.0.0.1"))
+    _check(_request("::1"))
+    with pytest.raises(HTTPException) as raised:
+        _check(_request("203.0.113.7"))
+    assert raised.value.status_code == 403
+
+
+def test_allow_list_accepts_cidrs(configure):
+    configure(allow="10.0.0.0/8, 192.168.1.5")
+    _check(_request("10.20.30.40"))
+    _check(_request("192.168.1.5"))
+    for ip in ("192.168.1.6", "testclient"):
+        with pytest.raises(HTTPException):
+            _check(_request(ip))
+
+
+def test_token(configure):
+    configure(token="s3cret")
+    _check(_request("203.0.113.7", "Bearer s3cret"))
+    for authorization in ("", "Bearer wrong", "Basic s3cret"):
+        with pytest.raises(HTTPException) as raised:
+            _check(_request("203.0.113.7", authorization))
+        assert raised.value.status_code == 401
+        assert raised.value.headers["WWW-Authenticate"] == "Bearer"
+
+
+def test_token_or_allow_list(configure):
+    configure(token="s3cret", allow="10.0.0.0/8")
+    _check(_request("10.1.1.1"))
+    _check(_request("203.0.113.7", "Bearer s3cret"))
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from src.hindusthan.auth.models.user_model import OTPModel
+from src.hindusthan.auth.utils.otp_store import MemoryOTPStore, MongoOTPStore, OTPStatus
+
+EMAIL = "farmer@example.com"
+
+
+async def _memory_store(**kwargs):
+    return MemoryOTPStore(**kwargs)
+
+
+async def _mongo_store(**kwargs):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from beanie import init_beanie
+
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client["otp_test"], document_models=[OTPModel])
+    return MongoOTPStore(**kwargs)
+
+
+@pytest.fixture(params=[_memory_store, _mongo_store], ids=["memory", "mongo"])
+def make_store(request):
+    return request.param
+
+
+def _wrong(code: str) -> str:
+    return "000000" if code != "000000" else "111111"
+
+
+def test_valid_code_is_single_use(make_store):
+    async def scenario():
+        store = await make_store(ttl_seconds=300, max_attempts=5)
+        code = await store.issue(EMAIL)
+        assert await store.verify(EMAIL, code) == OTPStatus.VALID
+        assert await store.verify(EMAIL, code) == OTPStatus.INVALID
+
+    asyncio.run(scenario())
+
+
+def test_expired_code_is_rejected(make_store):
+    async def scenario():
+        store = await make_store(ttl_seconds=-1, max_attempts=5)
+        code = await store.issue(EMAIL)
+        # Mongo's TTL index may already have removed it, which reads as invalid
+        assert await store.verify(EMAIL, code) in (OTPStatus.EXPIRED, OTPStatus.INVALID)
+        # the expired code is gone, not just rejected
+        assert await store.verify(EMAIL, code) == OTPStatus.INVALID
+
+    asyncio.run(scenario())
+
+
+def test_max_attempts_burns_the_code(make_store):
+    async def scenario():
+        store = await make_store(ttl_seconds=300, max_attempts=3)
+        code = await store.issue(EMAIL)
+        assert await store.verify(EMAIL, _wrong(code)) == OTPStatus.INVALID
+        assert await store.verify(EMAIL, _wrong(code)) == OTPStatus.INVALID
+        assert await store.verify(EMAIL, _wrong(code)) == OTPStatus.TOO_MANY_ATTEMPTS
+        # even the right code no longer works
+        assert await store.verify(EMAIL, code) == OTPStatus.INVALID
+
+    asyncio.run(scenario())
+
+
+def test_reissue_replaces_previous_code(make_store):
+    async def scenario():
+        store = await make_store(ttl_seconds=300, max_attempts=5)
+        first = await store.issue(EMAIL)
+        second = await store.issue(EMAIL)
+        while second == first:
+            second = await store.issue(EMAIL)
+        assert await store.verify(EMAIL, first) == OTPStatus.INVALID
+        assert await store.verify(EMAIL, second) == OTPStatus.VALID
+
+    asyncio.run(scenario())
+
+
+def test_mongo_keeps_one_otp_per_email():
+    async def scenario():
+        store = await _mongo_store(ttl_seconds=300, max_attempts=5)
+        await asyncio.gather(*(store.issue(EMAIL) for _ in range(5)))
+        assert await OTPModel.get_pymongo_collection().count_documents({"email": EMAIL}) == 1
+        index = (await OTPModel.get_pymongo_collection().index_information())["email_unique"]
+        assert index["unique"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,27 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from src.hindusthan.customer.models.customer_model import CustomerModel
+from src.hindusthan.database.pagination import decode_cursor, encode_cursor, raw_cursor_page
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678000)
+    assert decode_cursor(encode_cursor(created_at, "abc")) == (created_at, "abc")
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not-a-cursor")
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_raw_cursor_page_rejects_limit_below_one(limit):
+    # rejected before any query, no database needed
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(raw_cursor_page(CustomerModel, "", limit))
+    assert error.value.status_code == 400
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.hindusthan.auth.utils import rate_limiter as rate_limiter_module
+from src.hindusthan.auth.utils.rate_limiter import MemoryRateLimitBackend, RateLimit, RateLimiter, \
+    RedisRateLimitBackend
+
+PER_MINUTE = RateLimit.parse("3/minute")
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, "time", clock)
+    return clock
+
+
+def _memory_backend():
+    return MemoryRateLimitBackend(max_keys=100)
+
+
+def _redis_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis runs the Lua script with it
+    return RedisRateLimitBackend(redis=fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+@pytest.fixture(params=[_memory_backend, _redis_backend], ids=["memory", "redis"])
+def backend(request):
+    return request.param()
+
+
+def _request(ip: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/login", "headers": [], "client": (ip, 1234)})
+
+
+def test_parse():
+    assert RateLimit.parse("10/minute") == RateLimit(capacity=10, rate=10 / 60)
+    assert RateLimit.parse("5/seconds") == RateLimit(capacity=5, rate=5)
+    with pytest.raises(ValueError):
+        RateLimit.parse("5/fortnight")
+
+
+def test_burst_is_capped_at_capacity(backend, clock):
+    async def scenario():
+        results = [await backend.take("k", PER_MINUTE) for _ in range(4)]
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        # a long idle period refills to capacity, not beyond it
+        clock.now += 3600
+        results = [await backend.take("k", PER_MINUTE) for _ in range(4)]
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+
+    asyncio.run(scenario())
+
+
+def test_tokens_refill_at_rate(backend, clock):
+    async def scenario():
+        for _ in range(3):
+            await backend.take("k", PER_MINUTE)
+        allowed, retry_after = await backend.take("k", PER_MINUTE)
+        assert not allowed
+        assert retry_after == pytest.approx(20)
+        clock.now += 19
+        assert not (await backend.take("k", PER_MINUTE))[0]
+        clock.now += 1
+        assert (await backend.take("k", PER_MINUTE))[0]
+        assert not (await backend.take("k", PER_MINUTE))[0]
+
+    asyncio.run(scenario())
+
+
+def test_keys_have_separate_buckets(backend, clock):
+    async def scenario():
+        for _ in range(3):
+            await backend.take("a", PER_MINUTE)
+        assert not (await backend.take("a", PER_MINUTE))[0]
+        assert (await backend.take("b", PER_MINUTE))[0]
+
+    asyncio.run(scenario())
+
+
+def test_check_raises_429_with_retry_after(clock):
+    async def scenario():
+        limiter = RateLimiter(_memory_backend(), limits={"login": {"ip": RateLimit.parse("1/minute")}}, enabled=True)
+        await limiter.check("login", _request())
+        with pytest.raises(HTTPException) as raised:
+            await limiter.check("login", _request())
+        assert raised.value.status_code == 429
+        assert raised.value.headers["Retry-After"] == "60"
+        # partially refilled: whole seconds rounded up, never below 1
+        clock.now += 59.5
+        with pytest.raises(HTTPException) as raised:
+            await limiter.check("login", _request())
+        assert raised.value.headers["Retry-After"] == "1"
+        # another client is not affected
+        await limiter.check("login", _request("10.0.0.2"))
+
+    asyncio.run(scenario())
+
+
+def test_check_limits_by_normalized_email(clock):
+    async def scenario():
+        limiter = RateLimiter(_memory_backend(), limits={"login": {"email": RateLimit.parse("1/minute")}}, enabled=True)
+        await limiter.check("login", _request("10.0.0.1"), "Farmer@Example.com")
+        with pytest.raises(HTTPException):
+            await limiter.check("login", _request("10.0.0.2"), " farmer@example.com ")
+
+    asyncio.run(scenario())
+
+
+def test_redis_errors_fail_open():
+    class BrokenRedis:
+        def register_script(self, script):
+            async def run(keys, args):
+                raise ConnectionError("redis is down")
+            return run
+
+    async def scenario():
+        backend = RedisRateLimitBackend(redis=BrokenRedis())
+        assert await backend.take("k", PER_MINUTE) == (True, 0.0)
+        limiter = RateLimiter(backend, limits={"login": {"ip": RateLimit.parse("1/minute")}}, enabled=True)
+        for _ in range(3):
+            await limiter.check("login", _request())
+
+    asyncio.run(scenario())
+
+
+def test_forged_forwarded_for_does_not_change_the_bucket(clock):
+    async def scenario():
+        limiter = RateLimiter(_memory_backend(), limits={"login": {"ip": RateLimit.parse("1/minute")}}, enabled=True)
+
+        def forged(fake_ip: str) -> Request:
+            return Request({"type": "http", "method": "POST", "path": "/login", "client": ("10.0.0.1", 1234),
+                            "headers": [(b"x-forwarded-for", f"{fake_ip}, 10.0.0.1".encode())]})
+
+        await limiter.check("login", forged("198.51.100.1"))
+        with pytest.raises(HTTPException):
+            await limiter.check("login", forged("198.51.100.2"))
+
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+import pytest
+
+from src.hindusthan.customer.models.customer_model import CustomerRollupModel
+from src.hindusthan.customer.utils.rollup_utils import ROLLUP_DIMENSIONS, live_counts, rebuild_rollups, \
+    rollup_counts
+from tests.conftest import auth_headers
+
+CUSTOMERS = "/api/v1/customers"
+STAFF = auth_headers("agent", "field_agent")
+ADMIN = auth_headers("admin", "admin")
+
+
+@pytest.fixture
+def client(app_client, monkeypatch):
+    from mongomock.collection import BulkOperationBuilder
+
+    # mongomock predates the sort argument pymongo 4.11+ passes for UpdateOne
+    add_update = BulkOperationBuilder.add_update
+    monkeypatch.setattr(BulkOperationBuilder, "add_update",
+                        lambda self, *args, sort=None, **kwargs: add_update(self, *args, **kwargs))
+    return app_client
+
+
+def _body(**fields) -> dict:
+    body = {field: "" for field in (
+        "first_name", "middle_name", "last_name", "nick_name", "phone_number", "register_by", "user_id",
+        "kyc_number", "kyc_url", "street", "city", "state", "postal_code", "country",
+    )}
+    body.update(email="farmer@example.com", district="d1", mandal="m1", village="v1", service="s1", sub_service="ss1")
+    body.update(fields)
+    return body
+
+
+def _create(client, **fields) -> str:
+    response = client.post(f"{CUSTOMERS}/", json=_body(**fields), headers=STAFF)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _counts(client, count) -> dict:
+    async def read():
+        return {
+            dimension: sorted((tuple(sorted(row["key"].items())), row["count"]) for row in await count(dimension))
+            for dimension in ROLLUP_DIMENSIONS
+        }
+    return client.portal.call(read)
+
+
+def test_values_containing_the_separator_do_not_collide(client):
+    # joined with "|" both would be "mandal|a|b|c"
+    _create(client, district="a|b", mandal="c")
+    _create(client, district="a", mandal="b|c")
+
+    counts = _counts(client, rollup_counts)
+    assert counts["mandal"] == [
+        ((("district", "a"), ("mandal", "b|c")), 1),
+        ((("district", "a|b"), ("mandal", "c")), 1),
+    ]
+    assert counts == _counts(client, live_counts)
+
+
+def test_deltas_agree_with_a_rebuild(client):
+    ids = [_create(client, village=f"v{i % 3}", register_by=f"agent{i % 2}") for i in range(6)]
+    _create(client, district="d2", mandal="m2", village="v9", service="s2", sub_service="")
+    # moves between groups, changes outside the rollup fields, deletes
+    for id, change in ((ids[0], {"village": "v2"}), (ids[1], {"district": "d2", "mandal": "m2"}),
+                       (ids[2], {"service": "s2", "sub_service": "ss2"}), (ids[3], {"first_name": "ravi"})):
+        assert client.patch(f"{CUSTOMERS}/{id}", json=change, headers=STAFF).status_code == 200
+    for id in ids[4:]:
+        assert client.delete(f"{CUSTOMERS}/{id}", headers=STAFF).status_code == 200
+    bulk = [_body(first_name=f"bulk{i}", district="d3", village="v3", register_by="agent9") for i in range(3)]
+    assert client.post(f"{CUSTOMERS}/bulk", json=bulk, headers=STAFF).json()["created"] == 3
+
+    from_deltas = _counts(client, rollup_counts)
+    assert from_deltas == _counts(client, live_counts)
+
+    response = client.post(f"{CUSTOMERS}/stats/rebuild", headers=ADMIN)
+    assert response.status_code == 200
+    assert _counts(client, rollup_counts) == from_deltas
+
+    async def stored_ids():
+        return [doc["_id"] async for doc in CustomerRollupModel.get_pymongo_collection().find()]
+
+    # a delta after the rebuild lands on the rebuilt documents instead of a second copy
+    rebuilt = client.portal.call(stored_ids)
+    _create(client, district="d2", mandal="m2", village="v9", service="s2", sub_service="")
+    assert sorted(map(str, client.portal.call(stored_ids))) == sorted(map(str, rebuilt))
+    assert _counts(client, rollup_counts) == _counts(client, live_counts)
+
+
+def test_rebuild_replaces_documents_of_the_old_id_format(client):
+    _create(client)
+
+    async def seed_old_format():
+        await CustomerRollupModel.get_pymongo_collection().insert_one(
+            {"_id": "district|d1", "dimension": "district", "key": {"district": "d1"}, "customers": 1})
+        await rebuild_rollups()
+    client.portal.call(seed_old_format)
+
+    assert _counts(client, rollup_counts) == _counts(client, live_counts)
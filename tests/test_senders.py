@@ -0,0 +1,15 @@
+import asyncio
+
+from src.hindusthan.jobs.utils.senders import LogSender, Message, mask_codes
+
+
+def test_mask_codes():
+    assert mask_codes("Your verification code is 483920. It expires in 5 minutes.") == \
+        "Your verification code is ******. It expires in 5 minutes."
+
+
+def test_log_sender_does_not_log_codes(capsys):
+    asyncio.run(LogSender().send(Message(to="farmer@example.com", subject="Code", body="Your code is 483920.")))
+    output = capsys.readouterr().out
+    assert "483920" not in output
+    assert "farmer@example.com" in output
@@ -0,0 +1,59 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from src.hindusthan.customer.models.customer_model import CustomerModel
+from src.hindusthan.database.soft_delete import PurgeTask, purge_deleted, retention_cutoff
+
+RETENTION_DAYS = 30
+
+
+async def _seed() -> dict:
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from beanie import init_beanie
+
+    client = mongomock_motor.AsyncMongoMockClient()
+    await init_beanie(database=client["purge_test"], document_models=[CustomerModel])
+
+    cutoff = retention_cutoff(RETENTION_DAYS)
+    deleted_at = {
+        "live": None,
+        "recently-deleted": cutoff + timedelta(days=1),
+        "expired-0": cutoff - timedelta(days=1),
+        "expired-1": cutoff - timedelta(days=2),
+        "expired-2": cutoff - timedelta(days=90),
+    }
+    await CustomerModel.get_pymongo_collection().insert_many([
+        {**CustomerModel(id=id, first_name=id).model_dump(by_alias=True), "deleted_at": when}
+        for id, when in deleted_at.items()
+    ])
+    # written before soft deletes existed, no deleted_at at all
+    await CustomerModel.get_pymongo_collection().insert_one({"_id": "legacy", "first_name": "legacy"})
+    return cutoff
+
+
+async def _remaining() -> set:
+    return {doc["_id"] async for doc in CustomerModel.get_pymongo_collection().find({}, projection={"_id": 1})}
+
+
+def test_purge_only_removes_expired_tombstones():
+    async def scenario():
+        cutoff = await _seed()
+        # batches smaller than the expired rows, so the loop runs more than once
+        assert await purge_deleted(CustomerModel, cutoff, batch_size=2, pause=0) == 3
+        assert await _remaining() == {"live", "legacy", "recently-deleted"}
+        # nothing left to purge
+        assert await purge_deleted(CustomerModel, cutoff, batch_size=2, pause=0) == 0
+
+    asyncio.run(scenario())
+
+
+def test_purge_task_reports_per_collection():
+    async def scenario():
+        await _seed()
+        task = PurgeTask([CustomerModel], retention_days=RETENTION_DAYS, batch_size=100, pause=0)
+        assert await task.run_once() == {"customers": 3}
+        assert await _remaining() == {"live", "legacy", "recently-deleted"}
+
+    asyncio.run(scenario())
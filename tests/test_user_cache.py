@@ -0,0 +1,69 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.hindusthan.auth.utils.user_cache import UserCache
+
+
+def _user(version: int) -> SimpleNamespace:
+    return SimpleNamespace(id="u1", email="a@example.com", version=version)
+
+
+def test_stale_load_does_not_overwrite_newer_put():
+    async def scenario():
+        cache = UserCache(maxsize=10, ttl=60)
+        release = asyncio.Event()
+
+        async def slow_loader():
+            await release.wait()
+            return _user(1)
+
+        load = asyncio.ensure_future(cache._load(("id", "u1"), slow_loader))
+        await asyncio.sleep(0)
+        cache.put(_user(2))
+        release.set()
+        assert (await load).version == 1
+        assert (await cache.get_by_id("u1")).version == 2
+
+    asyncio.run(scenario())
+
+
+def test_load_after_invalidate_starts_fresh():
+    async def scenario():
+        cache = UserCache(maxsize=10, ttl=60)
+        release = asyncio.Event()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await release.wait()
+            return _user(len(calls))
+
+        first = asyncio.ensure_future(cache._load(("id", "u1"), loader))
+        await asyncio.sleep(0)
+        cache.invalidate(id="u1")
+        second = asyncio.ensure_future(cache._load(("id", "u1"), loader))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second)
+        assert len(calls) == 2
+        assert cache._by_id.get("u1").version == 2
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_misses_share_one_load():
+    async def scenario():
+        cache = UserCache(maxsize=10, ttl=60)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return _user(1)
+
+        users = await asyncio.gather(*(cache._load(("id", "u1"), loader) for _ in range(5)))
+        assert len(calls) == 1
+        assert all(user.version == 1 for user in users)
+        assert cache._by_id.get("u1").version == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,84 @@
+from src.hindusthan.auth.models.user_model import UserModel, UserRole
+from tests.conftest import auth_headers
+
+
+def _create_user(client, email: str, role: UserRole = UserRole.CUSTOMER) -> str:
+    async def create():
+        user = UserModel(email=email, password="unused", role=role, is_verified=True)
+        await user.insert()
+        return user.id
+    return client.portal.call(create)
+
+
+def test_batch_get_is_admin_only(app_client):
+    target = _create_user(app_client, "farmer@example.com")
+    body = {"ids": [target]}
+
+    for role in (UserRole.FIELD_AGENT, UserRole.MARKETER, UserRole.CUSTOMER):
+        response = app_client.post("/api/v1/users/batch-get", json=body, headers=auth_headers("staff", role.value))
+        assert response.status_code == 403, role
+
+    response = app_client.post("/api/v1/users/batch-get", json=body, headers=auth_headers("admin", "admin"))
+    assert response.status_code == 200
+    assert response.json()["items"][0]["email"] == "farmer@example.com"
+
+
+def test_cached_user_expires_under_repeated_reads(app_client, monkeypatch):
+    from src.hindusthan.auth.utils import ttl_cache
+    from src.hindusthan.auth.utils.user_cache import USER_CACHE_TTL_SECONDS
+
+    class FakeClock:
+        now = 1000.0
+
+        def monotonic(self):
+            return self.now
+
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache, "time", clock)
+    user_id = _create_user(app_client, "farmer@example.com")
+    headers = auth_headers(user_id)
+
+    assert app_client.get(f"/api/v1/users/{user_id}", headers=headers).json()["phone_number"] is None
+
+    # another worker changes the user, this process keeps reading it
+    async def update_elsewhere():
+        await UserModel.get_pymongo_collection().update_one({"_id": user_id}, {"$set": {"phone_number": "9000"}})
+    app_client.portal.call(update_elsewhere)
+
+    step = USER_CACHE_TTL_SECONDS / 4
+    for _ in range(3):
+        clock.now += step
+        assert app_client.get(f"/api/v1/users/{user_id}", headers=headers).json()["phone_number"] is None
+
+    clock.now += step
+    assert app_client.get(f"/api/v1/users/{user_id}", headers=headers).json()["phone_number"] == "9000"
+
+
+def test_signup_does_not_return_the_otp_by_default(app_client):
+    response = app_client.post("/api/v1/users/signup", json={"email": "new@example.com", "password": "secret123"})
+    assert response.status_code == 201
+    assert "otp" not in response.json()
+
+
+def test_password_update_is_stored_hashed(app_client):
+    user_id = _create_user(app_client, "farmer@example.com")
+    headers = auth_headers(user_id)
+
+    response = app_client.patch(f"/api/v1/users/{user_id}", json={"password": "new-secret"}, headers=headers)
+    assert response.status_code == 200
+    assert "password" not in response.json()
+
+    async def stored_password():
+        return (await UserModel.get_pymongo_collection().find_one({"_id": user_id}))["password"]
+    assert "new-secret" not in app_client.portal.call(stored_password)
+
+    login = {"username": "farmer@example.com", "password": "new-secret"}
+    assert app_client.post("/api/v1/users/login", data=login).status_code == 200
+    login["password"] = "unused"
+    assert app_client.post("/api/v1/users/login", data=login).status_code == 401
+
+    # an explicit null leaves the password alone instead of clearing it
+    response = app_client.patch(f"/api/v1/users/{user_id}", json={"password": None}, headers=headers)
+    assert response.status_code == 200
+    login["password"] = "new-secret"
+    assert app_client.post("/api/v1/users/login", data=login).status_code == 200